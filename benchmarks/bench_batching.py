@@ -0,0 +1,135 @@
+"""
+Padded tokens per epoch of the fine-tuning batches: padding="max_length"
+vs dynamic padding with random, length-grouped and token-budget batches.
+
+    python benchmarks/bench_batching.py --rows 50000
+    python benchmarks/bench_batching.py --dataset data/tokenized/<build key>
+
+Takes the token lengths of a PretokenizedDataset directory (--dataset), or
+of the synthetic corpus of bench_pretokenize.py, and for each strategy
+reports the batches, the input + label tokens the model sees per epoch
+(real and padding), and the CPU time to collate the epoch with
+DynamicPaddingCollator (numpy). The token budget is --batch-size full
+1024-token examples, the memory the max_length batches need.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_near_duplicates import make_vocabulary  # noqa: E402
+from benchmarks.bench_pretokenize import (  # noqa: E402
+    MAX_SOURCE_LENGTH,
+    MAX_TARGET_LENGTH,
+    WordTokenizer,
+    synthetic_corpus,
+)
+from src.training import (  # noqa: E402
+    DynamicPaddingCollator,
+    LengthGroupedBatchSampler,
+    PretokenizedDataset,
+    padding_report,
+)
+
+
+class LengthsDataset:
+    """Examples of the given lengths, for collating without a real dataset."""
+
+    def __init__(self, source_lengths, target_lengths):
+        self.source_lengths, self.target_lengths = source_lengths, target_lengths
+
+    def __len__(self):
+        return len(self.source_lengths)
+
+    def __getitem__(self, i):
+        return {
+            "input_ids": np.ones(self.source_lengths[i], dtype=np.int32),
+            "labels": np.ones(self.target_lengths[i], dtype=np.int32),
+        }
+
+
+def synthetic_dataset(n_rows):
+    rng = random.Random(0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = synthetic_corpus(n_rows, rng, make_vocabulary(30_000, rng))
+    tokenizer = WordTokenizer()
+    sources = tokenizer(df["full_text_minimal"].tolist(), MAX_SOURCE_LENGTH)
+    targets = tokenizer(df["Summary_minimal"].tolist(), MAX_TARGET_LENGTH)
+    return LengthsDataset(
+        np.array([len(ids) for ids in sources["input_ids"]]),
+        np.array([len(ids) for ids in targets["input_ids"]]),
+    )
+
+
+def random_batches(n, batch_size, seed=0):
+    order = np.random.default_rng(seed).permutation(n).tolist()
+    return [order[i : i + batch_size] for i in range(0, n, batch_size)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--dataset", default=None)
+    parser.add_argument("--batch-size", type=int, default=8)
+    args = parser.parse_args()
+
+    if args.dataset:
+        dataset = PretokenizedDataset(args.dataset)
+        sources, targets = dataset.lengths("input_ids"), dataset.lengths("labels")
+    else:
+        dataset = synthetic_dataset(args.rows)
+        sources, targets = dataset.source_lengths, dataset.target_lengths
+    n = len(sources)
+    print(
+        f"{n} examples; input tokens mean {sources.mean():.0f}, median "
+        f"{np.median(sources):.0f}, max {sources.max()}"
+    )
+
+    budget = args.batch_size * MAX_SOURCE_LENGTH
+    strategies = {
+        "random": random_batches(n, args.batch_size),
+        "length-grouped": LengthGroupedBatchSampler(
+            sources, batch_size=args.batch_size
+        ).batches(),
+        f"token budget {budget}": LengthGroupedBatchSampler(
+            sources, max_tokens=budget
+        ).batches(),
+    }
+    collator = DynamicPaddingCollator(pad_token_id=1, return_tensors="np")
+
+    real = int(sources.sum() + targets.sum())
+    n_batches = -(-n // args.batch_size)
+    max_length_tokens = n * (MAX_SOURCE_LENGTH + MAX_TARGET_LENGTH)
+    print(
+        f"{'batches':>32} {'batches':>8} {'tokens':>12} {'padding':>8} "
+        f"{'vs max_length':>14} {'collate s':>10}"
+    )
+    print(
+        f"{'max_length (1024 + 128)':>32} {n_batches:>8} {max_length_tokens:>12} "
+        f"{1 - real / max_length_tokens:>8.1%} {'100%':>14} {'-':>10}"
+    )
+    for name, batches in strategies.items():
+        inputs = padding_report(sources, batches)
+        labels = padding_report(targets, batches)
+        tokens = inputs["padded_tokens"] + labels["padded_tokens"]
+        t0 = time.perf_counter()
+        for batch in batches:
+            collator([dataset[i] for i in batch])
+        seconds = time.perf_counter() - t0
+        print(
+            f"{name + ' (dynamic)':>32} {len(batches):>8} {tokens:>12} "
+            f"{1 - real / tokens:>8.1%} {tokens / max_length_tokens:>14.1%} "
+            f"{seconds:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Articles/sec of AA_EnglishArticleBodyFetcher against a local stand-in server.
+
+    python benchmarks/bench_body_fetcher.py --articles 400 --latency 0.05
+
+Compares the sequential run() with run_concurrent() at several concurrency
+levels. The server adds `latency` seconds to every response, so the numbers
+reflect how well each mode hides round-trip time. --flush-every / --fsync set
+the output writer's batching, and the p95 columns come from the fetcher's
+telemetry.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.local_aa_server import LocalAAServer  # noqa: E402
+from src.scraping import AA_EnglishArticleBodyFetcher  # noqa: E402
+
+
+def write_metadata(path, n_articles):
+    with open(path, "w", encoding="utf-8") as f:
+        for n in range(n_articles):
+            doc = {"Id": n, "Title": f"Article {n}", "Route": f"/en/world/article/{n}"}
+            f.write(json.dumps(doc) + "\n")
+
+
+def bench(base_url, metadata_path, workdir, concurrency, flush_every=100, fsync=False):
+    output_path = os.path.join(workdir, f"bodies_{concurrency}.jsonl")
+    fetcher = AA_EnglishArticleBodyFetcher(
+        metadata_path,
+        output_path,
+        min_delay=0,
+        flush_every=flush_every,
+        fsync=fsync,
+    )
+    fetcher.BASE_URL = base_url
+    with contextlib.redirect_stdout(io.StringIO()):
+        fetcher.load_metadata()
+        t0 = time.perf_counter()
+        if concurrency == 0:
+            fetcher.run()
+        else:
+            fetcher.run_concurrent(max_workers=concurrency)
+        elapsed = time.perf_counter() - t0
+    with open(output_path, encoding="utf-8") as f:
+        n_written = sum(1 for _ in f)
+    return n_written, elapsed, fetcher.telemetry.snapshot()["histograms"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=400)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--levels", default="0,1,4,8,16,32")
+    parser.add_argument("--flush-every", type=int, default=100)
+    parser.add_argument("--fsync", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir, LocalAAServer(args.latency) as srv:
+        metadata_path = os.path.join(workdir, "metadata.jsonl")
+        write_metadata(metadata_path, args.articles)
+        print(
+            f"{'mode':>14} {'articles':>9} {'seconds':>9} {'articles/s':>11} "
+            f"{'fetch p95':>10} {'flush p95':>10}"
+        )
+        for level in (int(x) for x in args.levels.split(",")):
+            n, elapsed, hists = bench(
+                srv.base_url,
+                metadata_path,
+                workdir,
+                level,
+                args.flush_every,
+                args.fsync,
+            )
+            mode = "run()" if level == 0 else f"concurrent={level}"
+            print(
+                f"{mode:>14} {n:>9} {elapsed:>9.2f} {n / elapsed:>11.1f} "
+                f"{hists['fetch_latency_seconds']['p95']:>10} "
+                f"{hists['flush_seconds']['p95']:>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
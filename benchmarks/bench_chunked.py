@@ -0,0 +1,176 @@
+"""
+Whole-file vs chunked preprocessing: peak memory and time per corpus size.
+
+    python benchmarks/bench_chunked.py --rows 20000,80000 --chunksize 5000
+
+batch:   DataCombiner.run("inner") -> DataCleaner -> EnglishPreprocessor
+         .minimal_preprocess_column -> filter_short_texts
+chunked: DataCombiner.combine_jsonl -> DataCleaner.clean_jsonl ->
+         EnglishPreprocessor.preprocess_jsonl(min_length=150)
+
+Every mode runs in a fresh interpreter so its peak RSS is its own. The
+chunked peak should stay roughly flat as the corpus grows. Exits with status
+1 if the two modes don't produce the same records.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_data_cleaner import synthetic_corpus  # noqa: E402
+
+
+def write_corpus(workdir, n_rows, seed=0):
+    """Metadata and body files; some bodies are repeated, some have no metadata."""
+    rng = random.Random(seed)
+    texts = synthetic_corpus(n_rows, seed).tolist()[:n_rows]
+    metadata_path = os.path.join(workdir, "metadata.jsonl")
+    body_path = os.path.join(workdir, "bodies.jsonl")
+    with open(metadata_path, "w", encoding="utf-8") as meta, open(
+        body_path, "w", encoding="utf-8"
+    ) as body:
+        for news_id, text in enumerate(texts, 1):
+            title = "Morning Briefing" if news_id % 97 == 0 else f"Title {news_id}"
+            if news_id % 50:
+                meta.write(
+                    json.dumps(
+                        {
+                            "Id": news_id,
+                            "Title": title,
+                            "Tags": ["Türkiye", "World"][: news_id % 3],
+                            "CreateDateString": "2024-01-01",
+                        },
+                        ensure_ascii=False,
+                    )
+                    + "\n"
+                )
+            for _ in range(2 if rng.random() < 0.02 else 1):
+                body.write(
+                    json.dumps({"Id": news_id, "full_text": text}, ensure_ascii=False)
+                    + "\n"
+                )
+    return metadata_path, body_path
+
+
+def run_batch(metadata_path, body_path, workdir, chunksize):
+    from src.preprocessing import DataCleaner, DataCombiner, EnglishPreprocessor
+
+    combined_path = os.path.join(workdir, "batch_combined.jsonl")
+    out_path = os.path.join(workdir, "batch_dataset.jsonl")
+    DataCombiner(metadata_path, body_path).run(combined_path, "inner")
+    cleaner = DataCleaner(DataCleaner.load_data(combined_path))
+    cleaner.drop_missing(columns=["full_text"])
+    cleaner.clean_english_articles()
+    cleaner.remove_duplicates()
+    cleaner.save_df(combined_path)
+    pre = EnglishPreprocessor(combined_path).load_data()
+    pre.minimal_preprocess_column("full_text")
+    cleaner = DataCleaner(pre.get_data())
+    cleaner.filter_short_texts()
+    cleaner.save_df(out_path)
+    return out_path
+
+
+def run_chunked(metadata_path, body_path, workdir, chunksize):
+    from src.preprocessing import DataCleaner, DataCombiner, EnglishPreprocessor
+
+    combined_path = os.path.join(workdir, "chunked_combined.jsonl")
+    cleaned_path = os.path.join(workdir, "chunked_cleaned.jsonl")
+    out_path = os.path.join(workdir, "chunked_dataset.jsonl")
+    DataCombiner.combine_jsonl(
+        metadata_path, body_path, combined_path, "inner", chunksize
+    )
+    DataCleaner.clean_jsonl(combined_path, cleaned_path, chunksize)
+    EnglishPreprocessor(cleaned_path).preprocess_jsonl(
+        out_path, min_length=150, chunksize=chunksize
+    )
+    return out_path
+
+
+def peak_rss_mb():
+    # VmHWM starts over at exec; ru_maxrss can carry the parent's peak over
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1e3
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def child(mode, metadata_path, body_path, workdir, chunksize):
+    fn = run_batch if mode == "batch" else run_chunked
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        out_path = fn(metadata_path, body_path, workdir, chunksize)
+    seconds = time.perf_counter() - t0
+    print(json.dumps({"out": out_path, "seconds": seconds, "peak_mb": peak_rss_mb()}))
+
+
+def read_records(path):
+    with open(path, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f]
+    return sorted(
+        (r["Id"], r["Title"], r["full_text"], r["full_text_minimal"]) for r in rows
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", default="20000,80000")
+    parser.add_argument("--chunksize", type=int, default=5000)
+    parser.add_argument("--child", nargs=4, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        mode, metadata_path, body_path, workdir = args.child
+        child(mode, metadata_path, body_path, workdir, args.chunksize)
+        return
+
+    ok = True
+    print(f"{'rows':>8} {'mode':>8} {'seconds':>8} {'peak MB':>8} {'records':>8}")
+    for n_rows in (int(x) for x in args.rows.split(",")):
+        with tempfile.TemporaryDirectory() as workdir:
+            metadata_path, body_path = write_corpus(workdir, n_rows)
+            outputs = {}
+            for mode in ("batch", "chunked"):
+                out = subprocess.run(
+                    [
+                        sys.executable,
+                        os.path.abspath(__file__),
+                        "--chunksize",
+                        str(args.chunksize),
+                        "--child",
+                        mode,
+                        metadata_path,
+                        body_path,
+                        workdir,
+                    ],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                )
+                result = json.loads(out.stdout.strip().splitlines()[-1])
+                outputs[mode] = read_records(result["out"])
+                print(
+                    f"{n_rows:>8} {mode:>8} {result['seconds']:>8.2f} "
+                    f"{result['peak_mb']:>8.0f} {len(outputs[mode]):>8}"
+                )
+            ok = ok and outputs["batch"] == outputs["chunked"]
+    print(f"Same records in both modes: {ok}")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Memory of the article corpus with the default vs compact dtypes, and a check
+that the Analyzer gives the same answers on both.
+
+    python benchmarks/bench_compact.py --rows 50000
+
+Writes the synthetic corpus of bench_storage.py (plus a repeated Category
+field) as JSONL, loads it with Analyzer(compact=False) and
+Analyzer(compact=True), prints the per-column memory report, then compares
+tag counts, tag co-occurrence, the tag/month matrix, topic emergence, tag
+masks and per-day counts. Exits with status 1 on any difference.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_storage import write_corpus  # noqa: E402
+from src.eda import Analyzer  # noqa: E402
+from src.utils.compact import memory_report  # noqa: E402
+
+CATEGORIES = ["Politics", "World", "Economy", "Sports", "Culture", "Energy"]
+
+
+def checks(analyzer):
+    return {
+        "tag counts": dict(analyzer.get_tag_counts()),
+        "co-occurrence": analyzer.tag_cooccurrence_matrix(plot_heatmap=False),
+        "tag/month matrix": analyzer.get_tag_month_matrix(),
+        "emergence": analyzer.topic_emergence_decay(),
+        "tag mask": analyzer._tag_mask("world", "Tags").tolist(),
+        "per day": analyzer.articles_per_day().tolist(),
+    }
+
+
+def same(a, b):
+    if isinstance(a, pd.DataFrame):
+        return (
+            a.reset_index(drop=True)
+            .astype(str)
+            .equals(b.reset_index(drop=True).astype(str))
+        )
+    return a == b
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        with contextlib.redirect_stdout(io.StringIO()):
+            path = write_corpus(workdir, args.rows)["jsonl"]
+        df = pd.read_json(path, lines=True)
+        rng = random.Random(0)
+        df["Category"] = [rng.choice(CATEGORIES) for _ in range(len(df))]
+        df.to_json(path, orient="records", force_ascii=False, lines=True)
+
+        analyzers = {}
+        for compact in (False, True):
+            t0 = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                analyzers[compact] = Analyzer(path, compact=compact)
+            print(
+                f"Analyzer(compact={compact}) loaded in {time.perf_counter() - t0:.2f} s"
+            )
+        plain, compact = analyzers[False].df, analyzers[True].df
+
+    report = memory_report(plain, compact)
+    print(report.round(2).to_string())
+    total, total_compact = report["MB"].sum(), report["compact MB"].sum()
+    print(
+        f"Total: {total:.1f} MB -> {total_compact:.1f} MB ({total_compact / total:.0%})"
+    )
+
+    ok = True
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected, got = checks(analyzers[False]), checks(analyzers[True])
+    for name in expected:
+        match = same(expected[name], got[name])
+        ok = ok and match
+        print(f"{name:>18}: {'same' if match else 'DIFFERENT'}")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Equivalence check and rows/sec benchmark for DataCleaner's article cleaning.
+
+    python benchmarks/bench_data_cleaner.py --rows 100000 --workers 4
+    python benchmarks/bench_data_cleaner.py --jsonl data/combined.jsonl
+
+Compares DataCleaner.sub_clean_aa_english_article and clean_text_series
+(serial and process pool) with the original per-article implementation,
+kept below as `reference_clean`, on a synthetic corpus with awkward
+prefixes and footers (or on the full_text column of a JSONL file).
+Exits with status 1 on any mismatch.
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.preprocessing.data_cleaner import DataCleaner  # noqa: E402
+
+
+def reference_clean(text):
+    """sub_clean_aa_english_article as it was before the precompiled engine."""
+    if not isinstance(text, str):
+        return text
+    prefix_pattern = r"^(?:\"full_text\":\")?([A-Z\s/]{3,})(?=[A-Z][^A-Z\s])"
+    text = re.sub(prefix_pattern, "", text).strip()
+    if text.endswith('"'):
+        text = text[:-1]
+    footer_patterns = [
+        r"Anadolu Agency website contains only.*",
+        r"Please contact us for subscription options.*",
+        r"Related topics.*",
+        r"Bu haberi paylaşın.*",
+    ]
+    for pat in footer_patterns:
+        text = re.sub(pat, "", text, flags=re.DOTALL)
+    return text.strip()
+
+
+WORDS = (
+    "the minister said Türkiye talks Ankara would continue next week officials "
+    'US UN NATO on Tuesday İstanbul café "quoted" / - Related topic'
+).split()
+PREFIXES = [
+    "ANKARA ",
+    "ISTANBUL / ",
+    '"full_text":"WASHINGTON ',
+    "",
+    "US ",
+    "UN\n",
+    "NEW\xa0YORK\u3000",
+    "GAZA\x0b",
+    "BRUSSELS\x1c ",
+    " \u2009LONDON ",
+]
+FOOTERS = [
+    "",
+    '"',
+    " Anadolu Agency website contains only a portion of the news stories.",
+    " Related topics\nx Bu haberi paylaşın",
+    " Bu haberi paylaşın Related topics",
+    " Please contact us for subscription options. Anadolu Agency website "
+    "contains only a portion",
+    ' Related topics "',
+]
+
+
+def synthetic_corpus(n_rows, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n_rows):
+        body = " ".join(rng.choice(WORDS) for _ in range(rng.randint(20, 900)))
+        rows.append(rng.choice(PREFIXES) + body + rng.choice(FOOTERS))
+    rows += [None, float("nan"), "", '"', "ABC", "ABCDef", "  NEW YORK Töday  "]
+    rows += ["ABC\u3000Def", "ABC\x85\u0130x", 'Text "\n', "x\x1c", "ABCD\nÇok"]
+    return pd.Series(rows, name="full_text")
+
+
+def rate(fn, n_rows):
+    t0 = time.perf_counter()
+    result = fn()
+    return result, n_rows / (time.perf_counter() - t0)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--jsonl", help="use the full_text column of this file")
+    args = parser.parse_args()
+
+    if args.jsonl:
+        series = pd.read_json(args.jsonl, lines=True)["full_text"]
+    else:
+        series = synthetic_corpus(args.rows)
+    n = len(series)
+
+    expected, ref_rate = rate(lambda: series.apply(reference_clean), n)
+    runs = {
+        "apply(sub_clean)": lambda: series.apply(
+            DataCleaner.sub_clean_aa_english_article
+        ),
+        "clean_text_series": lambda: DataCleaner.clean_text_series(series),
+        f"clean_text_series(workers={args.workers})": lambda: (
+            DataCleaner.clean_text_series(
+                series, workers=args.workers, min_rows_for_workers=0
+            )
+        ),
+    }
+    print(f"{'method':>32} {'rows/s':>10} {'speedup':>8} {'mismatches':>11}")
+    print(f"{'apply(reference)':>32} {ref_rate:>10.0f} {1.0:>8.2f} {'-':>11}")
+    n_bad = 0
+    for name, fn in runs.items():
+        result, r = rate(fn, n)
+        bad = sum(
+            not (a == b or (a != a and b != b))
+            for a, b in zip(expected.tolist(), result.tolist())
+        )
+        bad += len(result) != n or not result.index.equals(series.index)
+        n_bad += bad
+        print(f"{name:>32} {r:>10.0f} {r / ref_rate:>8.2f} {bad:>11}")
+    if n_bad:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
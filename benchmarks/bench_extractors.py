@@ -0,0 +1,161 @@
+"""
+Equivalence check and parse throughput of the article extractors.
+
+    python benchmarks/bench_extractors.py --pages 2000
+    python benchmarks/bench_extractors.py --corpus path/to/saved/pages
+
+Every extractor must produce byte-identical text to the reference "bs4"
+extractor on the fixture corpus; mismatches are printed and fail the run.
+The fixture corpus is generated from realistic page templates plus a set of
+awkward markup (entities, CRLF, comments, scripts, nested divs, broken <p>
+nesting, block, raw-text and obsolete tags, CDATA, malformed comments). A
+directory of saved .html / .html.gz pages, such as an HtmlCache root, can be
+used instead.
+"""
+
+import argparse
+import gzip
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.local_aa_server import article_html  # noqa: E402
+from src.scraping.extractors import EXTRACTORS, get_extractor  # noqa: E402
+
+AWKWARD_SNIPPETS = [
+    "plain sentence",
+    "Fish &amp; chips &nbsp;in &quot;quotes&quot;",
+    "&#150; windows dash &#8217; apostrophe &#x2019;",
+    "unknown &foo; entity &notin; &notit and a&ampb",
+    "<b>bold</b> then <i>italic <a href='/x?a=1&b=2'>link</a></i> tail",
+    "<!-- hidden comment --> visible",
+    "<script>var s = '<div>';</script>after script",
+    "line one<br>line two<br/>line three",
+    "windows\r\nline ending",
+    "  leading and trailing whitespace  ",
+    "<span>   </span>",
+    "café Türkiye ç",
+    "<ruby>kanji<rt>reading</rt></ruby>",
+    "a<li>b</li>c<dd>d</dd><dt>e</dt>",
+    "<table><tr><td>cell</td></tr></table>",
+    "a<textarea></div></textarea>b",
+    "x<![CDATA[y]]>z",
+    "x<title>y</title>z",
+    "x<frameset>y</frameset>z",
+    "x<plaintext>y",
+    "x<p>nested p</p>q",
+    "x <!-- a --!> y",
+    "a <a href='/1'>b <a href='/2'>c</a> d</a>",
+    "x<span/>y",
+]
+
+
+def fixture_page(rng, n):
+    if rng.random() < 0.5:
+        return article_html(n, n_paragraphs=rng.randint(3, 25))
+    blocks = []
+    for _ in range(rng.randint(1, 12)):
+        snippet = rng.choice(AWKWARD_SNIPPETS)
+        kind = rng.random()
+        if kind < 0.55:
+            blocks.append(f'<p class="selectionShareable">{snippet}</p>')
+        elif kind < 0.65:
+            blocks.append(f"<h3>{snippet}</h3>")
+        elif kind < 0.7:
+            blocks.append(f"<h4 class='sub'>{snippet}</h4>")
+        elif kind < 0.78:
+            blocks.append(f"<p>{snippet}</p>")
+        elif kind < 0.84:
+            blocks.append(
+                f'<div class="inner"><p class="selectionShareable">{snippet}</p></div>'
+            )
+        elif kind < 0.88:
+            blocks.append(
+                f'<p class="selectionShareable">{snippet}<div>block in p</div></p>'
+            )
+        elif kind < 0.92:
+            blocks.append(f'<p class="selectionShareable big">{snippet}')
+        elif kind < 0.96:
+            blocks.append("<script>document.write('</p><div>')</script>")
+        else:
+            blocks.append(
+                "<p class='selectionShareable'>Please contact us for subscription options</p>"
+            )
+    container = rng.choice(
+        [
+            '<div class="detay-icerik">{}</div>',
+            "<div id='x' class='col detay-icerik'>{}</div>",
+            '<DIV CLASS="detay-icerik" data-x="a>b">{}</DIV>',
+            '<div class="detay-icerik"><div class="detay-icerik-alt">{}</div></div>',
+            '<div class="other">{}</div>',  # no container at all
+            '<div class="detay-icerik"><span>only inline {}</span></div>',
+        ]
+    )
+    decoy = (
+        "<!-- <div class='detay-icerik'>commented out</div> -->"
+        if rng.random() < 0.2
+        else ""
+    )
+    return (
+        "<html><head><style>div > p {color: red}</style></head><body>"
+        f"<nav><div><a href='/'>Home</a></div></nav>{decoy}"
+        + container.format("\n".join(blocks))
+        + "<footer><div>Related topics</div></footer></body></html>"
+    )
+
+
+def load_corpus(path):
+    pages = []
+    for root, _, files in os.walk(path):
+        for name in sorted(files):
+            if not name.endswith((".html", ".html.gz")):
+                continue
+            full = os.path.join(root, name)
+            opener = gzip.open if name.endswith(".gz") else open
+            with opener(full, "rt", encoding="utf-8") as f:
+                pages.append(f.read())
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--corpus", default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.corpus:
+        pages = load_corpus(args.corpus)
+    else:
+        rng = random.Random(args.seed)
+        pages = [fixture_page(rng, n) for n in range(args.pages)]
+    total_mb = sum(len(p.encode("utf-8")) for p in pages) / 1e6
+
+    results = {}
+    print(f"{len(pages)} pages, {total_mb:.1f} MB")
+    print(
+        f"{'extractor':>12} {'seconds':>9} {'pages/s':>9} {'MB/s':>7} {'mismatches':>11}"
+    )
+    for name in EXTRACTORS:
+        extractor = get_extractor(name)
+        t0 = time.perf_counter()
+        results[name] = [extractor.extract(page) for page in pages]
+        elapsed = time.perf_counter() - t0
+        mismatches = [
+            i for i, (a, b) in enumerate(zip(results["bs4"], results[name])) if a != b
+        ]
+        print(
+            f"{name:>12} {elapsed:>9.2f} {len(pages) / elapsed:>9.1f} "
+            f"{total_mb / elapsed:>7.1f} {len(mismatches):>11}"
+        )
+        for i in mismatches[:3]:
+            print(f"  page {i}: {results['bs4'][i]!r}\n       != {results[name][i]!r}")
+        if mismatches:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Daily cost of IncrementalPreprocessor against rerunning the full
+DataCleaner -> EnglishPreprocessor flow.
+
+    python benchmarks/bench_incremental.py --rows 50000 --new-share 0.02
+
+Preprocesses a synthetic corpus of raw AA records (dateline prefix, site
+footer, Morning Briefing titles), then adds --new-share new articles and
+edits --changed-share of the existing ones and preprocesses again, once
+incrementally and once from scratch, then adds --new-share more articles
+("day 3", only new records: a JSONL output is appended to). Reports the
+records processed and the time of each run, and exits with status 1 if
+the incremental output differs from the full one. --suffix picks the
+output format; --normalize also normalizes the titles (needs the NLTK
+wordnet corpus).
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_near_duplicates import make_vocabulary  # noqa: E402
+from src.preprocessing import IncrementalPreprocessor  # noqa: E402
+from src.utils.storage import load_table  # noqa: E402
+
+FOOTER = " Anadolu Agency website contains only a portion of the news stories"
+
+
+def raw_records(n_rows, rng, vocabulary, first_id=0):
+    records = []
+    for news_id in range(first_id, first_id + n_rows):
+        words = rng.choices(vocabulary, k=rng.randint(100, 600))
+        title = " ".join(rng.choices(vocabulary, k=8)).title()
+        if rng.random() < 0.01:
+            title = "Morning Briefing " + title
+        records.append(
+            {
+                "Id": news_id,
+                "Title": title,
+                "full_text": "ANKARA Türkiye  " + " ".join(words) + FOOTER,
+                "Summary": " ".join(words[:30]),
+                "CreateDate": f"2024-{rng.randint(1, 12):02d}-01T10:00:00",
+            }
+        )
+    return pd.DataFrame(records)
+
+
+def run(workdir, data, args):
+    preprocessor = IncrementalPreprocessor(
+        os.path.join(workdir, "preprocessed" + args.suffix),
+        minimal_columns=("full_text", "Summary"),
+        normalize_columns=("Title",) if args.normalize else (),
+        min_length=150,
+    )
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        preprocessor.run(data, return_output=False)
+    return preprocessor.stats["processed"], time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--new-share", type=float, default=0.02)
+    parser.add_argument("--changed-share", type=float, default=0.005)
+    parser.add_argument("--suffix", default=".parquet")
+    parser.add_argument("--normalize", action="store_true")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = make_vocabulary(30_000, rng)
+    day1 = raw_records(args.rows, rng, vocabulary)
+    day2 = pd.concat(
+        [
+            day1,
+            raw_records(int(args.rows * args.new_share), rng, vocabulary, args.rows),
+        ],
+        ignore_index=True,
+    )
+    changed = rng.sample(range(args.rows), int(args.rows * args.changed_share))
+    day2.loc[changed, "full_text"] = day2.loc[changed, "full_text"] + " (updated)"
+    n_new = int(args.rows * args.new_share)
+    day3 = pd.concat(
+        [day2, raw_records(n_new, rng, vocabulary, args.rows + n_new)],
+        ignore_index=True,
+    )
+
+    with tempfile.TemporaryDirectory() as workdir:
+        incremental_dir = os.path.join(workdir, "incremental")
+        full_dir = os.path.join(workdir, "full")
+        os.makedirs(incremental_dir)
+        os.makedirs(full_dir)
+
+        print(f"{'run':>20} {'records':>8} {'processed':>10} {'seconds':>8}")
+        for name, directory, data in (
+            ("day 1", incremental_dir, day1),
+            ("day 2 incremental", incremental_dir, day2),
+            ("day 2 unchanged", incremental_dir, day2),
+            ("day 2 full", full_dir, day2),
+            ("day 3 incremental", incremental_dir, day3),
+        ):
+            processed, seconds = run(directory, data, args)
+            print(f"{name:>20} {len(data):>8} {processed:>10} {seconds:>8.2f}")
+            if name == "day 2 unchanged":
+                incremental = load_table(
+                    os.path.join(incremental_dir, "preprocessed" + args.suffix)
+                )
+        full = load_table(os.path.join(full_dir, "preprocessed" + args.suffix))
+
+    same = incremental.equals(full)
+    print(f"Incremental output equals the full run: {same}")
+    if not same:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
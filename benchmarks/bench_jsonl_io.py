@@ -0,0 +1,92 @@
+"""
+JSONL I/O: plain vs gzip vs zstd size, write and read time, and the orjson
+line parser against pandas.read_json.
+
+    python benchmarks/bench_jsonl_io.py --rows 50000
+
+Writes the synthetic corpus of bench_storage.py as .jsonl, .jsonl.gz and
+.jsonl.zst with utils.storage.save_table, appends the same records one at
+a time through JsonlRecordWriter (the body fetcher's writer) and rebuilds
+its DoneIdIndex from the data file, then reads every file back with
+pandas.read_json and with utils.chunked.read_jsonl. Exits with status 1 if
+any read returns a different frame than pandas.read_json on the plain file.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_storage import write_corpus  # noqa: E402
+from src.scraping.done_index import DoneIdIndex  # noqa: E402
+from src.scraping.jsonl_writer import JsonlRecordWriter  # noqa: E402
+from src.utils.chunked import read_jsonl  # noqa: E402
+from src.utils.storage import save_table  # noqa: E402
+
+SUFFIXES = (".jsonl", ".jsonl.gz", ".jsonl.zst")
+
+
+def timed(func, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - t0
+
+
+def append_records(path, records):
+    with contextlib.redirect_stdout(io.StringIO()):
+        with JsonlRecordWriter(path) as writer:
+            for record in records:
+                writer.put(None, record)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        with contextlib.redirect_stdout(io.StringIO()):
+            corpus = write_corpus(workdir, args.rows)["jsonl"]
+        expected = pd.read_json(corpus, lines=True)
+        records = expected.to_dict("records")
+
+        ok = True
+        print(
+            f"{'file':>12} {'MB':>8} {'save s':>7} {'append s':>9} "
+            f"{'index s':>8} {'read_json s':>12} {'read_jsonl s':>13}"
+        )
+        for suffix in SUFFIXES:
+            path = os.path.join(workdir, "bench" + suffix)
+            _, save_seconds = timed(save_table, expected, path)
+            size = os.path.getsize(path)
+
+            appended = os.path.join(workdir, "appended" + suffix)
+            _, append_seconds = timed(append_records, appended, records)
+            os.remove(appended + ".ids")
+            with contextlib.redirect_stdout(io.StringIO()):
+                ids, index_seconds = timed(DoneIdIndex(appended).load)
+            ok = ok and len(ids) == len(records)
+
+            by_pandas, pandas_seconds = timed(pd.read_json, path, lines=True)
+            by_orjson, orjson_seconds = timed(read_jsonl, path)
+            ok = ok and by_pandas.equals(expected) and by_orjson.equals(expected)
+            ok = ok and read_jsonl(appended).equals(expected)
+            print(
+                f"{suffix:>12} {size / 1e6:>8.1f} {save_seconds:>7.2f} "
+                f"{append_seconds:>9.2f} {index_seconds:>8.2f} "
+                f"{pandas_seconds:>12.2f} {orjson_seconds:>13.2f}"
+            )
+        print(f"All reads match pandas.read_json on the plain file: {ok}")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
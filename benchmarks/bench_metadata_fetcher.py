@@ -0,0 +1,79 @@
+"""
+Pages/sec of AA_EnglishNewsMetadataFetcher against a local stand-in server.
+
+    python benchmarks/bench_metadata_fetcher.py --latency 0.1
+
+Crawls every category until the first empty page, sequentially with run()
+and with run_concurrent() at several window sizes.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.local_aa_server import LocalAAServer  # noqa: E402
+from src.scraping import AA_EnglishNewsMetadataFetcher  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--docs-per-category", type=int, default=600)
+    parser.add_argument("--categories", default="1,2,3,4")
+    parser.add_argument("--windows", default="1,4,8")
+    args = parser.parse_args()
+    category_ids = [int(c) for c in args.categories.split(",")]
+    page_size = 20
+    n_pages = -(-args.docs_per_category // page_size)
+
+    with tempfile.TemporaryDirectory() as workdir, LocalAAServer(
+        args.latency, docs_per_category=args.docs_per_category
+    ) as srv:
+        out_path = os.path.join(workdir, "metadata.jsonl")
+        print(f"{'mode':>22} {'docs':>7} {'seconds':>9} {'pages/s':>9}")
+
+        t0 = time.perf_counter()
+        n_docs = 0
+        with contextlib.redirect_stdout(io.StringIO()):
+            for cid in category_ids:
+                fetcher = srv.point_metadata_fetcher(
+                    AA_EnglishNewsMetadataFetcher(
+                        max_pages=n_pages, category_id=cid, page_size=page_size
+                    )
+                )
+                fetcher.run()
+                n_docs += len(fetcher.results)
+        elapsed = time.perf_counter() - t0
+        total_pages = n_pages * len(category_ids)
+        print(
+            f"{'run()':>22} {n_docs:>7} {elapsed:>9.2f} {total_pages / elapsed:>9.1f}"
+        )
+
+        for window in (int(w) for w in args.windows.split(",")):
+            fetcher = srv.point_metadata_fetcher(
+                AA_EnglishNewsMetadataFetcher(
+                    max_pages=None,
+                    page_size=page_size,
+                    save_to_file=True,
+                    save_file_path=out_path,
+                )
+            )
+            t0 = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                fetcher.run_concurrent(window=window, category_ids=category_ids)
+            elapsed = time.perf_counter() - t0
+            mode = f"concurrent window={window}"
+            n_docs = len(fetcher.results)
+            print(
+                f"{mode:>22} {n_docs:>7} {elapsed:>9.2f} {total_pages / elapsed:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
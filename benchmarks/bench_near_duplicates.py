@@ -0,0 +1,117 @@
+"""
+Scaling and accuracy of DataCleaner.remove_near_duplicates (MinHash + LSH).
+
+    python benchmarks/bench_near_duplicates.py --rows 25000,50000,100000
+
+Builds a synthetic corpus where a share of the articles are republished
+copies of earlier ones with a few words edited (new Ids), and reports the
+run time, time per article, precision (dropped articles that really are
+copies) and recall (copies whose true shingle Jaccard similarity to their
+source is at least the threshold that were dropped). Exits with status 1
+if precision or recall is below --min-score.
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.preprocessing import DataCleaner  # noqa: E402
+
+
+def make_vocabulary(size, rng):
+    return [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10)))
+        for _ in range(size)
+    ]
+
+
+def edit(words, rate, rng, vocabulary):
+    words = list(words)
+    for _ in range(max(1, int(len(words) * rate))):
+        i = rng.randrange(len(words))
+        op = rng.random()
+        if op < 0.4:
+            words[i] = rng.choice(vocabulary)
+        elif op < 0.7:
+            del words[i]
+        else:
+            words.insert(i, rng.choice(vocabulary))
+    return words
+
+
+def synthetic_corpus(n_rows, dup_share, seed=0):
+    """DataFrame of n_rows articles and {copy Id: source Id}."""
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(30_000, rng)
+    texts, sources = [], {}
+    for news_id in range(n_rows):
+        if texts and rng.random() < dup_share:
+            source = rng.randrange(len(texts))
+            words = edit(
+                texts[source].split(), rng.uniform(0.002, 0.03), rng, vocabulary
+            )
+            sources[news_id] = source
+        else:
+            words = rng.choices(vocabulary, k=rng.randint(150, 600))
+        texts.append(" ".join(words))
+    return pd.DataFrame({"Id": range(n_rows), "full_text_minimal": texts}), sources
+
+
+def jaccard(a, b, k):
+    def shingles(text):
+        words = text.split()
+        return {tuple(words[i : i + k]) for i in range(len(words) - k + 1)}
+
+    sa, sb = shingles(a), shingles(b)
+    return len(sa & sb) / len(sa | sb)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", default="25000,50000,100000")
+    parser.add_argument("--dup-share", type=float, default=0.05)
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--num-perm", type=int, default=128)
+    parser.add_argument("--min-score", type=float, default=0.9)
+    args = parser.parse_args()
+
+    ok = True
+    print(
+        f"{'rows':>8} {'copies':>7} {'dropped':>8} {'clusters':>9} {'seconds':>8} "
+        f"{'us/article':>11} {'precision':>10} {'recall':>7}"
+    )
+    for n_rows in (int(x) for x in args.rows.split(",")):
+        df, sources = synthetic_corpus(n_rows, args.dup_share)
+        texts = df["full_text_minimal"].tolist()
+        # Copies must be dropped if they are close enough to their source
+        expected = {
+            i
+            for i, src in sources.items()
+            if jaccard(texts[i], texts[src], 5) >= args.threshold
+        }
+        cleaner = DataCleaner(df, verbose=False)
+        t0 = time.perf_counter()
+        cleaner.remove_near_duplicates(threshold=args.threshold, num_perm=args.num_perm)
+        seconds = time.perf_counter() - t0
+        dropped = set(df["Id"]) - set(cleaner.data["Id"])
+        precision = len(dropped & set(sources)) / len(dropped) if dropped else 1.0
+        recall = len(dropped & expected) / len(expected) if expected else 1.0
+        ok = ok and precision >= args.min_score and recall >= args.min_score
+        print(
+            f"{n_rows:>8} {len(sources):>7} {len(dropped):>8} "
+            f"{len(cleaner.near_duplicate_clusters):>9} {seconds:>8.2f} "
+            f"{seconds / n_rows * 1e6:>11.1f} {precision:>10.3f} {recall:>7.3f}"
+        )
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Per-article NLP as the ensemble does it at inference vs NlpEnricher.
+
+    python benchmarks/bench_nlp_enrichment.py --rows 500 --n-process 2 --yake-workers 2
+    python benchmarks/bench_nlp_enrichment.py --jsonl data/preprocessed.jsonl --rows 2000
+
+Needs spaCy with the model (python -m spacy download en_core_web_sm) and
+yake. Takes the first --rows texts of a JSONL file's --column, or the
+synthetic corpus of bench_storage.py, and compares:
+
+- per article: the full pipeline called on every text (nlp(text)) and a
+  YAKE extractor built per text, as modules 6-8 and sentence_chunker_adaptive
+  do,
+- NlpEnricher: nlp.pipe with only NER and the parser enabled, --n-process
+  spaCy processes and a --yake-workers YAKE pool.
+
+Reports articles/sec of both and checks that the entities, keywords and
+sentences are the same. Exits with status 1 on any difference.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_storage import write_corpus  # noqa: E402
+from src.preprocessing import NlpEnricher  # noqa: E402
+from src.preprocessing.nlp_enrichment import (  # noqa: E402
+    YAKE_PARAMS,
+    sentences_from_offsets,
+)
+from src.utils import read_jsonl  # noqa: E402
+
+
+def load_texts(args):
+    if args.jsonl:
+        return read_jsonl(args.jsonl)[args.column].dropna().head(args.rows).tolist()
+    with tempfile.TemporaryDirectory() as workdir:
+        with contextlib.redirect_stdout(io.StringIO()):
+            path = write_corpus(workdir, args.rows)["jsonl"]
+        return read_jsonl(path)["full_text"].tolist()
+
+
+def per_article(texts, model):
+    import spacy
+    import yake
+
+    nlp = spacy.load(model)
+    results = []
+    for text in texts:
+        doc = nlp(text)
+        extractor = yake.KeywordExtractor(**YAKE_PARAMS)
+        results.append(
+            (
+                [(ent.text, ent.label_) for ent in doc.ents],
+                [kw for kw, _score in extractor.extract_keywords(text)],
+                [sent.text for sent in doc.sents],
+            )
+        )
+    return results
+
+
+def enriched(texts, args):
+    import pandas as pd
+
+    enricher = NlpEnricher(
+        model=args.model,
+        text_column="text",
+        n_process=args.n_process,
+        yake_workers=args.yake_workers,
+    )
+    df = enricher.enrich(pd.DataFrame({"text": texts}))
+    return [
+        (
+            [(ent["text"], ent["label"]) for ent in entities],
+            keywords,
+            sentences_from_offsets(text, offsets),
+        )
+        for text, entities, keywords, offsets in zip(
+            df["text"], df["entities"], df["keywords"], df["sentence_offsets"]
+        )
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--jsonl", default=None)
+    parser.add_argument("--column", default="full_text_minimal")
+    parser.add_argument("--model", default="en_core_web_sm")
+    parser.add_argument("--n-process", type=int, default=1)
+    parser.add_argument("--yake-workers", type=int, default=None)
+    args = parser.parse_args()
+
+    try:
+        import spacy  # noqa: F401
+        import yake  # noqa: F401
+    except ImportError as e:
+        print(f"spaCy and yake are required for this benchmark: {e}")
+        sys.exit(1)
+
+    texts = load_texts(args)
+    timings = {}
+    results = {}
+    for name, run in (
+        ("per article", lambda: per_article(texts, args.model)),
+        ("NlpEnricher", lambda: enriched(texts, args)),
+    ):
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            results[name] = run()
+        timings[name] = time.perf_counter() - t0
+        print(
+            f"{name:>12}: {timings[name]:.2f} s "
+            f"({len(texts) / timings[name]:.1f} articles/s)"
+        )
+
+    ok = results["per article"] == results["NlpEnricher"]
+    print(
+        f"Speedup {timings['per article'] / timings['NlpEnricher']:.1f}x; "
+        f"same entities, keywords and sentences: {ok}"
+    )
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Equivalence check and rows/sec benchmark for EnglishPreprocessor.normalize_text.
+
+    python benchmarks/bench_normalize_text.py --rows 20000 --workers 4
+    python benchmarks/bench_normalize_text.py --jsonl data/cleaned.jsonl
+
+Compares the memoized normalize_text (serial and through the process-pool
+normalize_column) with the original implementation, kept below as
+`reference_normalize`, and prints the lemma cache hit rate. Needs the NLTK
+stopwords and wordnet corpora. Exits with status 1 on any mismatch.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import re
+import sys
+import time
+import unicodedata
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.preprocessing.text_preprocessor_en import (  # noqa: E402
+    EnglishPreprocessor,
+    get_english_stopwords,
+)
+
+
+def reference_normalize(lemmatizer, text):
+    """normalize_text as it was before the lemma cache and ASCII fast path."""
+    if not isinstance(text, str) or pd.isna(text):
+        return ""
+    text = text.lower()
+    text = "".join(
+        c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c)
+    )
+    text = re.sub(r"[^a-z0-9\s]", " ", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    tokens = []
+    for word in text.split():
+        lemma = lemmatizer.lemmatize(word)
+        if lemma not in get_english_stopwords():
+            tokens.append(lemma)
+    return " ".join(tokens)
+
+
+WORDS = (
+    "The ministers said talks between Türkiye and the EU would continue next "
+    "week, officials added; prices rose 3.5% in İstanbul café-owners' reports "
+    "of attacks, elections and agreements were discussed by leaders"
+).split()
+
+
+def synthetic_corpus(n_rows, seed=0):
+    rng = random.Random(seed)
+    rows = [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(50, 600)))
+        for _ in range(n_rows)
+    ]
+    rows += [None, float("nan"), "", "Ünïcödé ﬁnance　ＦＵＬＬ width\x1cx", "KK"]
+    return pd.Series(rows, name="full_text")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--jsonl", help="use the full_text column of this file")
+    args = parser.parse_args()
+
+    if args.jsonl:
+        series = pd.read_json(args.jsonl, lines=True)["full_text"]
+    else:
+        series = synthetic_corpus(args.rows)
+    n = len(series)
+
+    reference = EnglishPreprocessor()
+    t0 = time.perf_counter()
+    expected = series.apply(lambda t: reference_normalize(reference.lemmatizer, t))
+    ref_rate = n / (time.perf_counter() - t0)
+    print(f"{'method':>30} {'rows/s':>10} {'speedup':>8} {'hit rate':>9} {'bad':>5}")
+    print(f"{'reference':>30} {ref_rate:>10.0f} {1.0:>8.2f} {'-':>9} {'-':>5}")
+
+    n_bad = 0
+    for workers in (None, args.workers):
+        pre = EnglishPreprocessor()
+        pre.data = pd.DataFrame({"full_text": series})
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            pre.normalize_column("full_text", workers=workers)
+        r = n / (time.perf_counter() - t0)
+        bad = int((pre.data["full_text_norm"] != expected).sum())
+        n_bad += bad
+        name = f"normalize_column(workers={workers})"
+        hit_rate = pre.lemma_cache_stats()["hit_rate"]
+        print(f"{name:>30} {r:>10.0f} {r / ref_rate:>8.2f} {hit_rate:>9.1%} {bad:>5}")
+    if n_bad:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
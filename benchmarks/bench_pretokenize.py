@@ -0,0 +1,205 @@
+"""
+Pre-tokenized training data: build, rebuild and open times, and disk size
+against the padded datasets.map(padding="max_length") layout.
+
+    python benchmarks/bench_pretokenize.py --rows 20000
+    python benchmarks/bench_pretokenize.py --tokenizer facebook/bart-large-cnn
+
+Builds a synthetic corpus, tokenizes it with TokenizedDatasetBuilder, then
+rebuilds it unchanged and after appending --new-share new and editing
+--changed-share of the articles, reporting how many records went through
+the tokenizer each time. Checks that every stored record equals a direct
+tokenizer call and that the rebuilt dataset matches a fresh build. Exits
+with status 1 on any difference.
+
+Without --tokenizer a word-level stand-in tokenizer is used, so the script
+runs where transformers isn't installed; its throughput is not that of a
+real BPE tokenizer, but the number of tokenizer calls saved is the same.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_near_duplicates import make_vocabulary  # noqa: E402
+from src.training import PretokenizedDataset, TokenizedDatasetBuilder  # noqa: E402
+
+MAX_SOURCE_LENGTH, MAX_TARGET_LENGTH = 1024, 128
+
+
+class WordTokenizer:
+    """Stand-in with the call signature of a Hugging Face tokenizer."""
+
+    vocab_size = 50_000
+
+    def get_vocab(self):
+        return {"<s>": 0, "</s>": 2}
+
+    def __call__(self, texts, max_length, truncation=True):
+        ids = []
+        for text in texts:
+            words = [
+                3 + zlib.crc32(w.encode("utf-8")) % (self.vocab_size - 3)
+                for w in text.split()
+            ]
+            if truncation:
+                words = words[: max_length - 2]
+            ids.append([0] + words + [2])
+        return {"input_ids": ids}
+
+
+def load_tokenizer(name):
+    if name is None:
+        return WordTokenizer()
+    from transformers import AutoTokenizer
+
+    return AutoTokenizer.from_pretrained(name)
+
+
+def synthetic_corpus(n_rows, rng, vocabulary, first_id=0):
+    articles = [
+        " ".join(rng.choices(vocabulary, k=int(rng.lognormvariate(5.8, 0.5))))
+        for _ in range(n_rows)
+    ]
+    return pd.DataFrame(
+        {
+            "Id": range(first_id, first_id + n_rows),
+            "full_text_minimal": articles,
+            "Summary_minimal": [
+                " ".join(text.split()[: rng.randint(15, 45)]) for text in articles
+            ],
+        }
+    )
+
+
+def dir_size(path):
+    return sum(
+        os.path.getsize(os.path.join(path, f))
+        for f in os.listdir(path)
+        if f.startswith("data-")
+    )
+
+
+def build(tokenizer, out_dir, df):
+    builder = TokenizedDatasetBuilder(tokenizer, out_dir, verbose=False)
+    t0 = time.perf_counter()
+    path = builder.build(df)
+    return path, time.perf_counter() - t0, builder.stats["tokenized"]
+
+
+def check(tokenizer, path, df):
+    dataset = PretokenizedDataset(path, with_ids=True)
+    if len(dataset) != len(df):
+        return False
+    inputs = tokenizer(df["full_text_minimal"].tolist(), max_length=MAX_SOURCE_LENGTH)[
+        "input_ids"
+    ]
+    labels = tokenizer(df["Summary_minimal"].tolist(), max_length=MAX_TARGET_LENGTH)[
+        "input_ids"
+    ]
+    for i, (news_id, source, target) in enumerate(zip(df["Id"], inputs, labels)):
+        item = dataset[i]
+        if (
+            item["Id"] != news_id
+            or item["input_ids"].tolist() != source
+            or item["labels"].tolist() != target
+        ):
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--new-share", type=float, default=0.05)
+    parser.add_argument("--changed-share", type=float, default=0.01)
+    parser.add_argument("--tokenizer", default=None)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = make_vocabulary(30_000, rng)
+    tokenizer = load_tokenizer(args.tokenizer)
+    df = synthetic_corpus(args.rows, rng, vocabulary)
+
+    updated = pd.concat(
+        [
+            df,
+            synthetic_corpus(
+                int(args.rows * args.new_share), rng, vocabulary, args.rows
+            ),
+        ],
+        ignore_index=True,
+    )
+    changed = rng.sample(range(args.rows), int(args.rows * args.changed_share))
+    updated.loc[changed, "full_text_minimal"] = (
+        updated.loc[changed, "full_text_minimal"] + " update"
+    )
+
+    ok = True
+    with tempfile.TemporaryDirectory() as workdir:
+        out_dir = os.path.join(workdir, "tokenized")
+        print(f"{'build':>22} {'records':>8} {'tokenized':>10} {'seconds':>8}")
+        for name, frame in (
+            ("cold", df),
+            ("unchanged", df),
+            ("new + changed", updated),
+        ):
+            path, seconds, tokenized = build(tokenizer, out_dir, frame)
+            print(f"{name:>22} {len(frame):>8} {tokenized:>10} {seconds:>8.2f}")
+
+        t0 = time.perf_counter()
+        dataset = PretokenizedDataset(path)
+        open_seconds = time.perf_counter() - t0
+        lengths = dataset.lengths()
+        print(
+            f"Opened {len(dataset)} records in {open_seconds * 1000:.1f} ms; "
+            f"input tokens mean {lengths.mean():.0f}, max {lengths.max()}"
+        )
+        stored = dir_size(path)
+        # input_ids + attention_mask at 1024 and labels at 128, as int32
+        padded = len(dataset) * (2 * MAX_SOURCE_LENGTH + MAX_TARGET_LENGTH) * 4
+        print(
+            f"Stored {stored / 1e6:.1f} MB vs {padded / 1e6:.1f} MB padded "
+            f"({stored / padded:.0%})"
+        )
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            ok = check(tokenizer, path, updated)
+            fresh, _, _ = build(tokenizer, os.path.join(workdir, "fresh"), updated)
+        a, b = PretokenizedDataset(path), PretokenizedDataset(fresh)
+        ok = ok and all(
+            np.array_equal(a[i][name], b[i][name])
+            for i in range(len(a))
+            for name in ("input_ids", "labels")
+        )
+        print(f"Stored records match the tokenizer and a fresh build: {ok}")
+
+        try:
+            from datasets import load_from_disk
+        except ImportError:
+            print("datasets is not installed; skipping load_from_disk")
+        else:
+            t0 = time.perf_counter()
+            hf = load_from_disk(path)
+            print(
+                f"load_from_disk: {len(hf)} records in "
+                f"{(time.perf_counter() - t0) * 1000:.1f} ms"
+            )
+            ok = ok and hf[0]["input_ids"] == a[0]["input_ids"].tolist()
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Cost of StageProfiler and the report it writes, on the in-memory and the
+chunked (JSONL) cleaning and preprocessing flows.
+
+    python benchmarks/bench_profiling.py --rows 20000
+
+Runs DataCleaner -> EnglishPreprocessor over the synthetic corpus of
+bench_storage.py without a profiler, with StageProfiler and with
+StageProfiler(trace_memory=True), prints the wall time of each and the
+per-stage report of the last one, and writes the reports as a JSONL log.
+Exits with status 1 if the instrumented runs give different output.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_storage import write_corpus  # noqa: E402
+from src.preprocessing import DataCleaner, EnglishPreprocessor  # noqa: E402
+from src.utils import StageProfiler, load_table  # noqa: E402
+
+
+def pipeline(path, workdir):
+    cleaner = DataCleaner(DataCleaner.load_data(path))
+    cleaner.drop_missing(columns=["full_text"])
+    cleaner.clean_english_articles()
+    cleaner.remove_duplicates()
+    preprocessor = EnglishPreprocessor()
+    preprocessor.data = cleaner.data
+    preprocessor.minimal_preprocess_column("full_text")
+    preprocessor.normalize_column("Tags")
+    cleaner.data = preprocessor.data
+    cleaner.filter_short_texts(150)
+    out_path = os.path.join(workdir, "preprocessed.parquet")
+    cleaner.save_df(out_path)
+
+    cleaned = os.path.join(workdir, "cleaned.jsonl")
+    DataCleaner.clean_jsonl(path, cleaned, chunksize=5000)
+    EnglishPreprocessor(cleaned).preprocess_jsonl(
+        os.path.join(workdir, "chunked.jsonl"), min_length=150, chunksize=5000
+    )
+    return load_table(out_path)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        with contextlib.redirect_stdout(io.StringIO()):
+            path = write_corpus(workdir, args.rows)["jsonl"]
+        log_path = os.path.join(workdir, "runs.jsonl")
+        outputs = {}
+        summary = io.StringIO()
+        for name, profiler in (
+            ("no profiler", contextlib.nullcontext()),
+            ("StageProfiler", StageProfiler(log_path, run_name="rss")),
+            (
+                "trace_memory",
+                StageProfiler(log_path, run_name="tracemalloc", trace_memory=True),
+            ),
+        ):
+            t0 = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()) as out:
+                with profiler:
+                    outputs[name] = pipeline(path, workdir)
+            print(f"{name:>14}: {time.perf_counter() - t0:.2f} s")
+            summary = out.getvalue()
+
+        print("\nLast run:")
+        print(summary[summary.index("stage   ") :].rstrip())
+        with open(log_path) as f:
+            reports = [json.loads(line) for line in f]
+        print(
+            f"\n{len(reports)} reports in the JSONL log: {[r['run'] for r in reports]}"
+        )
+
+    ok = all(df.equals(outputs["no profiler"]) for df in outputs.values())
+    print(f"Instrumented runs give the same output: {ok}")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+AdaptiveRateController against a local server that throttles above max_rps.
+
+    python benchmarks/bench_rate_control.py --articles 600 --max-rps 40
+
+Runs the concurrent body fetcher with a fixed thread pool and no controller
+(requests above the server's limit fail with 429), then with the controller
+(which should settle near the server's limit with few throttled requests
+and no lost articles).
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_body_fetcher import write_metadata  # noqa: E402
+from benchmarks.local_aa_server import LocalAAServer  # noqa: E402
+from src.scraping import AA_EnglishArticleBodyFetcher  # noqa: E402
+from src.scraping.rate_control import AdaptiveRateController  # noqa: E402
+
+
+def count_ok(path):
+    with open(path, encoding="utf-8") as f:
+        return sum(1 for line in f if len(json.loads(line)["full_text"]) >= 50)
+
+
+def run_once(args, workdir, controller):
+    metadata_path = os.path.join(workdir, "metadata.jsonl")
+    write_metadata(metadata_path, args.articles)
+    output_path = os.path.join(workdir, f"bodies_{id(controller)}.jsonl")
+    with LocalAAServer(args.latency, max_rps=args.max_rps) as srv:
+        fetcher = AA_EnglishArticleBodyFetcher(
+            metadata_path,
+            output_path,
+            min_delay=0,
+            max_retries=1 if controller is None else 8,
+            extractor="lxml",
+            rate_controller=controller,
+        )
+        fetcher.BASE_URL = srv.base_url
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            fetcher.run_concurrent(max_workers=args.workers)
+        elapsed = time.perf_counter() - t0
+        n_throttled = srv.throttle.n_throttled
+    return count_ok(output_path), elapsed, n_throttled
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=600)
+    parser.add_argument("--max-rps", type=float, default=40)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--workers", type=int, default=32)
+    args = parser.parse_args()
+
+    print(f"server limit: {args.max_rps} req/s, {args.workers} worker threads")
+    print(f"{'mode':>12} {'ok':>6} {'seconds':>8} {'ok/s':>7} {'429s':>6}")
+    with tempfile.TemporaryDirectory() as workdir:
+        controller = AdaptiveRateController(
+            rate=5, max_rate=args.max_rps * 4, max_concurrency=args.workers
+        )
+        for mode, ctl in (("fixed pool", None), ("adaptive", controller)):
+            ok, elapsed, n_throttled = run_once(args, workdir, ctl)
+            print(
+                f"{mode:>12} {ok:>6} {elapsed:>8.2f} {ok / elapsed:>7.1f} {n_throttled:>6}"
+            )
+        print(f"controller: {controller.summary()}")
+
+
+if __name__ == "__main__":
+    main()
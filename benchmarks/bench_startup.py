@@ -0,0 +1,79 @@
+"""
+Import-time guard for the src packages.
+
+    python benchmarks/bench_startup.py --max-seconds 1.0
+
+Imports each package in a fresh interpreter, reports the best of --repeat
+wall times, and checks that none of the heavy dependencies were imported
+as a side effect (they should only load on first use). Exits with status 1
+if an import is slower than --max-seconds or pulls in a heavy module.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ["nltk", "matplotlib", "seaborn", "plotly", "spacy", "torch", "transformers"]
+
+# statement -> heavy modules it must not import
+CASES = {
+    "import src": HEAVY + ["pandas"],
+    "import src.preprocessing": HEAVY + ["pandas"],
+    "import src.eda": HEAVY + ["pandas"],
+    "import src.scraping": HEAVY + ["pandas"],
+    "import src.training": HEAVY + ["pandas"],
+    "from src.preprocessing import EnglishPreprocessor": HEAVY,
+    "from src.eda import Analyzer": HEAVY,
+}
+
+PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+exec({stmt!r})
+elapsed = time.perf_counter() - t0
+loaded = sorted({{m.split(".")[0] for m in sys.modules}} & set({heavy!r}))
+print(json.dumps({{"seconds": elapsed, "loaded": loaded}}))
+"""
+
+
+def probe(stmt, heavy):
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(stmt=stmt, heavy=heavy)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if out.returncode:
+        return None, out.stderr.strip().splitlines()[-1:]
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    return result["seconds"], result["loaded"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-seconds", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    ok = True
+    print(f"{'statement':>52} {'seconds':>8}  heavy modules loaded")
+    for stmt, heavy in CASES.items():
+        runs = [probe(stmt, heavy) for _ in range(args.repeat)]
+        failed = [loaded for seconds, loaded in runs if seconds is None]
+        if failed:
+            ok = False
+            print(f"{stmt:>52} {'error':>8}  {failed[0]}")
+            continue
+        seconds = min(s for s, _ in runs)
+        loaded = runs[0][1]
+        ok = ok and seconds <= args.max_seconds and not loaded
+        print(f"{stmt:>52} {seconds:>8.3f}  {', '.join(loaded) or '-'}")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Load time and peak memory of an EDA-style read: JSONL vs Parquet / Arrow IPC.
+
+    python benchmarks/bench_storage.py --rows 50000
+
+Writes one synthetic article corpus (metadata fields plus full_text) as
+JSONL, Parquet and Arrow with utils.storage.save_table, rows sorted by
+CreateDate, then loads only ["Id", "Tags", "CreateDateString"], optionally
+for one month, each in a fresh interpreter. Exits with status 1 if any
+format returns different rows than JSONL.
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_chunked import peak_rss_mb  # noqa: E402
+from benchmarks.bench_data_cleaner import WORDS  # noqa: E402
+
+COLUMNS = ["Id", "Tags", "CreateDateString"]
+MONTH = ("2024-03-01", "2024-04-01")
+TAGS = ["Türkiye", "World", "Politics", "Economy", "Middle East", "Sports", "Ukraine"]
+
+
+def write_corpus(workdir, n_rows, seed=0):
+    from src.utils.storage import save_table
+    import pandas as pd
+
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    rows = []
+    for news_id in range(1, n_rows + 1):
+        created = start + timedelta(minutes=news_id * 525_600 // n_rows)
+        rows.append(
+            {
+                "Id": news_id,
+                "Title": f"Title {news_id}",
+                "Summary": " ".join(rng.choice(WORDS) for _ in range(30)),
+                "Tags": rng.sample(TAGS, rng.randint(1, 3)),
+                "CreateDate": created.strftime("%Y-%m-%dT%H:%M:%S"),
+                "CreateDateString": created.strftime("%d.%m.%Y"),
+                "full_text": " ".join(rng.choice(WORDS) for _ in range(500)),
+            }
+        )
+    df = pd.DataFrame(rows)
+    paths = {}
+    for fmt, suffix in (
+        ("jsonl", ".jsonl"),
+        ("parquet", ".parquet"),
+        ("arrow", ".arrow"),
+    ):
+        paths[fmt] = os.path.join(workdir, "corpus" + suffix)
+        save_table(df, paths[fmt], row_group_size=10_000)
+    return paths
+
+
+def child(path, with_dates):
+    t0 = time.perf_counter()
+    from src.utils.storage import load_table
+
+    df = load_table(path, columns=COLUMNS, date_range=MONTH if with_dates else None)
+    seconds = time.perf_counter() - t0
+    rows = [[r[0], list(r[1]), r[2]] for r in df.itertuples(index=False)]
+    print(json.dumps({"seconds": seconds, "peak_mb": peak_rss_mb(), "rows": rows}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child[0], args.child[1] == "month")
+        return
+
+    ok = True
+    with tempfile.TemporaryDirectory() as workdir:
+        paths = write_corpus(workdir, args.rows)
+        print(
+            f"{'format':>8} {'read':>6} {'MB on disk':>11} {'seconds':>8} "
+            f"{'peak MB':>8} {'rows':>7}"
+        )
+        for read in ("all", "month"):
+            expected = None
+            for fmt, path in paths.items():
+                out = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), "--child", path, read],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                )
+                result = json.loads(out.stdout.strip().splitlines()[-1])
+                if expected is None:
+                    expected = result["rows"]
+                ok = ok and result["rows"] == expected
+                print(
+                    f"{fmt:>8} {read:>6} {os.path.getsize(path) / 1e6:>11.1f} "
+                    f"{result['seconds']:>8.2f} {result['peak_mb']:>8.0f} "
+                    f"{len(result['rows']):>7}"
+                )
+    print(f"Same rows in every format: {ok}")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
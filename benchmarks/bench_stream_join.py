@@ -0,0 +1,108 @@
+"""
+In-memory DataCombiner.run() vs DataCombiner.stream_join(): time, peak memory
+and equivalence, for inner and union joins.
+
+    python benchmarks/bench_stream_join.py --rows 20000,80000
+
+Uses the metadata/body corpus of bench_chunked.py (repeated bodies, bodies
+without metadata); the metadata and body files both carry a Title so the
+_x/_y suffixes are exercised. Every join runs in a fresh interpreter. Exits
+with status 1 if the two engines give different records.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_chunked import peak_rss_mb, write_corpus  # noqa: E402
+
+
+def add_body_titles(body_path):
+    tmp_path = body_path + ".tmp"
+    with open(body_path, encoding="utf-8") as src, open(
+        tmp_path, "w", encoding="utf-8"
+    ) as dst:
+        for line in src:
+            record = json.loads(line)
+            record["Title"] = f"Body title {record['Id']}"
+            dst.write(json.dumps(record, ensure_ascii=False) + "\n")
+    os.replace(tmp_path, body_path)
+
+
+def child(engine, join_type, metadata_path, body_path, out_path):
+    from src.preprocessing import DataCombiner
+
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if engine == "memory":
+            DataCombiner(metadata_path, body_path).run(out_path, join_type)
+        else:
+            DataCombiner.stream_join(metadata_path, body_path, out_path, join_type)
+    seconds = time.perf_counter() - t0
+    print(json.dumps({"seconds": seconds, "peak_mb": peak_rss_mb()}))
+
+
+def read_sorted(path):
+    import pandas as pd
+
+    df = pd.read_json(path, lines=True)
+    df = df.sort_values("Id").reset_index(drop=True)
+    return df[sorted(df.columns)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", default="20000,80000")
+    parser.add_argument("--child", nargs=5, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(*args.child)
+        return
+
+    ok = True
+    print(f"{'rows':>8} {'join':>6} {'engine':>7} {'seconds':>8} {'peak MB':>8}")
+    for n_rows in (int(x) for x in args.rows.split(",")):
+        with tempfile.TemporaryDirectory() as workdir:
+            metadata_path, body_path = write_corpus(workdir, n_rows)
+            add_body_titles(body_path)
+            for join_type in ("inner", "union"):
+                outputs = {}
+                for engine in ("memory", "stream"):
+                    out_path = os.path.join(workdir, f"{engine}_{join_type}.jsonl")
+                    out = subprocess.run(
+                        [
+                            sys.executable,
+                            os.path.abspath(__file__),
+                            "--child",
+                            engine,
+                            join_type,
+                            metadata_path,
+                            body_path,
+                            out_path,
+                        ],
+                        capture_output=True,
+                        text=True,
+                        check=True,
+                    )
+                    result = json.loads(out.stdout.strip().splitlines()[-1])
+                    outputs[engine] = read_sorted(out_path)
+                    print(
+                        f"{n_rows:>8} {join_type:>6} {engine:>7} "
+                        f"{result['seconds']:>8.2f} {result['peak_mb']:>8.0f}"
+                    )
+                ok = ok and outputs["memory"].equals(outputs["stream"])
+    print(f"Same records from both engines: {ok}")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
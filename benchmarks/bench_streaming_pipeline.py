@@ -0,0 +1,123 @@
+"""
+Scrape-to-dataset: the batch chain vs StreamingPipeline, against a local
+stand-in server.
+
+    python benchmarks/bench_streaming_pipeline.py --articles 400
+
+batch:     run_concurrent() -> DataCombiner (inner) -> DataCleaner ->
+           EnglishPreprocessor.minimal_preprocess_column -> filter_short_texts
+streaming: iter_records() -> StreamingPipeline.run()
+
+Reports the time until the first cleaned record exists, the total time and
+the tracemalloc peak of each mode, and checks both produce the same records.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_body_fetcher import write_metadata  # noqa: E402
+from benchmarks.local_aa_server import LocalAAServer  # noqa: E402
+from src.preprocessing import (  # noqa: E402
+    DataCleaner,
+    DataCombiner,
+    EnglishPreprocessor,
+    StreamingPipeline,
+)
+from src.scraping import AA_EnglishArticleBodyFetcher  # noqa: E402
+
+
+def make_fetcher(base_url, metadata_path, output_path):
+    fetcher = AA_EnglishArticleBodyFetcher(metadata_path, output_path, min_delay=0)
+    fetcher.BASE_URL = base_url
+    return fetcher
+
+
+def run_batch(base_url, metadata_path, workdir, workers):
+    bodies_path = os.path.join(workdir, "batch_bodies.jsonl")
+    combined_path = os.path.join(workdir, "batch_combined.jsonl")
+    out_path = os.path.join(workdir, "batch_dataset.jsonl")
+    fetcher = make_fetcher(base_url, metadata_path, bodies_path)
+    fetcher.run_concurrent(max_workers=workers)
+    metadata = DataCombiner.load_data(metadata_path)
+    bodies = DataCombiner.load_data(bodies_path).drop(columns=["Title"])
+    DataCombiner.save(DataCombiner.join_df_inner(metadata, bodies), combined_path)
+
+    cleaner = DataCleaner(DataCleaner.load_data(combined_path))
+    cleaner.drop_missing(columns=["full_text"])
+    cleaner.clean_english_articles()
+    cleaner.remove_duplicates()
+    cleaner.save_df(combined_path)
+
+    pre = EnglishPreprocessor(combined_path).load_data()
+    pre.minimal_preprocess_column("full_text")
+    cleaner = DataCleaner(pre.get_data())
+    cleaner.filter_short_texts()
+    cleaner.save_df(out_path)
+    first_record_at = time.perf_counter()  # nothing exists before the end
+    return out_path, first_record_at
+
+
+def run_streaming(base_url, metadata_path, workdir, workers):
+    bodies_path = os.path.join(workdir, "stream_bodies.jsonl")
+    out_path = os.path.join(workdir, "stream_dataset.jsonl")
+    fetcher = make_fetcher(base_url, metadata_path, bodies_path)
+    pipeline = StreamingPipeline.from_fetcher(fetcher)
+    first = []
+
+    def timed(records):
+        for record in records:
+            if not first:
+                first.append(time.perf_counter())
+            yield record
+
+    pipeline.run(timed(fetcher.iter_records(max_workers=workers)), out_path)
+    return out_path, first[0]
+
+
+def read_ids_and_texts(path):
+    with open(path, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f]
+    return sorted((r["Id"], r["full_text_minimal"]) for r in rows)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=400)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--workers", type=int, default=16)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir, LocalAAServer(args.latency) as srv:
+        metadata_path = os.path.join(workdir, "metadata.jsonl")
+        write_metadata(metadata_path, args.articles)
+        outputs = {}
+        print(f"{'mode':>10} {'first record s':>15} {'total s':>8} {'peak MB':>8}")
+        for name, fn in (("batch", run_batch), ("streaming", run_streaming)):
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                out_path, first_at = fn(
+                    srv.base_url, metadata_path, workdir, args.workers
+                )
+            total = time.perf_counter() - t0
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            outputs[name] = read_ids_and_texts(out_path)
+            print(f"{name:>10} {first_at - t0:>15.2f} {total:>8.2f} {peak / 1e6:>8.1f}")
+        same = outputs["batch"] == outputs["streaming"]
+        print(f"Same {len(outputs['streaming'])} records in both modes: {same}")
+        if not same:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
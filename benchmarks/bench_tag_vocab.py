@@ -0,0 +1,201 @@
+"""
+Tag analytics on interned tag ids vs the previous per-string implementation.
+
+    python benchmarks/bench_tag_vocab.py --rows 100000
+
+Builds a synthetic corpus with a Zipf-distributed set of mixed-case tags,
+normalizes Tags with EnglishPreprocessor (tag id arrays plus the saved
+vocabulary), loads it with Analyzer, and runs the tag counts, co-occurrence
+matrix, tag/month matrix and event lifespan on the ids. The same analytics
+run through the string-based code the Analyzer used before, on the
+normalized tags as strings. Prints time, peak traced memory and the memory
+of the tag column for both, and exits with status 1 if any result differs.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timedelta
+from itertools import combinations
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.eda import Analyzer  # noqa: E402
+from src.preprocessing import EnglishPreprocessor  # noqa: E402
+
+EVENT = "tag 3"
+
+
+def synthetic_tags(n_rows, n_tags, seed=0):
+    rng = random.Random(seed)
+    names = [f"Tag {i}" for i in range(n_tags)]
+    weights = [1 / (i + 1) for i in range(n_tags)]
+    start = datetime(2023, 1, 1)
+    rows = []
+    for news_id in range(1, n_rows + 1):
+        tags = rng.choices(names, weights, k=rng.randint(1, 6))
+        created = start + timedelta(minutes=news_id * 1_051_200 // n_rows)
+        rows.append(
+            {
+                "Id": news_id,
+                # Raw tags vary in case and spacing; normalize_tags folds them
+                "Tags": [t.upper() if rng.random() < 0.1 else f" {t}" for t in tags],
+                "CreateDateString": created.strftime("%d.%m.%Y"),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+# --- The string-based analytics the Analyzer used before ---
+def reference_tag_counts(df, col):
+    tag_counter = Counter()
+    for tag_list in df[col]:
+        for tag in tag_list:
+            if tag:
+                tag_counter.update([tag])
+    return tag_counter
+
+
+def reference_cooccurrence(df, tag_col, top_n=20):
+    co_counter = Counter()
+    tag_freq = Counter()
+    for taglist in df[tag_col].dropna():
+        unique_tags = list(set(taglist))
+        tag_freq.update(unique_tags)
+        for tag_pair in combinations(sorted(unique_tags), 2):
+            co_counter[tag_pair] += 1
+    top_tags = [tag for tag, _ in tag_freq.most_common(top_n)]
+    matrix = pd.DataFrame(0, index=top_tags, columns=top_tags, dtype=int)
+    for (tag1, tag2), count in co_counter.items():
+        if tag1 in top_tags and tag2 in top_tags:
+            matrix.loc[tag1, tag2] = count
+            matrix.loc[tag2, tag1] = count
+    return matrix
+
+
+def reference_tag_month_matrix(df, tag_col, date_col="date", top_n=10):
+    rows = []
+    for idx, row in df.iterrows():
+        month = pd.to_datetime(row[date_col]).to_period("M")
+        for tag in set(row[tag_col]):
+            rows.append({"month": month, "tag": tag})
+    tag_month_df = pd.DataFrame(rows)
+    tag_month_counts = (
+        tag_month_df.groupby(["month", "tag"]).size().reset_index(name="count")
+    )
+    top_tags = (
+        tag_month_counts.groupby("tag")["count"]
+        .sum()
+        .sort_values(ascending=False)
+        .head(top_n)
+        .index.tolist()
+    )
+    tag_month_counts = tag_month_counts[tag_month_counts["tag"].isin(top_tags)]
+    matrix = (
+        tag_month_counts.pivot(index="month", columns="tag", values="count")
+        .fillna(0)
+        .astype(int)
+    )
+    return matrix.sort_index()
+
+
+def reference_lifespan(df, tag, tag_col, date_col="date", freq="D"):
+    tag_lower = tag.lower()
+    mask = [tag_lower in [str(t).lower() for t in tags] for tags in df[tag_col]]
+    event_df = df.loc[mask].copy()
+    event_df["date"] = pd.to_datetime(event_df[date_col])
+    grouped = event_df.groupby(event_df["date"].dt.to_period(freq)).size()
+    return grouped, event_df["date"].min(), grouped.idxmax(), event_df["date"].max()
+
+
+def measure(func):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func()
+    seconds = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak / 1e6
+
+
+def same(a, b):
+    if isinstance(a, tuple):
+        return all(same(x, y) for x, y in zip(a, b))
+    if isinstance(a, (pd.DataFrame, pd.Series)):
+        return a.equals(b)
+    return a == b
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--tags", type=int, default=5_000)
+    args = parser.parse_args()
+
+    df = synthetic_tags(args.rows, args.tags)
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "articles.parquet")
+        with contextlib.redirect_stdout(io.StringIO()):
+            preprocessor = EnglishPreprocessor()
+            preprocessor.data = df
+            preprocessor.normalize_column("Tags")
+            preprocessor.save(path)
+            analyzer = Analyzer(path)
+    vocabulary = analyzer.tag_vocabulary
+    strings = analyzer.df.copy()
+    strings["Tags_norm"] = [vocabulary.decode(ids) for ids in strings["Tags_norm"]]
+    print(
+        f"{len(df)} articles, {len(vocabulary)} distinct normalized tags; "
+        f"Tags_norm {strings['Tags_norm'].memory_usage(deep=True) / 1e6:.1f} MB "
+        f"as strings, "
+        f"{analyzer.df['Tags_norm'].memory_usage(deep=True) / 1e6:.1f} MB as ids"
+    )
+
+    cases = {
+        "tag counts": (
+            lambda: reference_tag_counts(strings, "Tags_norm"),
+            lambda: analyzer.get_tag_counts("Tags_norm"),
+        ),
+        "co-occurrence": (
+            lambda: reference_cooccurrence(strings, "Tags_norm"),
+            lambda: analyzer.tag_cooccurrence_matrix("Tags_norm", plot_heatmap=False),
+        ),
+        "tag/month matrix": (
+            lambda: reference_tag_month_matrix(strings, "Tags_norm"),
+            lambda: analyzer.get_tag_month_matrix("Tags_norm"),
+        ),
+        "event lifespan": (
+            lambda: reference_lifespan(strings, EVENT, "Tags_norm"),
+            lambda: analyzer.event_coverage_lifespan(EVENT, tag_col="Tags_norm"),
+        ),
+    }
+    ok = True
+    print(
+        f"{'':>18} {'strings s':>10} {'ids s':>8} {'strings MB':>11} "
+        f"{'ids MB':>8}  result"
+    )
+    for name, (reference, codes) in cases.items():
+        expected, reference_seconds, reference_mb = measure(reference)
+        got, seconds, mb = measure(codes)
+        match = same(expected, got)
+        ok = ok and match
+        print(
+            f"{name:>18} {reference_seconds:>10.2f} {seconds:>8.2f} "
+            f"{reference_mb:>11.1f} {mb:>8.1f}  {'same' if match else 'DIFFERENT'}"
+        )
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
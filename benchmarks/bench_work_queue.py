@@ -0,0 +1,125 @@
+"""
+Sharded crawl through the SQLite lease queue against a local stand-in server.
+
+    python benchmarks/bench_work_queue.py --articles 600 --workers 1,2,4
+
+For every worker count, N processes run AA_EnglishArticleBodyFetcher.run_worker()
+on one queue, each into its own shard, and merge_shards() combines them.
+With --kill, the first worker is killed part-way through; its leases expire
+and the others pick its jobs up. Every run must end with each article in the
+merged file exactly once.
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_body_fetcher import write_metadata  # noqa: E402
+from benchmarks.local_aa_server import LocalAAServer  # noqa: E402
+from src.scraping import AA_EnglishArticleBodyFetcher  # noqa: E402
+from src.scraping.work_queue import LeaseWorkQueue, merge_shards  # noqa: E402
+
+
+def worker(base_url, metadata_path, queue_path, shard_path, threads, lease_seconds):
+    fetcher = AA_EnglishArticleBodyFetcher(metadata_path, shard_path, min_delay=0)
+    fetcher.BASE_URL = base_url
+    with contextlib.redirect_stdout(io.StringIO()):
+        fetcher.run_worker(
+            queue_path,
+            max_workers=threads,
+            lease_seconds=lease_seconds,
+            idle_wait=0.2,
+        )
+
+
+def bench(base_url, metadata_path, workdir, n_workers, threads, kill, lease_seconds):
+    run_dir = os.path.join(workdir, f"workers_{n_workers}")
+    os.makedirs(run_dir)
+    queue_path = os.path.join(run_dir, "queue.sqlite")
+    with contextlib.redirect_stdout(io.StringIO()):
+        AA_EnglishArticleBodyFetcher(metadata_path, "").populate_queue(queue_path)
+
+    t0 = time.perf_counter()
+    procs = [
+        multiprocessing.Process(
+            target=worker,
+            args=(
+                base_url,
+                metadata_path,
+                queue_path,
+                os.path.join(run_dir, f"shard_{k}.jsonl"),
+                threads,
+                lease_seconds,
+            ),
+        )
+        for k in range(n_workers)
+    ]
+    for p in procs:
+        p.start()
+    if kill:
+        time.sleep(1.0)
+        procs[0].kill()
+    for p in procs:
+        p.join()
+    elapsed = time.perf_counter() - t0
+
+    merged_path = os.path.join(run_dir, "merged.jsonl")
+    with contextlib.redirect_stdout(io.StringIO()):
+        merge_shards(
+            sorted(glob.glob(os.path.join(run_dir, "shard_*.jsonl"))), merged_path
+        )
+    with open(merged_path, encoding="utf-8") as f:
+        ids = [json.loads(line)["Id"] for line in f]
+    with LeaseWorkQueue(queue_path) as queue:
+        counts = queue.counts()
+    return len(ids), len(set(ids)), counts, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=600)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--kill", action="store_true")
+    parser.add_argument("--lease-seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    ok = True
+    with tempfile.TemporaryDirectory() as workdir, LocalAAServer(args.latency) as srv:
+        metadata_path = os.path.join(workdir, "metadata.jsonl")
+        write_metadata(metadata_path, args.articles)
+        print(
+            f"{'workers':>8} {'merged':>7} {'unique':>7} {'seconds':>8} "
+            f"{'articles/s':>11}  queue"
+        )
+        for n_workers in (int(x) for x in args.workers.split(",")):
+            n, n_unique, counts, elapsed = bench(
+                srv.base_url,
+                metadata_path,
+                workdir,
+                n_workers,
+                args.threads,
+                args.kill and n_workers > 1,
+                args.lease_seconds,
+            )
+            ok = ok and n == n_unique == args.articles
+            print(
+                f"{n_workers:>8} {n:>7} {n_unique:>7} {elapsed:>8.2f} "
+                f"{n / elapsed:>11.1f}  {counts}"
+            )
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Local stand-in for www.aa.com.tr used by the benchmarks.
+
+Serves synthetic article pages with the same markup the body fetcher parses
+(div.detay-icerik with h3/h4 headings and p.selectionShareable paragraphs)
+and a minimal search endpoint (/en/Search + /en/Search/Search) for the
+metadata fetcher, adding an artificial per-request latency to mimic network
+round trips. With max_rps set, requests above that rate are answered with
+429 Too Many Requests, like a throttling front end.
+"""
+
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from urllib.parse import parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def article_html(n, n_paragraphs=12):
+    paragraphs = "\n".join(
+        f'<p class="selectionShareable">Paragraph {j} of article {n}: '
+        f"officials said on Tuesday that talks would continue next week.</p>"
+        for j in range(n_paragraphs)
+    )
+    return f"""<!DOCTYPE html>
+<html><head><title>Article {n}</title>
+<script>var analytics = {{"id": {n}}};</script></head>
+<body>
+<nav><ul>{"".join(f"<li><a href='/en/{k}'>Menu {k}</a></li>" for k in range(40))}</ul></nav>
+<div class="detay-baslik"><h1>Article {n}</h1></div>
+<div class="detay-icerik">
+<h3>ANKARA</h3>
+{paragraphs}
+<p class="selectionShareable">Anadolu Agency website contains only a portion of the news stories.</p>
+</div>
+<footer>{"".join(f"<a href='/en/f{k}'>Footer {k}</a>" for k in range(60))}</footer>
+</body></html>"""
+
+
+SEARCH_PAGE_HTML = """<html><body><form>
+<input name="__RequestVerificationToken" type="hidden" value="local-token" />
+</form></body></html>"""
+
+
+def search_documents(category_id, page, page_size, total_docs):
+    """
+    Newest-first documents of one category, like the real search API.
+    Document n (1..total_docs) always has the same Id and CreateDate, so
+    raising total_docs simulates newly published articles.
+    """
+    first = (page - 1) * page_size
+    epoch = datetime(2024, 1, 1)
+    docs = []
+    for k in range(first, min(first + page_size, total_docs)):
+        n = total_docs - k
+        doc_id = category_id * 1_000_000 + n
+        created = epoch + timedelta(hours=n)
+        docs.append(
+            {
+                "Id": doc_id,
+                "Title": f"Article {doc_id}",
+                "Route": f"/en/world/article/{doc_id}",
+                "CreateDate": created.strftime("%Y-%m-%dT%H:%M:%S"),
+                "CreateDateString": created.strftime("%d.%m.%Y"),
+            }
+        )
+    return docs
+
+
+class ServerThrottle:
+    """Server-side token bucket deciding which requests get a 429."""
+
+    def __init__(self, max_rps, burst=None):
+        self.rate = max_rps
+        self.capacity = burst or max(1.0, max_rps / 4)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.n_throttled = 0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            self.n_throttled += 1
+            return False
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, body, content_type, status=200):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True  # client went away (e.g. a killed worker)
+
+    def _throttled(self):
+        throttle = self.server.throttle
+        if throttle is None or throttle.allow():
+            return False
+        self.send_response(429)
+        if self.server.retry_after is not None:
+            self.send_header("Retry-After", str(self.server.retry_after))
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        return True
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        if self._throttled():
+            return
+        if self.path.rstrip("/").endswith("/en/Search"):
+            self._send(SEARCH_PAGE_HTML.encode("utf-8"), "text/html; charset=utf-8")
+            return
+        n = self.path.rstrip("/").rsplit("/", 1)[-1]
+        body = article_html(n).encode("utf-8")
+        self._send(body, "text/html; charset=utf-8")
+
+    def do_POST(self):
+        time.sleep(self.server.latency)
+        length = int(self.headers.get("Content-Length", 0))
+        form = parse_qs(self.rfile.read(length).decode("utf-8"))
+        if self._throttled():
+            return
+        docs = search_documents(
+            int(form["CategoryId"][0]),
+            int(form["Page"][0]),
+            int(form["PageSize"][0]),
+            self.server.docs_per_category,
+        )
+        body = json.dumps({"Documents": docs}).encode("utf-8")
+        self._send(body, "application/json; charset=utf-8")
+
+
+class LocalAAServer:
+    """Context manager running the stand-in server on a free localhost port."""
+
+    def __init__(
+        self,
+        latency=0.05,
+        handler=_Handler,
+        docs_per_category=1000,
+        max_rps=None,
+        retry_after=None,
+    ):
+        self.latency = latency
+        self.docs_per_category = docs_per_category
+        self.throttle = ServerThrottle(max_rps) if max_rps else None
+        self.retry_after = retry_after
+        self.handler = handler
+        self.httpd = None
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def point_metadata_fetcher(self, fetcher):
+        """Redirects an AA_EnglishNewsMetadataFetcher instance to this server."""
+        fetcher.BASE_URL = self.base_url + "/en/Search"
+        fetcher.SEARCH_API_URL = self.base_url + "/en/Search/Search"
+        return fetcher
+
+    def __enter__(self):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self.handler)
+        self.httpd.daemon_threads = True
+        self.httpd.latency = self.latency
+        self.httpd.docs_per_category = self.docs_per_category
+        self.httpd.throttle = self.throttle
+        self.httpd.retry_after = self.retry_after
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
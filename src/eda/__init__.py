@@ -1,4 +1,12 @@
+from ..utils.lazy import lazy_exports
+
 __all__ = ["Analyzer", "TextAnalyzer", "ResultAnalyzer"]
-from .metadata_analysis import Analyzer
-from .text_analysis import TextAnalyzer
-from .result_analysis import ResultAnalyzer
+# Submodules are imported on first access (pandas, plotting libraries)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "Analyzer": ".metadata_analysis",
+        "TextAnalyzer": ".text_analysis",
+        "ResultAnalyzer": ".result_analysis",
+    },
+)
@@ -1,29 +1,58 @@
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import matplotlib.ticker as ticker
-import plotly.express as px
-import plotly.graph_objects as go
 
-from itertools import combinations
 from collections import Counter
 
+from ..utils.lazy import LazyModule
+from ..utils.storage import load_table
+from ..utils.tags import TagVocabulary, tag_codes, unique_tag_codes
+
+# Plotting libraries are only imported once a plot is drawn
+plt = LazyModule("matplotlib.pyplot")
+sns = LazyModule("seaborn")
+ticker = LazyModule("matplotlib.ticker")
+px = LazyModule("plotly.express")
+go = LazyModule("plotly.graph_objects")
+
 
 class Analyzer:
-    def __init__(self, source_file):
+    def __init__(self, source_file, columns=None, date_range=None, compact=True):
+        """
+        source_file: JSONL, Parquet or Arrow file
+        columns: only load these columns, e.g. ["Id", "Tags", "CreateDateString"]
+            (CreateDateString is always needed)
+        date_range: (start, end) on CreateDate; with Parquet, row groups
+            outside it are never read
+        compact: load into compact dtypes (utils.compact.compact_frame): integer
+            Ids, datetime64 dates, Tags as offsets plus integer tag codes
+
+        The tag analytics work on integer tag codes (utils.tags.tag_codes).
+        Columns of tag ids (EnglishPreprocessor.normalize_column("Tags")) are
+        named by the tag vocabulary saved next to `source_file`.
+        """
         self.source_file = source_file
+        self.columns = columns
+        self.date_range = date_range
+        self.compact = compact
         self.df = None
         self._load_data()
         self.tags = set()
+        self.tag_vocabulary = TagVocabulary.for_dataset(source_file)
+        self._tag_codes_cache = {}
         self.df["date"] = pd.to_datetime(
             self.df["CreateDateString"], format="%d.%m.%Y", errors="coerce"
         )
 
     # DF Analysis
     def _load_data(self):
-        """Load the JSONL metadata file into a DataFrame."""
+        """Load the JSONL (or Parquet/Arrow) metadata file into a DataFrame."""
         try:
-            self.df = pd.read_json(self.source_file, lines=True)
+            self.df = load_table(
+                self.source_file,
+                columns=self.columns,
+                date_range=self.date_range,
+                compact=self.compact,
+            )
             self.df["date"] = pd.to_datetime(
                 self.df["CreateDateString"], format="%d.%m.%Y"
             )
@@ -70,21 +99,54 @@ class Analyzer:
             print(value)
 
     # Tag Analysis
+    def _tag_mask(self, tag, tag_col, match_strings=False):
+        """
+        Rows whose tags contain `tag` (case-insensitive), on the tag codes.
+        match_strings: also match plain string values by substring
+        """
+        codes = self._tag_codes(tag_col)
+        mask = np.zeros(len(self.df), dtype=bool)
+        mask[codes.rows[np.isin(codes.codes, self._tag_ids(tag, tag_col))]] = True
+        if match_strings:
+            tag_lower = tag.lower()
+            mask |= [
+                isinstance(value, str) and tag_lower in value.lower()
+                for value in self.df[tag_col]
+            ]
+        return pd.Series(mask, index=self.df.index)
+
+    def _tag_codes(self, tag_col, unique=False):
+        """
+        TagCodes of `tag_col`, built once per column (and loaded frame).
+        unique: every tag once per row
+        """
+        key = (tag_col, unique)
+        cached = self._tag_codes_cache.get(key)
+        if cached is not None and cached[0] is self.df:
+            return cached[1]
+        if unique:
+            codes = unique_tag_codes(self._tag_codes(tag_col))
+        else:
+            codes = tag_codes(self.df[tag_col], self.tag_vocabulary)
+        self._tag_codes_cache[key] = (self.df, codes)
+        return codes
+
+    def _tag_ids(self, tag, tag_col):
+        """Ids of the tags of `tag_col` equal to `tag`, ignoring case."""
+        tag_lower = tag.lower()
+        names = self._tag_codes(tag_col).names
+        return [i for i, name in enumerate(names) if str(name).lower() == tag_lower]
+
+    def _top_tag_ids(self, counts, top_n):
+        """Ids of the `top_n` most counted tags, ties in id order."""
+        order = np.argsort(-counts, kind="stable")[:top_n]
+        return order[counts[order] > 0]
+
     def get_tag_counts(self, col="Tags"):
-        tag_counter = Counter()
-        for tag_list in self.df[col]:
-            if isinstance(tag_list, list):
-                for tag in tag_list:
-                    if tag:  # skip empty
-                        tag_counter.update([tag])
-            elif isinstance(tag_list, str):
-                # Assume tags in string are comma-separated, or just one tag
-                tags = [
-                    tag.strip().lower() for tag in tag_list.split(",") if tag.strip()
-                ]
-                tag_counter.update(tags)
-            # Else: skip (could be None, float, etc.)
-        return tag_counter
+        """Counter of tag -> occurrences (comma-separated strings are lowercased)."""
+        codes = self._tag_codes(col)
+        counts = np.bincount(codes.codes, minlength=len(codes.names))
+        return Counter({codes.names[i]: int(counts[i]) for i in np.flatnonzero(counts)})
 
     def plot_tag_counts(self, tags_col="Tags", top_n=20):
         tag_counter = self.get_tag_counts(tags_col)
@@ -206,12 +268,7 @@ class Analyzer:
     def plot_tag_coverage_over_time(
         self, tag, date_col="date", tags_col="Tags", top_n_months=None, color="#009688"
     ):
-        tag_lower = tag.lower()
-        mask = self.df[tags_col].apply(
-            lambda tags: tag_lower in [str(t).lower() for t in tags]
-            if isinstance(tags, list)
-            else tag_lower in str(tags).lower()
-        )
+        mask = self._tag_mask(tag, tags_col, match_strings=True)
         tag_df = self.df[mask]
         if tag_df.empty:
             print(f'No articles found with tag "{tag}"')
@@ -254,20 +311,24 @@ class Analyzer:
         # return monthly_counts
 
     def tag_cooccurrence_matrix(self, tag_col="Tags", top_n=20, plot_heatmap=True):
-        co_counter = Counter()
-        tag_freq = Counter()
-        for taglist in self.df[tag_col].dropna():
-            unique_tags = list(set(taglist))
-            tag_freq.update(unique_tags)
-            for tag_pair in combinations(sorted(unique_tags), 2):
-                co_counter[tag_pair] += 1
-
-        top_tags = [tag for tag, _ in tag_freq.most_common(top_n)]
-        matrix = pd.DataFrame(0, index=top_tags, columns=top_tags, dtype=int)
-        for (tag1, tag2), count in co_counter.items():
-            if tag1 in top_tags and tag2 in top_tags:
-                matrix.loc[tag1, tag2] = count
-                matrix.loc[tag2, tag1] = count
+        codes = self._tag_codes(tag_col, unique=True)
+        tag_freq = np.bincount(codes.codes, minlength=len(codes.names))
+        top = self._top_tag_ids(tag_freq, top_n)
+        top_tags = [codes.names[i] for i in top]
+
+        # Positions of the top tags in the matrix; other tags are dropped
+        position = np.full(max(len(codes.names), 1), -1, dtype=np.int64)
+        position[top] = np.arange(len(top))
+        keep = position[codes.codes] >= 0
+        rows, pos = codes.rows[keep], position[codes.codes[keep]]
+        # Pair every top tag of a row with the ones after it in that row
+        counts = np.zeros(len(top) * len(top), dtype=np.int64)
+        for shift in range(1, len(top)):
+            same_row = rows[shift:] == rows[:-shift]
+            pairs = pos[:-shift][same_row] * len(top) + pos[shift:][same_row]
+            counts += np.bincount(pairs, minlength=len(counts))
+        co = counts.reshape(len(top), len(top))
+        matrix = pd.DataFrame(co + co.T, index=top_tags, columns=top_tags, dtype=int)
 
         if plot_heatmap:
             fig = go.Figure(
@@ -294,38 +355,28 @@ class Analyzer:
         """
         Returns a DataFrame: rows=month, cols=top N tags, values=article counts.
         """
-        # Flatten: for each article and tag, record (month, tag)
-        rows = []
-        for idx, row in self.df.iterrows():
-            # if pd.isna(row[tag_col]) or not row[tag_col]:
-            #     continue
-            month = pd.to_datetime(row[date_col]).to_period("M")
-            for tag in set(row[tag_col]):  # dedupe just in case
-                rows.append({"month": month, "tag": tag})
-
-        tag_month_df = pd.DataFrame(rows)
-        # Count occurrences per (month, tag)
-        tag_month_counts = (
-            tag_month_df.groupby(["month", "tag"]).size().reset_index(name="count")
-        )
-        # Get top N tags overall
-        top_tags = (
-            tag_month_counts.groupby("tag")["count"]
-            .sum()
-            .sort_values(ascending=False)
-            .head(top_n)
-            .index.tolist()
+        codes = self._tag_codes(tag_col, unique=True)
+        months, month_index = pd.factorize(
+            pd.to_datetime(self.df[date_col]).dt.to_period("M"), sort=True
         )
-        tag_month_counts = tag_month_counts[tag_month_counts["tag"].isin(top_tags)]
-        # Pivot to month × tag table
-        matrix = (
-            tag_month_counts.pivot(index="month", columns="tag", values="count")
-            .fillna(0)
-            .astype(int)
-        )
-        # Sort by time
-        matrix = matrix.sort_index()
-        return matrix
+        # Count (month, tag) pairs of the articles with a date
+        month_of = months[codes.rows]
+        dated = month_of >= 0
+        n_tags = len(codes.names)
+        counts = np.bincount(
+            month_of[dated] * n_tags + codes.codes[dated],
+            minlength=len(month_index) * n_tags,
+        ).reshape(len(month_index), n_tags)
+        # Top N tags overall, columns in tag order (as a pivot sorts them)
+        top = self._top_tag_ids(counts.sum(axis=0), top_n)
+        top = top[np.argsort([codes.names[i] for i in top], kind="stable")]
+        counts = counts[:, top]
+        has_top = counts.sum(axis=1) > 0
+        return pd.DataFrame(
+            counts[has_top],
+            index=pd.Index(month_index[has_top], name="month"),
+            columns=pd.Index([codes.names[i] for i in top], name="tag"),
+        ).astype(int)
 
     @staticmethod
     def plot_tag_temporal_shifts(matrix):
@@ -367,19 +418,23 @@ class Analyzer:
             emergence_df: DataFrame with window, emergent_tags, decayed_tags
         """
         # 1. Assign window
-        df = self.df.copy()
-        df["window"] = pd.to_datetime(df[date_col]).dt.to_period(freq)
-
-        # 2. Get tags per window
-        window_tags = {}
-        for window, group in df.groupby("window"):
-            tags = []
-            for taglist in group[tag_col]:
-                if isinstance(taglist, list):
-                    tags += taglist
-            tag_counts = pd.Series(tags).value_counts()
-            tags_set = set(tag_counts[tag_counts >= min_window_count].index)
-            window_tags[window] = tags_set
+        windows, window_index = pd.factorize(
+            pd.to_datetime(self.df[date_col]).dt.to_period(freq), sort=True
+        )
+
+        # 2. Get the tags counted at least min_window_count times per window
+        codes = self._tag_codes(tag_col)
+        window_of = windows[codes.rows]
+        dated = window_of >= 0
+        n_tags = max(len(codes.names), 1)
+        keys, counts = np.unique(
+            window_of[dated].astype(np.int64) * n_tags + codes.codes[dated],
+            return_counts=True,
+        )
+        tag_sets = [set() for _ in window_index]
+        for key in keys[counts >= min_window_count]:
+            tag_sets[key // n_tags].add(codes.names[key % n_tags])
+        window_tags = dict(zip(window_index, tag_sets))
 
         # 3. Compare window to previous/next
         windows = sorted(window_tags)
@@ -445,12 +500,7 @@ class Analyzer:
         agg="mean",
         time_unit="days",
     ):
-        tag_lower = tag.lower()
-        mask = self.df[tag_col].apply(
-            lambda tags: tag_lower in [str(t).lower() for t in tags]
-            if isinstance(tags, list)
-            else False
-        )
+        mask = self._tag_mask(tag, tag_col)
         tag_dates = self.df.loc[mask, date_col]
         if tag_dates.empty:
             print(f"No articles found for tag '{tag}'.")
@@ -516,13 +566,7 @@ class Analyzer:
         For a given tag, find first, peak, and last article appearance, plus lifespan.
         Optionally, return/plot daily or weekly trend.
         """
-        tag_lower = tag.lower()
-        mask = self.df[tag_col].apply(
-            lambda tags: tag_lower in [str(t).lower() for t in tags]
-            if isinstance(tags, list)
-            else False
-        )
-        event_df = self.df.loc[mask].copy()
+        event_df = self.df.loc[self._tag_mask(tag, tag_col)].copy()
         if event_df.empty:
             print(f"No articles found for tag '{tag}'.")
             return None
@@ -1,6 +1,9 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import plotly.express as px
+
+from ..utils.lazy import LazyModule
+
+plt = LazyModule("matplotlib.pyplot")
+px = LazyModule("plotly.express")
 
 
 class ResultAnalyzer:
@@ -1,12 +1,33 @@
 import pandas as pd
 from collections import Counter
-import matplotlib.pyplot as plt
-import plotly.express as px
+
+from ..utils.lazy import LazyModule
+from ..utils.storage import load_table
+
+plt = LazyModule("matplotlib.pyplot")
+px = LazyModule("plotly.express")
 
 
 class TextAnalyzer:
-    def __init__(self, source_file, id_col="Id", title_col="Title"):
+    def __init__(
+        self,
+        source_file,
+        id_col="Id",
+        title_col="Title",
+        columns=None,
+        date_range=None,
+        compact=True,
+    ):
+        """
+        source_file: JSONL, Parquet or Arrow file
+        columns / date_range: passed to utils.storage.load_table, to load only
+            the columns (and CreateDate range) an analysis needs
+        compact: load into compact dtypes (utils.compact.compact_frame)
+        """
         self.source_file = source_file
+        self.columns = columns
+        self.date_range = date_range
+        self.compact = compact
         self.df = None
         self._load_data()
 
@@ -14,9 +35,14 @@ class TextAnalyzer:
         self.title_col = title_col
 
     def _load_data(self):
-        """Load the JSONL metadata file into a DataFrame."""
+        """Load the JSONL (or Parquet/Arrow) file into a DataFrame."""
         try:
-            self.df = pd.read_json(self.source_file, lines=True)
+            self.df = load_table(
+                self.source_file,
+                columns=self.columns,
+                date_range=self.date_range,
+                compact=self.compact,
+            )
             print(f"✅ Loaded {len(self.df)} records from {self.source_file}")
         except Exception as e:
             print(f"❌ Failed to load data: {e}")
@@ -1,8 +1,24 @@
+from ..utils.lazy import lazy_exports
+
 __all__ = [
     "DataCleaner",
     "DataCombiner",
     "EnglishPreprocessor",
+    "IncrementalPreprocessor",
+    "NearDuplicateDetector",
+    "NlpEnricher",
+    "StreamingPipeline",
 ]
-from .data_cleaner import DataCleaner
-from .data_combiner import DataCombiner
-from .text_preprocessor_en import EnglishPreprocessor
+# Submodules are imported on first access (pandas, NLTK, ...)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "DataCleaner": ".data_cleaner",
+        "DataCombiner": ".data_combiner",
+        "EnglishPreprocessor": ".text_preprocessor_en",
+        "IncrementalPreprocessor": ".incremental",
+        "NearDuplicateDetector": ".near_duplicates",
+        "NlpEnricher": ".nlp_enrichment",
+        "StreamingPipeline": ".streaming_pipeline",
+    },
+)
@@ -1,21 +1,108 @@
+import numpy as np
 import pandas as pd
 import re
+from concurrent.futures import ProcessPoolExecutor
+
+from ..utils.chunked import JsonlChunkWriter, read_jsonl_chunks, unseen_mask
+from ..utils.jsonl_io import dumps_line, open_jsonl
+from ..utils.profiling import stage, stage_rows
+from ..utils.storage import load_table, save_table
+from .near_duplicates import NearDuplicateDetector
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # Arrow-backed fast path is optional
+    pa = pc = None
+
+# Dateline prefix of an article, e.g. "ANKARA" or "ISTANBUL /".
+#
+# How it works:
+# ^(?:\"full_text\":\")?  - Optionally matches the 'full_text' wrapper.
+# ([A-Z\s/]{3,})          - Matches a prefix of at least 3 uppercase letters, spaces, or slashes.
+#                         (This prevents it from matching acronyms like "US").
+# (?=[A-Z][^A-Z\s])      - This is the crucial lookahead. It ensures the prefix is followed by
+#                         a capitalized word. It checks for:
+#                         [A-Z]: An uppercase letter (like 'T' in 'Türkiye').
+#                         [^A-Z\s]: A character that is NOT an uppercase letter or a space.
+#                                  This correctly matches 'ü', 'u', etc.
+#
+PREFIX_PATTERN = re.compile(r"^(?:\"full_text\":\")?([A-Z\s/]{3,})(?=[A-Z][^A-Z\s])")
+
+# Everything from the first of these markers on is site boilerplate
+FOOTER_MARKERS = (
+    "Anadolu Agency website contains only",
+    "Please contact us for subscription options",
+    "Related topics",
+    "Bu haberi paylaşın",
+)
+
+
+# The same cleaning as RE2 patterns for pyarrow.compute. RE2 has no lookahead,
+# so the looked-ahead characters are captured and put back, and its \s is
+# ASCII-only, so Python's whitespace (str.isspace) is spelled out.
+_WHITESPACE = (
+    "\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002\u2003"
+    "\u2004\u2005\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000"
+)
+_RE2_WHITESPACE = (
+    r"\t\n\x0b\x0c\r\x1c-\x1f \x85\xa0\x{1680}\x{2000}-\x{200a}"
+    r"\x{2028}\x{2029}\x{202f}\x{205f}\x{3000}"
+)
+_ARROW_PREFIX_PATTERN = (
+    r'^(?:"full_text":")?[A-Z/' + _RE2_WHITESPACE + r"]{3,}"
+    r"([A-Z][^A-Z" + _RE2_WHITESPACE + r"])"
+)
+_ARROW_FOOTER_PATTERN = (
+    "(?s)(?:" + "|".join(re.escape(marker) for marker in FOOTER_MARKERS) + ").*"
+)
+
+
+def _clean_values(values):
+    # Module level so the process pool can pickle it
+    clean = DataCleaner.sub_clean_aa_english_article
+    return [clean(text) for text in values]
+
+
+def _clean_arrow(arr):
+    """sub_clean_aa_english_article on a pyarrow string array, in C++ kernels."""
+    arr = pc.replace_substring_regex(
+        arr, _ARROW_PREFIX_PATTERN, r"\1", max_replacements=1
+    )
+    arr = pc.utf8_trim(arr, _WHITESPACE)
+    arr = pc.replace_substring_regex(arr, '"$', "", max_replacements=1)
+    arr = pc.replace_substring_regex(arr, _ARROW_FOOTER_PATTERN, "", max_replacements=1)
+    return pc.utf8_trim(arr, _WHITESPACE)
+
+
+def _concat_lists(chunks):
+    return [text for chunk in chunks for text in chunk]
 
 
 class DataCleaner:
-    def __init__(self, df: pd.DataFrame):
-        self.data = df.copy()
+    def __init__(self, df: pd.DataFrame, copy=True, verbose=True):
+        """
+        copy: work on a copy of `df` (chunked runs pass False, the chunk is theirs)
+        verbose: print what each step removed
+        """
+        self.data = df.copy() if copy else df
+        self.verbose = verbose
 
     @staticmethod
-    def load_data(file):
+    @stage
+    def load_data(file, columns=None, date_range=None, compact=False):
+        """JSONL, Parquet or Arrow file (by extension); see utils.storage.load_table."""
         try:
-            df = pd.read_json(file, lines=True)
+            df = load_table(
+                file, columns=columns, date_range=date_range, compact=compact
+            )
             print(f"✅ Loaded {len(df)} records from {file}")
             return df
         except Exception as e:
             print(f"❌ Failed to load data: {e}")
             return pd.DataFrame()
 
+    @stage
     def filter_columns(self, columns_to_keep=None):
         if columns_to_keep:
             self.data = self.data.filter(items=columns_to_keep)
@@ -26,6 +113,7 @@ class DataCleaner:
         print("Missing values per column:\n", missing)
         return missing
 
+    @stage
     def drop_missing(self, columns=None):
         if columns:
             self.data = self.data.dropna(subset=columns)
@@ -33,6 +121,7 @@ class DataCleaner:
             self.data = self.data.dropna()
         return self.data
 
+    @stage
     def standardize_fields(self):
         if "CreateDate" in self.data.columns:
             self.data["CreateDate"] = pd.to_datetime(
@@ -47,63 +136,146 @@ class DataCleaner:
         if not isinstance(text, str):
             return text
 
-        # --- Start of Corrected Section ---
-
-        # This revised regex correctly handles unicode characters like 'ü'.
-        #
-        # How it works:
-        # ^(?:\"full_text\":\")?  - Optionally matches the 'full_text' wrapper.
-        # ([A-Z\s/]{3,})          - Matches a prefix of at least 3 uppercase letters, spaces, or slashes.
-        #                         (This prevents it from matching acronyms like "US").
-        # (?=[A-Z][^A-Z\s])      - This is the crucial lookahead. It ensures the prefix is followed by
-        #                         a capitalized word. It checks for:
-        #                         [A-Z]: An uppercase letter (like 'T' in 'Türkiye').
-        #                         [^A-Z\s]: A character that is NOT an uppercase letter or a space.
-        #                                  This correctly matches 'ü', 'u', etc.
-        #
-        prefix_pattern = r"^(?:\"full_text\":\")?([A-Z\s/]{3,})(?=[A-Z][^A-Z\s])"
-
-        text = re.sub(prefix_pattern, "", text).strip()
-
-        # --- End of Corrected Section ---
+        match = PREFIX_PATTERN.match(text)
+        if match:
+            text = text[match.end() :]
+        text = text.strip()
 
         if text.endswith('"'):
             text = text[:-1]
 
-        # Remove footers
-        footer_patterns = [
-            r"Anadolu Agency website contains only.*",
-            r"Please contact us for subscription options.*",
-            r"Related topics.*",
-            r"Bu haberi paylaşın.*",
-        ]
-        for pat in footer_patterns:
-            text = re.sub(pat, "", text, flags=re.DOTALL)
+        # Remove footers: cut at the earliest marker. The markers can't overlap,
+        # so this equals removing "<marker>.*" for each of them in turn.
+        cut = len(text)
+        for marker in FOOTER_MARKERS:
+            pos = text.find(marker, 0, cut)
+            if pos != -1:
+                cut = pos
+        return text[:cut].strip()
+
+    @staticmethod
+    def clean_text_series(
+        series, workers=None, chunksize=5000, min_rows_for_workers=20000
+    ):
+        """
+        sub_clean_aa_english_article over a whole Series, without .apply overhead.
 
-        return text.strip()
+        Arrow-backed string Series (the default "str" dtype with pyarrow) are
+        cleaned with vectorized pyarrow.compute kernels and never converted to
+        Python strings; anything else goes through the precompiled scalar path.
 
-    def clean_english_articles(self):
+        workers: with more than one worker and at least `min_rows_for_workers`
+        rows, chunks of `chunksize` rows are cleaned in a process pool.
+        """
+        if pa is not None and isinstance(series.array, pd.arrays.ArrowStringArray):
+            values, clean, combine = pa.array(series), _clean_arrow, pa.concat_arrays
+            dtype = series.dtype
+        else:
+            values, clean, combine = series.tolist(), _clean_values, _concat_lists
+            dtype = None
+        if workers and workers > 1 and len(values) >= min_rows_for_workers:
+            chunks = [
+                values[i : i + chunksize] for i in range(0, len(values), chunksize)
+            ]
+            if clean is _clean_arrow:
+                # A pickled Arrow slice carries its parent's whole buffer; compact it
+                chunks = [pa.concat_arrays([chunk]) for chunk in chunks]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                cleaned = combine(list(pool.map(clean, chunks)))
+        else:
+            cleaned = clean(values)
+        return pd.Series(cleaned, index=series.index, name=series.name, dtype=dtype)
+
+    @stage
+    def clean_english_articles(self, workers=None):
         if "Title" in self.data.columns:
             before = len(self.data)
             self.data = self.data[
-                ~self.data["Title"].str.contains("Morning Briefing", na=False)
+                ~self.data["Title"].str.contains(
+                    "Morning Briefing", na=False, regex=False
+                )
             ]
             after = len(self.data)
-            print(f"Removed {before - after} 'Morning Briefing' articles.")
+            if self.verbose:
+                print(f"Removed {before - after} 'Morning Briefing' articles.")
         if "full_text" in self.data.columns:
-            # The .apply call now uses the corrected function
-            self.data["full_text"] = self.data["full_text"].apply(
-                self.sub_clean_aa_english_article
+            self.data["full_text"] = self.clean_text_series(
+                self.data["full_text"], workers=workers
             )
         return self.data
 
-    def remove_duplicates(self):
+    @stage
+    def remove_duplicates(self, seen_ids=None):
+        """
+        seen_ids: optional set of Ids kept so far (in earlier chunks); rows with
+        those Ids are dropped as well, and the Ids kept here are added to it.
+        """
         before = len(self.data)
-        self.data = self.data.drop_duplicates(subset="Id", keep="first")
+        if seen_ids is None:
+            self.data = self.data.drop_duplicates(subset="Id", keep="first")
+        else:
+            self.data = self.data[unseen_mask(self.data["Id"].tolist(), seen_ids)]
         after = len(self.data)
-        print(f"Removed {before - after} duplicate articles by Id.")
+        if self.verbose:
+            print(f"Removed {before - after} duplicate articles by Id.")
         return self.data
 
+    @stage
+    def remove_near_duplicates(
+        self,
+        column="full_text_minimal",
+        threshold=0.8,
+        num_perm=128,
+        shingle_size=5,
+        report_path=None,
+    ):
+        """
+        Drops articles that are near-duplicates of an earlier one (same story
+        republished under a new Id, minor edits), with MinHash/LSH over word
+        shingles of `column` (see NearDuplicateDetector).
+
+        threshold: estimated Jaccard similarity of the shingle sets above
+            which two articles count as duplicates
+        report_path: optional JSONL file with one line per cluster: the kept
+            Id, the dropped Ids and their similarity to the kept article
+
+        The clusters are also kept in self.near_duplicate_clusters.
+        """
+        detector = NearDuplicateDetector(
+            threshold=threshold, num_perm=num_perm, shingle_size=shingle_size
+        )
+        clusters = detector.find_clusters(self.data[column].tolist())
+        ids = self.data["Id"].tolist()
+        self.near_duplicate_clusters = [
+            {
+                "kept": ids[members[0]],
+                "dropped": [ids[i] for i in members[1:]],
+                "similarity": sims[1:],
+            }
+            for members, sims in clusters
+        ]
+        drop = np.zeros(len(self.data), dtype=bool)
+        for members, _ in clusters:
+            drop[members[1:]] = True
+        before = len(self.data)
+        self.data = self.data[~drop]
+        if self.verbose:
+            print(
+                f"Removed {before - len(self.data)} near-duplicate articles "
+                f"in {len(clusters)} clusters (threshold {threshold})."
+            )
+            for cluster in self.near_duplicate_clusters[:5]:
+                print(
+                    f"  kept {cluster['kept']}, dropped {cluster['dropped'][:5]}"
+                    f"{' ...' if len(cluster['dropped']) > 5 else ''}"
+                )
+        if report_path:
+            with open_jsonl(report_path, "wb") as f:
+                for cluster in self.near_duplicate_clusters:
+                    f.write(dumps_line(cluster, default=str))
+        return self.data
+
+    @stage
     def filter_short_texts(self, min_length=150):
         if "full_text_minimal" in self.data.columns:
             before = len(self.data)
@@ -111,15 +283,46 @@ class DataCleaner:
                 self.data["full_text_minimal"].apply(lambda x: len(x) >= min_length)
             ]
             after = len(self.data)
-            print(
-                f"Filtered out {before - after} articles with 'full_text_minimal' shorter than {min_length} characters."
-            )
+            if self.verbose:
+                print(
+                    f"Filtered out {before - after} articles with 'full_text_minimal' shorter than {min_length} characters."
+                )
         return self.data
 
-    def save_df(self, save_path):
-        self.data.to_json(
-            path_or_buf=save_path,
-            orient="records",
-            force_ascii=False,
-            lines=True,
+    @classmethod
+    @stage
+    def clean_jsonl(
+        cls,
+        in_path,
+        out_path,
+        chunksize=10_000,
+        drop_missing=("full_text",),
+        workers=None,
+    ):
+        """
+        drop_missing -> clean_english_articles -> remove_duplicates on a JSONL
+        file, `chunksize` records at a time, appending each cleaned chunk to
+        `out_path`. Only one chunk and the set of Ids seen so far are in memory,
+        however large the file is. Returns the number of records written.
+        """
+        seen_ids = set()
+        n_read = 0
+        with JsonlChunkWriter(out_path) as writer:
+            for chunk in read_jsonl_chunks(in_path, chunksize):
+                n_read += len(chunk)
+                cleaner = cls(chunk, copy=False, verbose=False)
+                if drop_missing:
+                    cleaner.drop_missing(columns=list(drop_missing))
+                cleaner.clean_english_articles(workers=workers)
+                cleaner.remove_duplicates(seen_ids)
+                writer.write(cleaner.data)
+        stage_rows(rows_in=n_read)
+        print(
+            f"✅ Cleaned {in_path} into {out_path}: kept {writer.rows}/{n_read} records"
         )
+        return writer.rows
+
+    @stage
+    def save_df(self, save_path):
+        """Saves as JSONL, or as Parquet/Arrow for a .parquet/.arrow path."""
+        save_table(self.data, save_path)
@@ -1,16 +1,127 @@
+import os
+import tempfile
+
 import pandas as pd
 
+from ..utils.chunked import JsonlChunkWriter, read_jsonl_chunks, unseen_mask
+from ..utils.jsonl_io import (
+    dumps_line,
+    iter_lines,
+    iter_records,
+    jsonl_codec,
+    loads,
+    open_jsonl,
+)
+from ..utils.profiling import stage
+from ..utils.storage import load_table, save_table
+
+
+class JsonlOffsetIndex:
+    """
+    Id -> byte offset of the first record with that Id in a JSONL file.
+
+    Building it parses the file once but keeps only the Ids and their offsets
+    (no field values), so even a multi-GB file indexes in little memory;
+    get() then seeks to the record and parses just that line.
+
+    Compressed files can't be seeked into, so their lines are decompressed
+    into a temporary plain file while indexing and looked up there.
+
+    self.fields holds every field name seen in the file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.offsets = {}
+        self.fields = set()
+        self.n_corrupt = 0
+        spill = None
+        if jsonl_codec(path) is not None:
+            spill = tempfile.TemporaryFile()
+        offset = 0
+        for line in iter_lines(path):
+            start, offset = offset, offset + len(line)
+            if spill is not None:
+                spill.write(line)
+            try:
+                record = loads(line)
+                if isinstance(record, dict):
+                    self.fields.update(record)
+                news_id = record["Id"]
+            except (ValueError, KeyError, TypeError):
+                self.n_corrupt += line.strip() != b""
+                continue
+            self.offsets.setdefault(news_id, start)
+        if spill is not None:
+            spill.flush()
+        self._fh = spill if spill is not None else open(path, "rb")
+
+    def __contains__(self, news_id):
+        return news_id in self.offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def get(self, news_id):
+        """The first record with `news_id`, or None."""
+        offset = self.offsets.get(news_id)
+        if offset is None:
+            return None
+        self._fh.seek(offset)
+        return loads(self._fh.readline())
+
+    def close(self):
+        self._fh.close()
+
+
+def _iter_jsonl(path):
+    """Yields the records of a JSONL file; corrupt lines and Id-less records are skipped."""
+    for record in iter_records(path):
+        if "Id" in record:
+            yield record
+
+
+def _jsonl_fields(path):
+    """Every field name of the records of a JSONL file."""
+    fields = set()
+    for record in iter_records(path):
+        fields.update(record)
+    return fields
+
+
+def _merge_records(left, right, shared):
+    """
+    One pd.merge(left, right, on="Id") row: the `shared` fields (those of
+    both files, as pd.merge sees the columns) get _x / _y suffixes.
+    """
+    merged = {}
+    for key, value in left.items():
+        merged[key + "_x" if key in shared else key] = value
+    for key, value in right.items():
+        if key != "Id":
+            merged[key + "_y" if key in shared else key] = value
+    return merged
+
 
 class DataCombiner:
-    def __init__(self, metadata_file, body_file):
-        self.metadata_df = DataCombiner.load_data(metadata_file)
-        self.body_df = DataCombiner.load_data(body_file)
+    def __init__(self, metadata_file, body_file, load=True):
+        """
+        load: read both files into DataFrames now; pass False to only use
+            run(..., streaming=True), which never loads them
+        """
+        self.metadata_file = metadata_file
+        self.body_file = body_file
+        self.metadata_df = self.body_df = None
+        if load:
+            self.metadata_df = DataCombiner.load_data(metadata_file)
+            self.body_df = DataCombiner.load_data(body_file)
 
     @staticmethod
-    def load_data(file):
-        """Load the JSONL metadata file into a DataFrame."""
+    @stage
+    def load_data(file, columns=None, compact=False):
+        """Load the JSONL (or Parquet/Arrow) metadata file into a DataFrame."""
         try:
-            df = pd.read_json(file, lines=True)
+            df = load_table(file, columns=columns, compact=compact)
             print(f"✅ Loaded {len(df)} records from {file}")
             return df
         except Exception as e:
@@ -19,12 +130,14 @@ class DataCombiner:
             return df
 
     @staticmethod
+    @stage
     def join_df_inner(df_1, df_2):
         joined_df = pd.merge(df_1, df_2, how="inner", on="Id")
         joined_df = joined_df.drop_duplicates(subset="Id", keep="first")
         return joined_df
 
     @staticmethod
+    @stage
     def join_df_union(df_1, df_2):
         combined_df = pd.concat([df_1, df_2], ignore_index=True)
         combined_df = combined_df.drop_duplicates(subset="Id", keep="first")
@@ -39,10 +152,146 @@ class DataCombiner:
         print("random_rows", df.sample(5))
 
     @staticmethod
+    @stage
     def save(df: pd.DataFrame, path):
-        df.to_json(path_or_buf=path, orient="records", force_ascii=False, lines=True)
+        save_table(df, path)
+
+    @staticmethod
+    @stage
+    def combine_jsonl(metadata_file, body_file, path, join_type: str, chunksize=10_000):
+        """
+        Chunked version of run() that never loads the body file as a whole.
+
+        inner: the metadata file is loaded once (it has no article texts) and
+        every body chunk is merged with it, so rows come out in body-file order.
+        Fields of both files get _x / _y suffixes as in run(), which takes
+        one more pass over the body file.
+        union: both files are streamed, metadata first.
+        Either way duplicate Ids are dropped through a set of the Ids written.
+        Returns the number of records written.
+        """
+        if join_type not in ("inner", "union"):
+            raise ValueError(f"Unknown join_type {join_type!r}")
+        seen_ids = set()
+
+        def first_of_each_id(df):
+            return df[unseen_mask(df["Id"].tolist(), seen_ids)]
+
+        with JsonlChunkWriter(path) as writer:
+            if join_type == "inner":
+                metadata_df = DataCombiner.load_data(metadata_file)
+                # Suffix the fields the two files share up front: merging a
+                # chunk would only suffix those the chunk happens to have
+                shared = (set(metadata_df.columns) & _jsonl_fields(body_file)) - {"Id"}
+                metadata_df = metadata_df.rename(
+                    columns={field: field + "_x" for field in shared}
+                )
+                for chunk in read_jsonl_chunks(body_file, chunksize):
+                    chunk = chunk.rename(
+                        columns={field: field + "_y" for field in shared}
+                    )
+                    joined = pd.merge(metadata_df, chunk, how="inner", on="Id")
+                    writer.write(first_of_each_id(joined))
+            else:
+                for file in (metadata_file, body_file):
+                    for chunk in read_jsonl_chunks(file, chunksize):
+                        writer.write(first_of_each_id(chunk))
+        print(f"✅ Wrote {writer.rows} {join_type}-joined records to {path}")
+        return writer.rows
+
+    @staticmethod
+    @stage
+    def stream_join(metadata_file, body_file, path, join_type: str, flush_every=1000):
+        """
+        Joins two JSONL files record by record, without loading either of them,
+        with the semantics of join_df_inner / join_df_union (metadata is the
+        left side; one output record per Id, the first one of each side wins).
+
+        inner: a JsonlOffsetIndex of the smaller file is built and the larger
+        file is streamed past it; output follows the larger file's order.
+        Fields present in both files get _x (metadata) and _y (body)
+        suffixes, like pd.merge; finding the larger file's fields takes one
+        more pass over it. Fields a record doesn't have are left out rather
+        than written as null.
+        union: the metadata file and then the body file are streamed, keeping
+        the first record of every Id.
+
+        Memory holds the Ids (and for inner, the offsets of the smaller file),
+        never the records. Any of the files may be .gz / .zst compressed; the
+        output is written in frames of `flush_every` records. Returns the
+        number of records written.
+        """
+        if join_type not in ("inner", "union"):
+            raise ValueError(f"Unknown join_type {join_type!r}")
+        seen_ids = set()
+        n_written = 0
+        buffer = []
+        with open_jsonl(path, "wb") as out:
+
+            def write(record):
+                nonlocal n_written
+                buffer.append(dumps_line(record))
+                n_written += 1
+                if len(buffer) >= flush_every:
+                    out.write(b"".join(buffer))
+                    out.flush()
+                    buffer.clear()
+
+            if join_type == "inner":
+                metadata_is_smaller = os.path.getsize(metadata_file) <= os.path.getsize(
+                    body_file
+                )
+                indexed, streamed = (
+                    (metadata_file, body_file)
+                    if metadata_is_smaller
+                    else (body_file, metadata_file)
+                )
+                index = JsonlOffsetIndex(indexed)
+                print(f"Indexed {len(index)} Ids of {indexed}")
+                if index.n_corrupt:
+                    print(
+                        f"Warning: skipped {index.n_corrupt} corrupt lines in {indexed}."
+                    )
+                # Suffixes go by the fields of the files, not of the two
+                # records: the streamed file needs a pass of its own for them
+                shared = (index.fields & _jsonl_fields(streamed)) - {"Id"}
+                try:
+                    for record in _iter_jsonl(streamed):
+                        news_id = record["Id"]
+                        if news_id in seen_ids or news_id not in index:
+                            continue
+                        seen_ids.add(news_id)
+                        other = index.get(news_id)
+                        if metadata_is_smaller:
+                            write(_merge_records(other, record, shared))
+                        else:
+                            write(_merge_records(record, other, shared))
+                finally:
+                    index.close()
+            else:
+                for file in (metadata_file, body_file):
+                    for record in _iter_jsonl(file):
+                        if record["Id"] not in seen_ids:
+                            seen_ids.add(record["Id"])
+                            write(record)
+            out.write(b"".join(buffer))
+        print(f"✅ Wrote {n_written} {join_type}-joined records to {path}")
+        return n_written
 
-    def run(self, path, join_type: str):
+    @stage
+    def run(self, path, join_type: str, streaming=False):
+        """
+        streaming: join the two files with stream_join instead of in memory
+        (JSONL output only)
+        """
+        if streaming:
+            DataCombiner.stream_join(
+                self.metadata_file, self.body_file, path, join_type
+            )
+            return
+        if self.metadata_df is None:
+            self.metadata_df = DataCombiner.load_data(self.metadata_file)
+            self.body_df = DataCombiner.load_data(self.body_file)
         if join_type == "inner":
             joined_df = DataCombiner.join_df_inner(self.metadata_df, self.body_df)
         elif join_type == "union":
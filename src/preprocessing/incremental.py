@@ -0,0 +1,287 @@
+import hashlib
+import inspect
+import json
+import os
+
+import pandas as pd
+
+from ..utils.chunked import JsonlChunkWriter
+from ..utils.storage import load_table, save_table, table_format
+from ..utils.tags import TagVocabulary, tag_vocabulary_path
+from .data_cleaner import FOOTER_MARKERS, PREFIX_PATTERN, DataCleaner
+from .text_preprocessor_en import EnglishPreprocessor
+
+# Code whose output ends up in the preprocessed records: a change to any of it
+# changes the preprocessing version, so every record is redone once
+VERSIONED_FUNCTIONS = (
+    DataCleaner.sub_clean_aa_english_article,
+    DataCleaner.clean_english_articles,
+    DataCleaner.filter_short_texts,
+    EnglishPreprocessor.minimal_preprocess,
+    EnglishPreprocessor.normalize_text,
+    EnglishPreprocessor.normalize_tags,
+    EnglishPreprocessor._lemmatize_token,
+)
+
+
+def _source(func):
+    try:
+        return inspect.getsource(func)
+    except (OSError, TypeError):  # No source available: fall back to bytecode
+        return func.__code__.co_code.hex()
+
+
+def preprocessing_version(config):
+    """Hash of the preprocessing settings in `config` and the code that applies them."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps(config, sort_keys=True).encode("utf-8"))
+    h.update(PREFIX_PATTERN.pattern.encode("utf-8"))
+    h.update("\x00".join(FOOTER_MARKERS).encode("utf-8"))
+    for func in VERSIONED_FUNCTIONS:
+        h.update(_source(func).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _hashable(value):
+    # Lists (Tags) and dicts can't be hashed by pandas; hash their JSON
+    if isinstance(value, (list, tuple, dict)):
+        return json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
+    return value
+
+
+def record_hashes(df):
+    """
+    64-bit content hash of every record (row) of `df` over all of its fields,
+    vectorized with pandas' row hashing.
+    """
+    frame = df[sorted(df.columns)].copy()
+    for name in frame.columns:
+        if frame[name].dtype == object:
+            frame[name] = frame[name].map(_hashable)
+    return (
+        pd.util.hash_pandas_object(frame, index=False, categorize=False)
+        .to_numpy()
+        .view("int64")
+    )
+
+
+def _save_atomic(df, path):
+    root, ext = os.path.splitext(path)
+    tmp_path = f"{root}.tmp{ext}"
+    save_table(df, tmp_path)
+    os.replace(tmp_path, path)
+
+
+class IncrementalPreprocessor:
+    """
+    The DataCleaner -> EnglishPreprocessor flow over a growing corpus, redone
+    only for the records that are new or changed since the last run.
+
+    A manifest next to the output keeps, for every input record, its Id, a
+    hash of its content, the preprocessing-version hash (settings plus the
+    cleaning and normalization code, see preprocessing_version) and whether
+    the pipeline kept it. On each run:
+
+    1. the input is deduplicated by Id and hashed,
+    2. records whose Id, content hash or version hash is not in the manifest
+       go through drop_missing -> clean_english_articles ->
+       minimal_preprocess_column / normalize_column -> filter_short_texts,
+    3. the result replaces their old rows in the existing output, records
+       no longer in the input are removed, and output and manifest are saved.
+
+    When the run only adds records at the end of the input (the usual daily
+    crawl) and the output is JSONL, the new records are appended to it
+    instead: the previous output is neither read nor rewritten. Otherwise,
+    and always for Parquet/Arrow outputs, the previous output is loaded and
+    rewritten whole, so that I/O still grows with the corpus. The input is
+    always read and hashed in full, and the manifest rewritten.
+
+    The output has the input's record order and equals a full run over the
+    whole input. Changing the settings or the code reprocesses everything
+    once. Near-duplicate removal compares records with each other, so run it
+    on the output (DataCleaner.remove_near_duplicates) rather than here.
+    """
+
+    def __init__(
+        self,
+        out_path,
+        manifest_path=None,
+        minimal_columns=("full_text",),
+        normalize_columns=(),
+        drop_missing=("full_text",),
+        min_length=None,
+        workers=None,
+    ):
+        """
+        out_path: the preprocessed corpus (JSONL, or Parquet/Arrow by extension)
+        manifest_path: defaults to <out_path without extension>.manifest.parquet
+        minimal_columns / normalize_columns: as in EnglishPreprocessor.preprocess_jsonl
+        min_length: if given, drop records whose full_text_minimal is shorter
+        workers: process pool size for cleaning and normalization
+        """
+        self.out_path = out_path
+        self.manifest_path = (
+            manifest_path or os.path.splitext(out_path)[0] + ".manifest.parquet"
+        )
+        self.minimal_columns = tuple(minimal_columns)
+        self.normalize_columns = tuple(normalize_columns)
+        self.drop_missing = tuple(drop_missing)
+        self.min_length = min_length
+        self.workers = workers
+        self.version = preprocessing_version(
+            {
+                "minimal_columns": self.minimal_columns,
+                "normalize_columns": self.normalize_columns,
+                "drop_missing": self.drop_missing,
+                "min_length": self.min_length,
+            }
+        )
+        self.tag_vocabulary = None
+        self.stats = {}
+
+    def _load_manifest(self):
+        # Without the output the manifest's records have nothing to reuse
+        if not (os.path.exists(self.manifest_path) and os.path.exists(self.out_path)):
+            return pd.DataFrame(
+                columns=["Id", "content_hash", "preprocessing_version", "kept"]
+            )
+        return load_table(self.manifest_path)
+
+    def _process(self, df):
+        """The full pipeline on the records of `df`."""
+        cleaner = DataCleaner(df, verbose=False)
+        if self.drop_missing:
+            cleaner.drop_missing(columns=list(self.drop_missing))
+        cleaner.clean_english_articles(workers=self.workers)
+        preprocessor = EnglishPreprocessor(tag_vocabulary=self.tag_vocabulary)
+        preprocessor.data = cleaner.data
+        for column in self.minimal_columns:
+            preprocessor.minimal_preprocess_column(column)
+        for column in self.normalize_columns:
+            preprocessor.normalize_column(column, workers=self.workers)
+        if self.min_length is not None:
+            cleaner.data = preprocessor.data
+            preprocessor.data = cleaner.filter_short_texts(self.min_length)
+        return preprocessor.data
+
+    def _is_append(self, manifest, hashes, delta):
+        """True if the delta is only new records after the known ones, in order."""
+        n_known = len(manifest)
+        return (
+            table_format(self.out_path) == "jsonl"
+            and n_known > 0
+            and len(delta) == len(hashes) - n_known
+            and manifest["Id"].tolist() == list(hashes.index[:n_known])
+        )
+
+    def _append(self, processed):
+        """Appends `processed` to the JSONL output, undoing a partial write."""
+        size = os.path.getsize(self.out_path)
+        try:
+            with JsonlChunkWriter(self.out_path, mode="ab") as writer:
+                writer.write(processed)
+        except BaseException:
+            with open(self.out_path, "r+b") as f:
+                f.truncate(size)
+            raise
+
+    def run(self, data, return_output=True):
+        """
+        Brings the output up to date with `data` (a DataFrame, or a path
+        load_table can read) and returns the output DataFrame.
+
+        return_output: False returns None instead, so that appending runs
+        and runs without changes don't read the previous output either
+        """
+        if not isinstance(data, pd.DataFrame):
+            data = load_table(data)
+        data = data.drop_duplicates(subset="Id", keep="first").reset_index(drop=True)
+        hashes = pd.Series(record_hashes(data), index=data["Id"])
+
+        manifest = self._load_manifest()
+        known = dict(
+            zip(
+                manifest["Id"],
+                zip(manifest["content_hash"], manifest["preprocessing_version"]),
+            )
+        )
+        changed = [
+            known.get(news_id) != (content_hash, self.version)
+            for news_id, content_hash in hashes.items()
+        ]
+        delta = data[changed]
+        removed = set(known) - set(hashes.index)
+        print(
+            f"Incremental preprocessing: {len(delta)} new or changed and "
+            f"{len(removed)} removed of {len(data)} records."
+        )
+        self.stats = {
+            "records": len(data),
+            "processed": len(delta),
+            "removed": len(removed),
+        }
+        if (
+            not len(delta)
+            and not removed
+            and manifest["Id"].tolist() == list(hashes.index)
+        ):
+            self.stats["kept"] = int(manifest["kept"].sum())
+            print(f"✅ '{self.out_path}' is up to date ({self.stats['kept']} records).")
+            return load_table(self.out_path) if return_output else None
+
+        # Reused records keep their tag ids: extend the saved vocabulary
+        vocabulary = None
+        if len(delta) < len(data):
+            vocabulary = TagVocabulary.for_dataset(self.out_path)
+        self.tag_vocabulary = vocabulary if vocabulary is not None else TagVocabulary()
+        processed = self._process(delta) if len(delta) else delta.iloc[:0]
+        append = self._is_append(manifest, hashes, delta)
+        if append:
+            kept = set(manifest["Id"][manifest["kept"].astype(bool)])
+            kept |= set(processed["Id"])
+        else:
+            if len(delta) < len(data):
+                previous = load_table(self.out_path)
+                stale = set(delta["Id"]) | removed
+                previous = previous[~previous["Id"].isin(stale)]
+                output = pd.concat([previous, processed], ignore_index=True)
+            else:
+                output = processed.reset_index(drop=True)
+            # Input order, so the output equals that of a full run
+            position = pd.Series(range(len(data)), index=data["Id"])
+            output = output.iloc[
+                position.loc[output["Id"]].argsort(kind="stable")
+            ].reset_index(drop=True)
+            kept = set(output["Id"])
+
+        manifest = pd.DataFrame(
+            {
+                "Id": hashes.index,
+                "content_hash": hashes.values,
+                "preprocessing_version": self.version,
+                "kept": [news_id in kept for news_id in hashes.index],
+            }
+        )
+        if len(self.tag_vocabulary):
+            # Before the output: its ids must always be in the saved vocabulary
+            self.tag_vocabulary.save(tag_vocabulary_path(self.out_path))
+        if append:
+            # The manifest is written first and only swapped in after the
+            # append, so an interrupted run doesn't append the records twice
+            root, ext = os.path.splitext(self.manifest_path)
+            tmp_manifest = f"{root}.tmp{ext}"
+            save_table(manifest, tmp_manifest)
+            self._append(processed)
+            os.replace(tmp_manifest, self.manifest_path)
+        else:
+            _save_atomic(output, self.out_path)
+            _save_atomic(manifest, self.manifest_path)
+        self.stats["kept"] = len(kept)
+        print(
+            f"✅ {'Appended' if append else 'Saved'} {len(processed)} of "
+            f"{len(kept)} records to '{self.out_path}' "
+            f"({len(delta)} processed, {len(data) - len(delta)} reused)."
+        )
+        if not return_output:
+            return None
+        return load_table(self.out_path) if append else output
@@ -0,0 +1,185 @@
+import zlib
+
+import numpy as np
+
+_MASK32 = np.uint64(0xFFFFFFFF)
+_SHIFT32 = np.uint64(32)
+
+
+def lsh_bands(num_perm, threshold):
+    """
+    (bands, rows) with bands * rows == num_perm: the most rows per band whose
+    approximate S-curve threshold (1 / bands) ** (1 / rows) is still at most
+    `threshold`. Leaning low favours recall; false candidates are weeded out
+    by comparing their signatures anyway.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if num_perm % rows == 0 and (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+
+class _UnionFind:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, x):
+        parent = self.parent
+        root = x
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while x != root:  # path compression
+            parent[x], x = root, parent.get(x, x)
+        return root
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            # The smaller row number (the earlier article) stays the root
+            if rb < ra:
+                ra, rb = rb, ra
+            self.parent[rb] = ra
+
+
+class NearDuplicateDetector:
+    """
+    Finds near-duplicate articles (republished wire stories, minor edits) with
+    MinHash signatures over word shingles and LSH banding.
+
+    - Every text becomes the set of its `shingle_size`-word shingles, hashed to
+      32 bits, and a `num_perm`-value MinHash signature. The fraction of equal
+      signature values estimates the Jaccard similarity of two shingle sets.
+    - Signatures are cut into bands; texts sharing any band are candidates,
+      and only candidates are compared, so the work grows about linearly with
+      the corpus instead of with the number of pairs. The band/row split is
+      chosen so pairs around `threshold` become candidates.
+    - Candidates whose estimated similarity is at least `threshold` are
+      merged into clusters (union-find). Within a cluster the earliest text is
+      the one to keep.
+
+    Signatures of `batch_size` texts are computed at once with numpy.
+    """
+
+    def __init__(
+        self,
+        threshold=0.8,
+        num_perm=128,
+        shingle_size=5,
+        bands=None,
+        seed=0,
+        batch_size=2000,
+    ):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        if bands is None:
+            self.bands, self.rows = lsh_bands(num_perm, threshold)
+        else:
+            if num_perm % bands:
+                raise ValueError("bands must divide num_perm")
+            self.bands, self.rows = bands, num_perm // bands
+        self.batch_size = batch_size
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hash functions h(x) = (a * x + b) >> 32 over 32-bit x
+        self._a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+        # Rolling-hash multipliers to combine the word hashes of a shingle
+        self._shingle_mult = rng.integers(
+            1, 2**63, size=shingle_size, dtype=np.uint64
+        ) | np.uint64(1)
+        self._word_hashes = {}
+
+    def _hash_words(self, words):
+        cache = self._word_hashes
+        hashes = []
+        for word in words:
+            h = cache.get(word)
+            if h is None:
+                h = cache[word] = zlib.crc32(word.encode("utf-8"))
+            hashes.append(h)
+        return np.array(hashes, dtype=np.uint64)
+
+    def shingle_hashes(self, text):
+        """32-bit hashes of the word shingles of `text` (empty for no words)."""
+        if not isinstance(text, str):
+            return np.empty(0, dtype=np.uint64)
+        words = self._hash_words(text.lower().split())
+        k = min(self.shingle_size, len(words))
+        if k == 0:
+            return np.empty(0, dtype=np.uint64)
+        n = len(words) - k + 1
+        h = np.zeros(n, dtype=np.uint64)
+        for j in range(k):
+            h += words[j : j + n] * self._shingle_mult[j]
+        return (h ^ (h >> _SHIFT32)) & _MASK32
+
+    def signatures(self, texts):
+        """
+        (len(texts), num_perm) uint32 MinHash signatures and a boolean mask of
+        the texts that had any words (the others can't be compared).
+        """
+        sigs = np.empty((len(texts), self.num_perm), dtype=np.uint32)
+        valid = np.zeros(len(texts), dtype=bool)
+        for start in range(0, len(texts), self.batch_size):
+            batch = [
+                self.shingle_hashes(t) for t in texts[start : start + self.batch_size]
+            ]
+            lengths = np.array([len(s) for s in batch])
+            has_words = lengths > 0
+            valid[start : start + len(batch)] = has_words
+            sigs[start : start + len(batch)] = np.iinfo(np.uint32).max
+            if not has_words.any():
+                continue
+            x = np.concatenate([s for s in batch if len(s)])
+            offsets = np.concatenate(([0], np.cumsum(lengths[has_words])[:-1]))
+            rows = start + np.flatnonzero(has_words)
+            for p in range(self.num_perm):
+                hashed = (self._a[p] * x + self._b[p]) >> _SHIFT32
+                sigs[rows, p] = np.minimum.reduceat(hashed, offsets)
+        return sigs, valid
+
+    def find_clusters(self, texts):
+        """
+        Clusters of near-duplicate texts as lists of positions in `texts`
+        (ascending, so the first one is the one to keep), largest first, each
+        with the estimated similarity of every member to the first:
+        [([i, j, ...], [1.0, s_j, ...]), ...]
+        """
+        sigs, valid = self.signatures(texts)
+        uf = _UnionFind()
+        valid_rows = np.flatnonzero(valid)
+        for band in range(self.bands):
+            band_sigs = np.ascontiguousarray(
+                sigs[valid_rows, band * self.rows : (band + 1) * self.rows]
+            )
+            # One opaque bytes value per text, so np.unique groups whole bands
+            keys = band_sigs.view(np.dtype((np.void, 4 * self.rows))).ravel()
+            _, bucket, counts = np.unique(keys, return_inverse=True, return_counts=True)
+            shared = counts[bucket] > 1
+            if not shared.any():
+                continue
+            members, bucket = valid_rows[shared], bucket[shared]
+            order = np.lexsort((members, bucket))
+            members, bucket = members[order], bucket[order]
+            is_head = np.r_[True, bucket[1:] != bucket[:-1]]
+            heads = members[is_head][np.cumsum(is_head) - 1]
+            # Compare every text with its bucket's first text only, so one huge
+            # bucket costs O(size) rather than O(size^2)
+            others, heads = members[~is_head], heads[~is_head]
+            sims = (sigs[others] == sigs[heads]).mean(axis=1)
+            close = sims >= self.threshold
+            for head, i in zip(heads[close].tolist(), others[close].tolist()):
+                uf.union(head, i)
+
+        groups = {}
+        for i in list(uf.parent):
+            groups.setdefault(uf.find(i), []).append(i)
+        clusters = []
+        for root, members in groups.items():
+            members = sorted(set(members) | {root})
+            sims = (sigs[members] == sigs[members[0]]).mean(axis=1)
+            clusters.append((members, [round(float(s), 3) for s in sims]))
+        clusters.sort(key=lambda c: (-len(c[0]), c[0][0]))
+        return clusters
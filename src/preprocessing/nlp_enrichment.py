@@ -0,0 +1,214 @@
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from ..utils.chunked import JsonlChunkWriter, read_jsonl_chunks
+from ..utils.lazy import LazyModule
+from ..utils.profiling import stage, stage_rows
+
+spacy = LazyModule("spacy")
+yake = LazyModule("yake")
+
+# The extractor settings of the ensemble's keyword-guided module (module 6)
+YAKE_PARAMS = {"lan": "en", "n": 3, "dedupLim": 0.9, "top": 5}
+# Columns written by NlpEnricher
+ENRICHMENT_COLUMNS = ("entities", "keywords", "sentence_offsets")
+
+# Process-pool workers (module level so ProcessPoolExecutor can pickle them)
+_worker_extractor = None
+
+
+def _init_yake_worker(params):
+    global _worker_extractor
+    _worker_extractor = yake.KeywordExtractor(**params)
+
+
+def _keywords(extractor, text):
+    if not isinstance(text, str) or not text.strip():
+        return []
+    return [keyword for keyword, _score in extractor.extract_keywords(text)]
+
+
+def _keywords_chunk(texts):
+    return [_keywords(_worker_extractor, text) for text in texts]
+
+
+def sentences_from_offsets(text, offsets):
+    """The sentences of `text` from its sentence_offsets column value."""
+    return [text[start:end] for start, end in offsets]
+
+
+class NlpEnricher:
+    """
+    Computes the per-article NLP features the summarization ensemble needs
+    once for the whole corpus, as dataset columns:
+
+    - entities: [{"text", "label", "start", "end"}] spaCy named entities,
+      what modules 7/8 and the hallucination filter get from doc.ents
+    - keywords: the YAKE keywords of module 6 (YAKE_PARAMS), best first
+    - sentence_offsets: [[start, end]] character offsets of the spaCy
+      sentences (sentence_chunker_adaptive's doc.sents), see
+      sentences_from_offsets
+
+    All offsets index into `text_column`. spaCy runs through nlp.pipe in
+    batches, with only the components the features need enabled and
+    `n_process` processes. YAKE runs in a process pool of `yake_workers`,
+    working on a chunk while spaCy works on it in the main process.
+
+    spaCy (with the model) and yake are only imported once enrichment runs.
+    """
+
+    def __init__(
+        self,
+        model="en_core_web_sm",
+        text_column="full_text_minimal",
+        entity_labels=None,
+        sentence_component="parser",
+        batch_size=64,
+        n_process=1,
+        yake_workers=None,
+        yake_params=None,
+    ):
+        """
+        model: spaCy pipeline name (or path)
+        entity_labels: keep only these entity labels (e.g. {"PERSON", "ORG",
+            "GPE"}); all by default
+        sentence_component: "parser" (dependency parse, the sentences the
+            ensemble sees with the full pipeline) or "senter" (the faster
+            statistical sentence recognizer, slightly different boundaries)
+        batch_size / n_process: passed to nlp.pipe
+        yake_workers: YAKE process pool size; in-process if None or 1
+        """
+        if sentence_component not in ("parser", "senter"):
+            raise ValueError(f"Unknown sentence_component {sentence_component!r}")
+        self.model = model
+        self.text_column = text_column
+        self.entity_labels = set(entity_labels) if entity_labels else None
+        self.sentence_component = sentence_component
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.yake_workers = yake_workers
+        self.yake_params = dict(YAKE_PARAMS if yake_params is None else yake_params)
+        self._nlp = None
+        self._extractor = None
+        self.stats = {"records": 0, "entities": 0, "keywords": 0, "sentences": 0}
+
+    @property
+    def nlp(self):
+        """The spaCy pipeline, loaded on first use with the unneeded components off."""
+        if self._nlp is None:
+            self._nlp = self._load_pipeline()
+        return self._nlp
+
+    def _load_pipeline(self):
+        nlp = spacy.load(self.model)
+        needed = {"ner", self.sentence_component}
+        if self.sentence_component == "senter" and "senter" in nlp.disabled:
+            nlp.enable_pipe("senter")
+        # The shared tok2vec only matters to the components listening to it
+        if "tok2vec" in nlp.pipe_names:
+            listeners = nlp.get_pipe("tok2vec").listening_components
+            if needed & set(listeners):
+                needed.add("tok2vec")
+        nlp.select_pipes(
+            disable=[name for name in nlp.pipe_names if name not in needed]
+        )
+        if not {"parser", "senter"} & set(nlp.pipe_names):
+            nlp.add_pipe("sentencizer")  # A model without either: rule-based
+        print(f"Loaded spaCy '{self.model}' with components {nlp.pipe_names}.")
+        return nlp
+
+    def _keyword_pool(self):
+        return ProcessPoolExecutor(
+            max_workers=self.yake_workers,
+            initializer=_init_yake_worker,
+            initargs=(self.yake_params,),
+        )
+
+    def _submit_keywords(self, pool, texts):
+        """Starts YAKE on `texts`; returns a function that waits for the keywords."""
+        if pool is None:
+            if self._extractor is None:
+                self._extractor = yake.KeywordExtractor(**self.yake_params)
+            return lambda: [_keywords(self._extractor, text) for text in texts]
+        size = max(1, -(-len(texts) // (self.yake_workers * 4)))
+        chunks = [texts[i : i + size] for i in range(0, len(texts), size)]
+        futures = [pool.submit(_keywords_chunk, chunk) for chunk in chunks]
+        return lambda: [kw for future in futures for kw in future.result()]
+
+    def _spacy_features(self, texts):
+        entities, sentences = [], []
+        docs = self.nlp.pipe(
+            (text if isinstance(text, str) else "" for text in texts),
+            batch_size=self.batch_size,
+            n_process=self.n_process,
+        )
+        for doc in docs:
+            entities.append(
+                [
+                    {
+                        "text": ent.text,
+                        "label": ent.label_,
+                        "start": ent.start_char,
+                        "end": ent.end_char,
+                    }
+                    for ent in doc.ents
+                    if self.entity_labels is None or ent.label_ in self.entity_labels
+                ]
+            )
+            sentences.append([[sent.start_char, sent.end_char] for sent in doc.sents])
+        return entities, sentences
+
+    def _enrich(self, df, pool):
+        texts = df[self.text_column].tolist()
+        keywords = self._submit_keywords(pool, texts)
+        entities, sentences = self._spacy_features(texts)
+        keywords = keywords()
+        for column, values in zip(ENRICHMENT_COLUMNS, (entities, keywords, sentences)):
+            df[column] = pd.Series(values, index=df.index, dtype=object)
+        self.stats["records"] += len(df)
+        self.stats["entities"] += sum(map(len, entities))
+        self.stats["keywords"] += sum(map(len, keywords))
+        self.stats["sentences"] += sum(map(len, sentences))
+        return df
+
+    def _pool(self):
+        if self.yake_workers and self.yake_workers > 1:
+            return self._keyword_pool()
+        return contextlib.nullcontext()
+
+    @stage
+    def enrich(self, df):
+        """`df` with the entities, keywords and sentence_offsets columns added."""
+        df = df.copy()
+        with self._pool() as pool:
+            df = self._enrich(df, pool)
+        self.report()
+        return df
+
+    @stage
+    def enrich_jsonl(self, in_path, out_path, chunksize=10_000):
+        """
+        Chunked enrich() from one JSONL file into another (.gz / .zst by
+        extension), `chunksize` records at a time. The spaCy pipeline and the
+        YAKE pool are loaded once for the whole run. Returns the number of
+        records written.
+        """
+        print(f"Enriching '{in_path}' in chunks of {chunksize} records...")
+        n_read = 0
+        with self._pool() as pool, JsonlChunkWriter(out_path) as writer:
+            for chunk in read_jsonl_chunks(in_path, chunksize):
+                n_read += len(chunk)
+                writer.write(self._enrich(chunk, pool))
+        stage_rows(rows_in=n_read)
+        self.report()
+        print(f"✅ Saved {writer.rows} enriched records to '{out_path}'.")
+        return writer.rows
+
+    def report(self):
+        s = self.stats
+        print(
+            f"✅ Enriched {s['records']} records: {s['entities']} entities, "
+            f"{s['keywords']} keywords, {s['sentences']} sentences."
+        )
@@ -0,0 +1,126 @@
+from ..utils.jsonl_io import dumps_line, open_jsonl
+from .data_cleaner import DataCleaner
+from .text_preprocessor_en import EnglishPreprocessor
+
+
+class StreamingPipeline:
+    """
+    One-pass, record-at-a-time version of the batch flow
+    (DataCombiner -> DataCleaner -> EnglishPreprocessor -> filter_short_texts).
+
+    Each record goes through:
+    1. dedupe by Id (first one wins, like remove_duplicates),
+    2. optional join with its metadata row (the metadata fields are kept, the
+       scraped body fields win on overlap),
+    3. "Morning Briefing" titles and records without text are dropped,
+    4. DataCleaner.sub_clean_aa_english_article on `text_column`,
+    5. EnglishPreprocessor.minimal_preprocess into `<text_column>_minimal`,
+    6. the min_length filter on the minimal text.
+
+    Memory stays bounded by the Id set and the metadata lookup, never by the
+    article texts, so the pipeline can sit directly behind the scraper:
+
+        fetcher = AA_EnglishArticleBodyFetcher(metadata_path, bodies_path)
+        pipeline = StreamingPipeline.from_fetcher(fetcher)
+        pipeline.run(fetcher.iter_records(max_workers=16), "dataset.jsonl")
+    """
+
+    def __init__(
+        self,
+        min_length=150,
+        text_column="full_text",
+        drop_title_patterns=("Morning Briefing",),
+        metadata=None,
+    ):
+        self.min_length = min_length
+        self.text_column = text_column
+        self.drop_title_patterns = tuple(drop_title_patterns)
+        self.metadata = metadata  # Optional {Id: metadata record}
+        self.preprocessor = EnglishPreprocessor()
+        self.seen_ids = set()
+        self.stats = {
+            "records": 0,
+            "duplicates": 0,
+            "dropped_titles": 0,
+            "missing_text": 0,
+            "too_short": 0,
+            "kept": 0,
+        }
+
+    @classmethod
+    def from_fetcher(cls, fetcher, **kwargs):
+        """Pipeline joining every record with the fetcher's metadata rows."""
+        if fetcher.df is None:
+            fetcher.load_metadata()
+        metadata = {}
+        for item in fetcher.df.to_dict(orient="records"):
+            # Drop NaN cells of missing columns so they don't end up as NaN in JSON
+            metadata[item["Id"]] = {k: v for k, v in item.items() if v == v}
+        return cls(metadata=metadata, **kwargs)
+
+    def process_record(self, record):
+        """Returns the cleaned record, or None if it is filtered out."""
+        self.stats["records"] += 1
+        news_id = record.get("Id")
+        if news_id in self.seen_ids:
+            self.stats["duplicates"] += 1
+            return None
+        self.seen_ids.add(news_id)
+
+        if self.metadata is not None:
+            meta = self.metadata.get(news_id)
+            if meta is not None:
+                record = {**meta, **record}
+
+        title = record.get("Title")
+        if isinstance(title, str) and any(
+            pat in title for pat in self.drop_title_patterns
+        ):
+            self.stats["dropped_titles"] += 1
+            return None
+
+        text = record.get(self.text_column)
+        if not isinstance(text, str) or not text:
+            self.stats["missing_text"] += 1
+            return None
+
+        text = DataCleaner.sub_clean_aa_english_article(text)
+        minimal = self.preprocessor.minimal_preprocess(text)
+        if len(minimal) < self.min_length:
+            self.stats["too_short"] += 1
+            return None
+
+        record = dict(record)
+        record[self.text_column] = text
+        record[self.text_column + "_minimal"] = minimal
+        self.stats["kept"] += 1
+        return record
+
+    def process(self, records):
+        """Lazily yields the cleaned records of an iterable of raw records."""
+        for record in records:
+            cleaned = self.process_record(record)
+            if cleaned is not None:
+                yield cleaned
+
+    def run(self, records, out_path, flush_every=100):
+        """
+        Streams `records` through the pipeline into a JSONL file (.gz / .zst
+        compressed by extension, one frame per `flush_every` records).
+        """
+        with open_jsonl(out_path, "wb") as f:
+            for n, record in enumerate(self.process(records), 1):
+                f.write(dumps_line(record, default=str))
+                if n % flush_every == 0:
+                    f.flush()
+        self.report()
+        return self.stats
+
+    def report(self):
+        s = self.stats
+        print(
+            f"✅ Kept {s['kept']}/{s['records']} records "
+            f"(duplicates {s['duplicates']}, dropped titles {s['dropped_titles']}, "
+            f"missing text {s['missing_text']}, "
+            f"shorter than {self.min_length} chars {s['too_short']})."
+        )
@@ -1,41 +1,153 @@
 # english_preprocessor.py
 
+import contextlib
+import numpy as np
 import pandas as pd
 import re
 import unicodedata
-import nltk
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-
-try:
-    nltk.data.find("corpora/stopwords")
-except LookupError:
-    nltk.download("stopwords")
-try:
-    nltk.data.find("corpora/wordnet")
-except LookupError:
-    nltk.download("wordnet")
-# ----------------------------------------------------
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from ..utils.chunked import JsonlChunkWriter, read_jsonl_chunks
+from ..utils.jsonl_io import strip_codec_suffix
+from ..utils.profiling import stage, stage_rows
+from ..utils.storage import load_table, save_table, table_format
+from ..utils.tags import TagVocabulary, tag_vocabulary_path
+from .data_cleaner import DataCleaner
+
+# NLTK and its corpora are loaded on first use, not at import time. Missing
+# corpora raise an error instead of being downloaded behind the user's back.
+NLTK_CORPORA = {"stopwords": "corpora/stopwords", "wordnet": "corpora/wordnet"}
+
+
+def require_nltk_corpus(name):
+    """Raises LookupError, with the install command, if an NLTK corpus is missing."""
+    import nltk
+
+    try:
+        nltk.data.find(NLTK_CORPORA[name])
+    except LookupError:
+        raise LookupError(
+            f"NLTK corpus '{name}' is not installed. Install it with "
+            f"`python -m nltk.downloader {name}` or point NLTK_DATA at it."
+        ) from None
+
 
 # --- Define English Stopwords ---
 # Using the standard NLTK English stopwords list.
-ENGLISH_STOPWORDS = set(stopwords.words("english"))
+@lru_cache(maxsize=None)
+def get_english_stopwords():
+    require_nltk_corpus("stopwords")
+    from nltk.corpus import stopwords
+
+    return frozenset(stopwords.words("english"))
+
+
+def __getattr__(name):
+    # ENGLISH_STOPWORDS used to be built at import time; keep the name working
+    if name == "ENGLISH_STOPWORDS":
+        return get_english_stopwords()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _CharFolding(dict):
+    """
+    str.translate table doing steps 2 and 3 of normalize_text in one pass.
+
+    NFKD decomposes every character on its own (reordering only moves
+    combining marks, which are dropped anyway), and the regex in step 3 works
+    per character too, so each character maps to a fixed string. ASCII is
+    filled in up front (fast path); other characters are worked out on first
+    use and cached.
+    """
+
+    def __init__(self):
+        super().__init__()
+        for code in range(128):
+            self[code] = self._fold(chr(code))
+
+    @staticmethod
+    def _fold(char):
+        return "".join(
+            c if ("a" <= c <= "z" or "0" <= c <= "9" or c.isspace()) else " "
+            for c in unicodedata.normalize("NFKD", char)
+            if not unicodedata.combining(c)
+        )
+
+    def __missing__(self, code):
+        folded = self[code] = self._fold(chr(code))
+        return folded
+
+
+_CHAR_FOLDING = _CharFolding()
+
+# Process-pool workers (module level so ProcessPoolExecutor can pickle them)
+_worker_preprocessor = None
+
+
+def _init_worker(lemma_cache_size):
+    global _worker_preprocessor
+    _worker_preprocessor = EnglishPreprocessor(lemma_cache_size=lemma_cache_size)
+    # Load WordNet and the stopwords now rather than inside the first chunk
+    _worker_preprocessor.lemmatizer.lemmatize("warmup")
+    get_english_stopwords()
+
+
+def _normalize_chunk(texts):
+    """Returns (normalized texts, lemma cache hits, misses) for one chunk."""
+    before = _worker_preprocessor.lemma_cache_info()
+    normalized = [_worker_preprocessor.normalize_text(text) for text in texts]
+    after = _worker_preprocessor.lemma_cache_info()
+    return normalized, after.hits - before.hits, after.misses - before.misses
 
 
 class EnglishPreprocessor:
-    def __init__(self, path=None):
-        """path: input path to a JSONL file"""
+    def __init__(self, path=None, lemma_cache_size=200_000, tag_vocabulary=None):
+        """
+        path: input path to a JSONL file
+        lemma_cache_size: how many distinct tokens to memoize lemmas for
+        tag_vocabulary: utils.tags.TagVocabulary to extend (e.g. one saved with
+            an earlier output); a new one by default
+        """
         self.path = path
         self.data = None
-        # Initialize the lemmatizer once for efficiency
-        self.lemmatizer = WordNetLemmatizer()
+        # Normalized tag -> integer id; tag columns are stored as id arrays
+        self.tag_vocabulary = (
+            tag_vocabulary if tag_vocabulary is not None else TagVocabulary()
+        )
+        # WordNetLemmatizer, created on first use (see the lemmatizer property)
+        self._lemmatizer = None
+        # News vocabulary is repetitive: memoize token -> lemma ("" for stopwords)
+        self._token_lemma = lru_cache(maxsize=lemma_cache_size)(self._lemmatize_token)
+        # Cache hits/misses of process-pool workers, added up per chunk
+        self._worker_hits = 0
+        self._worker_misses = 0
+
+    @property
+    def lemmatizer(self):
+        if self._lemmatizer is None:
+            require_nltk_corpus("wordnet")
+            from nltk.stem import WordNetLemmatizer
 
-    def load_data(self):
-        """Loads data from the JSON/JSONL file specified in the path."""
-        if self.path.endswith(".json") or self.path.endswith(".jsonl"):
-            self.data = pd.read_json(self.path, lines=True)
+            self._lemmatizer = WordNetLemmatizer()
+        return self._lemmatizer
+
+    @stage
+    def load_data(self, columns=None, compact=False):
+        """
+        Loads data from the JSON/JSONL (optionally .gz / .zst), Parquet or Arrow
+        file specified in the path.
+        columns: only load these columns (cheap for Parquet/Arrow)
+        compact: load into compact dtypes (utils.compact.compact_frame)
+        """
+        if table_format(self.path) != "jsonl" or strip_codec_suffix(self.path).endswith(
+            (".json", ".jsonl")
+        ):
+            self.data = load_table(self.path, columns=columns, compact=compact)
         else:
-            raise ValueError("Only JSON/JSONL is supported for this workflow.")
+            raise ValueError(
+                "Only JSON/JSONL, Parquet and Arrow are supported for this workflow."
+            )
         return self
 
     def normalize_tags(self, tag_val):
@@ -45,10 +157,11 @@ class EnglishPreprocessor:
         - Removes extra whitespace.
         - Removes duplicate tags (preserves order).
         """
-        if pd.isna(tag_val) or not tag_val:
+        if isinstance(tag_val, (list, tuple, np.ndarray)):
+            # .apply on a compact (Arrow list) Tags column passes numpy arrays
+            tags = list(tag_val)
+        elif pd.isna(tag_val) or not tag_val:
             return []
-        if isinstance(tag_val, list):
-            tags = tag_val
         else:
             tags = [t.strip() for t in str(tag_val).split(",")]
 
@@ -62,6 +175,23 @@ class EnglishPreprocessor:
                 seen.add(tag_clean)
         return norm_tags
 
+    def encode_tags(self, values):
+        """
+        normalize_tags of every value as an int32 array of tag ids, adding new
+        tags to self.tag_vocabulary.
+        """
+        return pd.Series(
+            [self.tag_vocabulary.encode(self.normalize_tags(v)) for v in values],
+            index=values.index,
+            dtype=object,
+        )
+
+    def save_tag_vocabulary(self, out_path):
+        """Saves self.tag_vocabulary next to the dataset at `out_path`."""
+        path = tag_vocabulary_path(out_path)
+        self.tag_vocabulary.save(path)
+        print(f"✅ Saved {len(self.tag_vocabulary)} tags to '{path}'.")
+
     def normalize_text(self, text: str) -> str:
         """
         A comprehensive normalization pipeline for English text.
@@ -78,33 +208,52 @@ class EnglishPreprocessor:
         text = text.lower()
 
         # 2. Remove accents (e.g., café -> cafe)
-        text = "".join(
-            c
-            for c in unicodedata.normalize("NFKD", text)
-            if not unicodedata.combining(c)
-        )
-
         # 3. Remove non-alphanumeric characters (keeping spaces)
-        text = re.sub(r"[^a-z0-9\s]", " ", text)
+        text = text.translate(_CHAR_FOLDING)
 
-        # 4. Collapse multiple spaces
-        text = re.sub(r"\s+", " ", text).strip()
+        # 4-5. split() collapses whitespace; lemmatize and remove stopwords
+        lemmas = map(self._token_lemma, text.split())
+        return " ".join(lemma for lemma in lemmas if lemma)
 
-        # 5. Lemmatize and remove stopwords
-        tokens = []
-        for word in text.split():
-            # Lemmatize the word
-            lemma = self.lemmatizer.lemmatize(word)
-            # Add to list if it's not a stopword
-            if lemma not in ENGLISH_STOPWORDS:
-                tokens.append(lemma)
+    def _lemmatize_token(self, word):
+        """Lemma of `word`, or "" if the lemma is a stopword (memoized per token)."""
+        lemma = self.lemmatizer.lemmatize(word)
+        return "" if lemma in get_english_stopwords() else lemma
 
-        return " ".join(tokens)
+    def lemma_cache_info(self):
+        """functools cache_info() of this instance's token -> lemma cache."""
+        return self._token_lemma.cache_info()
 
-    def normalize_column(self, column: str, new_column: str = None):
+    def lemma_cache_stats(self):
+        """Hits, misses and hit rate of the lemma cache, process-pool workers included."""
+        info = self.lemma_cache_info()
+        hits = info.hits + self._worker_hits
+        misses = info.misses + self._worker_misses
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else 0.0,
+            "size": info.currsize,
+            "maxsize": info.maxsize,
+        }
+
+    @stage
+    def normalize_column(
+        self,
+        column: str,
+        new_column: str = None,
+        workers: int = None,
+        chunksize: int = 2000,
+    ):
         """
         Applies the full normalization pipeline to a specified dataframe column.
-        Detects 'tags' column automatically for special handling.
+        Detects 'tags' column automatically for special handling: normalized
+        tags are stored as arrays of tag ids (see encode_tags).
+
+        workers: with more than one worker, text columns are normalized in
+        chunks of `chunksize` rows by a process pool; each worker loads WordNet
+        once and keeps its own lemma cache.
         """
         if self.data is None:
             raise ValueError("Data not loaded. Please call .load_data() first.")
@@ -113,11 +262,42 @@ class EnglishPreprocessor:
 
         print(f"Normalizing column '{column}' into '{col_out}'...")
         if column.lower() == "tags":
-            self.data[col_out] = self.data[column].apply(self.normalize_tags)
+            self.data[col_out] = self.encode_tags(self.data[column])
+            return self
+        if workers and workers > 1 and len(self.data) > chunksize:
+            with self._normalize_pool(workers) as pool:
+                normalized = self._normalize_in_pool(
+                    pool, self.data[column].tolist(), chunksize
+                )
+            self.data[col_out] = pd.Series(normalized, index=self.data.index)
         else:
             self.data[col_out] = self.data[column].apply(self.normalize_text)
+        self._print_lemma_cache_stats()
         return self
 
+    def _normalize_pool(self, workers):
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.lemma_cache_info().maxsize,),
+        )
+
+    def _normalize_in_pool(self, pool, values, chunksize):
+        chunks = [values[i : i + chunksize] for i in range(0, len(values), chunksize)]
+        normalized = []
+        for texts, hits, misses in pool.map(_normalize_chunk, chunks):
+            normalized.extend(texts)
+            self._worker_hits += hits
+            self._worker_misses += misses
+        return normalized
+
+    def _print_lemma_cache_stats(self):
+        stats = self.lemma_cache_stats()
+        print(
+            f"Lemma cache: {stats['hit_rate']:.1%} hit rate "
+            f"({stats['hits']} hits, {stats['misses']} misses)."
+        )
+
     def minimal_preprocess(self, text: str) -> str:
         """
         Minimal cleaning for Transformer models like BART:
@@ -133,6 +313,7 @@ class EnglishPreprocessor:
         text = text.strip()
         return text
 
+    @stage
     def minimal_preprocess_column(self, column: str, new_column: str = None):
         """Applies the minimal preprocessing pipeline to a specified column."""
         if self.data is None:
@@ -146,14 +327,83 @@ class EnglishPreprocessor:
         self.data[col_out] = self.data[column].apply(self.minimal_preprocess)
         return self
 
+    @stage
+    def preprocess_jsonl(
+        self,
+        out_path: str,
+        minimal_columns=("full_text",),
+        normalize_columns=(),
+        min_length: int = None,
+        chunksize: int = 10_000,
+        workers: int = None,
+    ):
+        """
+        Chunked version of load_data -> minimal_preprocess_column /
+        normalize_column -> (DataCleaner.filter_short_texts) -> save that
+        never holds more than `chunksize` records of self.path in memory.
+
+        minimal_columns: columns to write `<column>_minimal` for
+        normalize_columns: columns to write `<column>_norm` for ("Tags" gets
+            tag ids, see encode_tags; the vocabulary is saved next to out_path)
+        min_length: if given, drop records whose full_text_minimal is shorter
+        workers: normalize in a process pool that lives for the whole run, so
+            WordNet and the lemma caches are loaded once, not once per chunk
+
+        The lemma cache is shared by all chunks. Returns the number of records
+        written.
+        """
+        print(f"Preprocessing '{self.path}' in chunks of {chunksize} records...")
+        use_pool = bool(normalize_columns) and workers and workers > 1
+        n_read = 0
+        with contextlib.ExitStack() as stack:
+            pool = (
+                stack.enter_context(self._normalize_pool(workers)) if use_pool else None
+            )
+            writer = stack.enter_context(JsonlChunkWriter(out_path))
+            for chunk in read_jsonl_chunks(self.path, chunksize):
+                n_read += len(chunk)
+                for column in minimal_columns:
+                    chunk[column + "_minimal"] = chunk[column].apply(
+                        self.minimal_preprocess
+                    )
+                for column in normalize_columns:
+                    if column.lower() == "tags":
+                        normalized = self.encode_tags(chunk[column])
+                    elif pool is not None:
+                        normalized = pd.Series(
+                            self._normalize_in_pool(
+                                pool,
+                                chunk[column].tolist(),
+                                max(1, chunksize // workers),
+                            ),
+                            index=chunk.index,
+                        )
+                    else:
+                        normalized = chunk[column].apply(self.normalize_text)
+                    chunk[column + "_norm"] = normalized
+                if min_length is not None:
+                    cleaner = DataCleaner(chunk, copy=False, verbose=False)
+                    chunk = cleaner.filter_short_texts(min_length)
+                writer.write(chunk)
+        stage_rows(rows_in=n_read)
+        if normalize_columns:
+            self._print_lemma_cache_stats()
+        print(f"✅ Saved {writer.rows} records to '{out_path}'.")
+        if any(column.lower() == "tags" for column in normalize_columns):
+            self.save_tag_vocabulary(out_path)
+        return writer.rows
+
+    @stage
     def save(self, out_path: str):
-        """Saves the processed dataframe to a new JSONL file."""
+        """Saves the processed dataframe to a new JSONL (or .parquet/.arrow) file."""
         if self.data is None:
             raise ValueError("No data to save.")
 
         print(f"Saving processed data to '{out_path}'...")
-        self.data.to_json(out_path, orient="records", force_ascii=False, lines=True)
+        save_table(self.data, out_path)
         print("✅ Save complete.")
+        if len(self.tag_vocabulary):
+            self.save_tag_vocabulary(out_path)
 
     def get_data(self):
         """Returns the processed pandas DataFrame."""
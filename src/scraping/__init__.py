@@ -1,7 +1,14 @@
+from ..utils.lazy import lazy_exports
+
 __all__ = [
     "AA_EnglishNewsMetadataFetcher",
     "AA_EnglishArticleBodyFetcher",
 ]
-
-from .fetch_news_metadata_en import AA_EnglishNewsMetadataFetcher
-from .fetch_news_body_en import AA_EnglishArticleBodyFetcher
+# Submodules are imported on first access (requests, pandas, bs4, ...)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "AA_EnglishNewsMetadataFetcher": ".fetch_news_metadata_en",
+        "AA_EnglishArticleBodyFetcher": ".fetch_news_body_en",
+    },
+)
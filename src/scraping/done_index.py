@@ -0,0 +1,224 @@
+import json
+import os
+
+from ..utils.jsonl_io import iter_frames, jsonl_codec, loads
+
+
+class DoneIdIndex:
+    """
+    Compact sidecar index of the Ids already written to a JSONL output file.
+
+    The index lives next to the data file (`<path>.ids`) and holds one line per
+    record: "<end byte offset of the record in the JSONL>\\t<json-encoded Id>".
+    Every entry is a single appended line, so loading the index never has to
+    touch the (large) article text: only records written after the last index
+    entry are scanned from the data file.
+
+    Loading also recovers from interrupted runs:
+    - a truncated last line in the JSONL is cut off (repair=True) so the next
+      append starts on a clean line,
+    - a truncated last index line, or entries pointing past the end of the
+      data file, are dropped and the index is rewritten,
+    - corrupt JSONL lines are counted and reported instead of silently
+      disabling resume.
+
+    For a .gz / .zst data file (written one frame per flush, see
+    JsonlRecordWriter) the offsets are those of the compressed frame ends,
+    and repair cuts off a truncated last frame instead of a line.
+    """
+
+    SUFFIX = ".ids"
+
+    def __init__(self, jsonl_path, index_path=None):
+        self.jsonl_path = jsonl_path
+        self.index_path = index_path or jsonl_path + self.SUFFIX
+        self.codec = jsonl_codec(jsonl_path)
+        self.ids = set()
+        self.covered = 0  # bytes of the JSONL file already reflected in the index
+        self._fh = None
+
+    def __contains__(self, news_id):
+        return news_id in self.ids
+
+    def __len__(self):
+        return len(self.ids)
+
+    @staticmethod
+    def _truncate_partial_line(path):
+        """Cuts a file back to its last newline; returns the number of bytes dropped."""
+        size = os.path.getsize(path)
+        if size == 0:
+            return 0
+        with open(path, "rb+") as f:
+            f.seek(size - 1)
+            if f.read(1) == b"\n":
+                return 0
+            # Walk back block by block to the previous newline
+            pos = size
+            block = 1 << 16
+            while pos > 0:
+                start = max(0, pos - block)
+                f.seek(start)
+                chunk = f.read(pos - start)
+                nl = chunk.rfind(b"\n")
+                if nl != -1:
+                    keep = start + nl + 1
+                    break
+                pos = start
+            else:
+                keep = 0
+            f.truncate(keep)
+        return size - keep
+
+    def _read_index(self, data_size):
+        entries = []
+        if not os.path.exists(self.index_path):
+            return entries, False
+        dirty = self._truncate_partial_line(self.index_path) > 0
+        with open(self.index_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    offset, raw_id = line.rstrip("\n").split("\t", 1)
+                    offset = int(offset)
+                    news_id = json.loads(raw_id)
+                except ValueError:
+                    dirty = True
+                    continue
+                if offset > data_size:
+                    # Data file was truncated or replaced behind our back
+                    dirty = True
+                    continue
+                entries.append((offset, news_id))
+        return entries, dirty
+
+    def _scan_data(self, start):
+        """
+        Parses the Ids of JSONL records from byte offset `start` onwards.
+        Returns the (end offset, Id) entries, the number of corrupt lines and
+        the offset where the intact data ends.
+        """
+        if self.codec is not None:
+            return self._scan_frames(start)
+        entries = []
+        n_corrupt = 0
+        with open(self.jsonl_path, "rb") as f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                offset += len(line)
+                if not line.endswith(b"\n"):
+                    n_corrupt += 1  # partial last line, only when not repaired
+                    continue
+                try:
+                    news_id = loads(line)["Id"]
+                except (ValueError, KeyError, TypeError):
+                    n_corrupt += 1
+                    continue
+                entries.append((offset, news_id))
+        return entries, n_corrupt, offset
+
+    def _scan_frames(self, start):
+        """_scan_data for a compressed file: every record ends at its frame's end."""
+        entries = []
+        n_corrupt = 0
+        intact = start
+        for intact, data in iter_frames(self.jsonl_path, start):
+            for line in data.splitlines(keepends=True):
+                try:
+                    news_id = loads(line)["Id"]
+                except (ValueError, KeyError, TypeError):
+                    n_corrupt += line.strip() != b""
+                    continue
+                entries.append((intact, news_id))
+        return entries, n_corrupt, intact
+
+    def load(self, repair=False):
+        """
+        Brings the index up to date with the data file and returns the Id set.
+
+        repair: also cut a truncated last line off the JSONL file itself. Only
+        do this for the file about to be appended to.
+        """
+        self.ids = set()
+        self.covered = 0
+        if not os.path.exists(self.jsonl_path):
+            if os.path.exists(self.index_path):
+                os.remove(self.index_path)
+            return self.ids
+
+        if repair and self.codec is None:
+            dropped = self._truncate_partial_line(self.jsonl_path)
+            if dropped:
+                print(
+                    f"Recovered {self.jsonl_path}: dropped a truncated last line "
+                    f"({dropped} bytes)."
+                )
+        data_size = os.path.getsize(self.jsonl_path)
+
+        entries, dirty = self._read_index(data_size)
+        covered = entries[-1][0] if entries else 0
+        if covered < data_size:
+            tail, n_corrupt, intact = self._scan_data(covered)
+            if self.codec is not None and intact < data_size:
+                if repair:
+                    with open(self.jsonl_path, "rb+") as f:
+                        f.truncate(intact)
+                    print(
+                        f"Recovered {self.jsonl_path}: dropped a truncated last "
+                        f"frame ({data_size - intact} bytes)."
+                    )
+                    data_size = intact
+                else:
+                    n_corrupt += 1
+            if n_corrupt:
+                print(
+                    f"Warning: skipped {n_corrupt} corrupt lines in {self.jsonl_path}."
+                )
+            if tail:
+                entries.extend(tail)
+                if not dirty:
+                    self._append_entries(tail)
+        if dirty:
+            self._rewrite(entries)
+
+        self.ids = {news_id for _, news_id in entries}
+        self.covered = data_size
+        return self.ids
+
+    @staticmethod
+    def _format(offset, news_id):
+        return f"{offset}\t{json.dumps(news_id, ensure_ascii=False)}\n"
+
+    def _append_entries(self, entries):
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write("".join(self._format(o, i) for o, i in entries))
+
+    def _rewrite(self, entries):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("".join(self._format(o, i) for o, i in entries))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.index_path)
+
+    def add(self, news_id, end_offset):
+        """Records an Id whose JSONL line ends at `end_offset` (already flushed)."""
+        self.add_many([(news_id, end_offset)])
+
+    def add_many(self, entries, fsync=False):
+        """Records (Id, end offset) pairs in one write."""
+        if not entries:
+            return
+        if self._fh is None:
+            self._fh = open(self.index_path, "a", encoding="utf-8")
+        self._fh.write("".join(self._format(o, i) for i, o in entries))
+        self._fh.flush()
+        if fsync:
+            os.fsync(self._fh.fileno())
+        self.ids.update(i for i, _ in entries)
+        self.covered = entries[-1][1]
+
+    def close(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
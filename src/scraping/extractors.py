@@ -0,0 +1,275 @@
+import re
+from html.entities import html5
+
+from bs4 import BeautifulSoup
+
+# Paragraphs containing any of these are subscription/junk lines (ENGLISH ONLY)
+JUNK_MARKERS = (
+    "Anadolu Agency website contains only",
+    "Please contact us for subscription options",
+)
+
+# --- Locating the article container in the raw HTML ---
+#
+# html.parser closes the innermost open <div> on every </div>, so counting
+# <div ...> / </div> pairs finds exactly the subtree BeautifulSoup would build,
+# as long as comments and <script>/<style> contents (raw text for html.parser)
+# are skipped.
+_ATTR = r"""(?:\s+[^\s"'>/=]+(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s"'>]+))?|\s*/)"""
+_RAW_TEXT = r"<!--.*?-->|<(?P<raw>script|style)\b" + _ATTR + r"*\s*>.*?</(?P=raw)\s*>"
+_RAW_TEXT_RE = re.compile(_RAW_TEXT, re.IGNORECASE | re.DOTALL)
+_SCAN_RE = re.compile(
+    _RAW_TEXT + r"|(?P<open><div\b" + _ATTR + r"*\s*/?>)" r"|(?P<close></div\s*>)",
+    re.IGNORECASE | re.DOTALL,
+)
+_CLASS_ATTR_RE = re.compile(
+    r"""\sclass\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""", re.IGNORECASE
+)
+_TAG_RE = re.compile(r"<[^>]*>")
+_AMP_RE = re.compile(r"&(#\d+;|#[xX][0-9a-fA-F]+;|[A-Za-z][A-Za-z0-9]*;)?")
+
+# --- Markup lxml is known to parse exactly as html.parser does ---
+#
+# Anything else (other tags, CDATA, doctypes, odd comments, self-closed
+# non-void tags, block tags inside <p>/headings/inline tags, ...) goes to the
+# BeautifulSoup path.
+_BLOCK_TAGS = frozenset({"div", "p", "h1", "h2", "h3", "h4", "h5", "h6", "hr"})
+_INLINE_TAGS = frozenset(
+    "a abbr b bdi bdo br cite code data dfn em i img kbd mark q s samp small span"
+    " strong sub sup time u var wbr".split()
+)
+_VOID_TAGS = frozenset({"br", "hr", "img", "wbr"})
+_SAFE_ATTR = r"""\s+([^\s"'<>/=]+)(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s"'<>=`/]+))?"""
+_SAFE_TOKEN_RE = re.compile(
+    # Comments without "--" inside, script/style raw text closed by the first
+    # end tag of its kind
+    r"(?P<comment><!--(?![->])(?:(?!--).)*-->)"
+    r"|(?P<raw_text><(?P<raw>script|style)(?:" + _SAFE_ATTR + r")*\s*>"
+    r"(?:(?!</(?P=raw)\b).)*</(?P=raw)\s*>)"
+    r"|<(?P<start>[a-zA-Z][a-zA-Z0-9]*)(?P<attrs>(?:" + _SAFE_ATTR + r")*)"
+    r"\s*(?P<self_closing>/)?>"
+    r"|</(?P<end>[a-zA-Z][a-zA-Z0-9]*)\s*>"
+    r"|(?P<other><)",
+    re.IGNORECASE | re.DOTALL,
+)
+_ATTR_NAME_RE = re.compile(_SAFE_ATTR)
+
+
+def _has_class(open_tag, class_name):
+    matches = _CLASS_ATTR_RE.findall(open_tag)
+    if not matches:
+        return False
+    # BeautifulSoup keeps the last value of a duplicated attribute
+    return class_name in "".join(matches[-1]).split()
+
+
+def find_subtree(html, class_name="detay-icerik"):
+    """
+    Returns the raw markup of the first <div class="{class_name}"> element
+    (opening tag through its matching </div>), or None if it can't be located
+    unambiguously.
+    """
+    start = None
+    depth = 0
+    for m in _SCAN_RE.finditer(html):
+        if m.group("open"):
+            if start is None:
+                if _has_class(m.group("open"), class_name):
+                    start = m.start()
+                    depth = 1
+            else:
+                depth += 1
+        elif m.group("close") and start is not None:
+            depth -= 1
+            if depth == 0:
+                return html[start : m.end()]
+    return None
+
+
+class ArticleExtractor:
+    """
+    Turns a raw article page into the article text.
+
+    Output: the h3/h4 headings and the p.selectionShareable paragraphs of
+    div.detay-icerik, junk lines removed, joined by newlines. Falls back to all
+    of the container's text when that is empty, and returns "" when the page
+    has no container.
+    """
+
+    name = None
+
+    def extract(self, html):
+        raise NotImplementedError
+
+    @staticmethod
+    def _compose(headings, paragraphs):
+        filtered_paragraphs = [
+            p for p in paragraphs if not any(marker in p for marker in JUNK_MARKERS)
+        ]
+        return "\n".join(headings + filtered_paragraphs)
+
+
+class SoupArticleExtractor(ArticleExtractor):
+    """Reference extractor: BeautifulSoup over the whole page."""
+
+    name = "bs4"
+
+    def __init__(self, parser="html.parser"):
+        self.parser = parser
+
+    def _extract_from(self, markup):
+        soup = BeautifulSoup(markup, self.parser)
+        main = soup.find("div", class_="detay-icerik")
+        if main is None:
+            return ""
+        headings = [h.get_text(strip=True) for h in main.find_all(["h3", "h4"])]
+        paragraphs = [
+            p.get_text(strip=True)
+            for p in main.find_all("p", class_="selectionShareable")
+        ]
+        full_text = self._compose(headings, paragraphs)
+        if not full_text.strip():
+            return main.get_text(strip=True)
+        return full_text
+
+    def extract(self, html):
+        return self._extract_from(html)
+
+
+class SlicedSoupArticleExtractor(SoupArticleExtractor):
+    """BeautifulSoup, but only over the div.detay-icerik markup."""
+
+    name = "bs4-sliced"
+
+    def extract(self, html):
+        subtree = find_subtree(html)
+        return self._extract_from(subtree if subtree is not None else html)
+
+
+class LxmlArticleExtractor(ArticleExtractor):
+    """
+    lxml over the div.detay-icerik markup only.
+
+    libxml2 builds a different tree from html.parser for much markup (block
+    tags inside an open <p>, raw-text and obsolete tags, CDATA, malformed
+    comments) and decodes some text differently (carriage returns, NUL bytes,
+    unknown or unterminated entities). Only subtrees made of the tags and
+    constructs known to parse the same (_is_safe) are parsed with lxml; the
+    rest is handed to the BeautifulSoup path, so the output stays identical
+    to the reference extractor.
+    """
+
+    name = "lxml"
+
+    # Strings inside these tags are not NavigableStrings for BeautifulSoup,
+    # so get_text() skips them.
+    _HIDDEN_TAGS = frozenset({"script", "style", "template", "rt", "rp"})
+
+    def __init__(self):
+        import lxml.html
+
+        self._fragment_fromstring = lxml.html.fragment_fromstring
+        self._fallback = SlicedSoupArticleExtractor()
+
+    @staticmethod
+    def _is_safe(subtree):
+        if "\r" in subtree or "\x00" in subtree:
+            return False
+        open_tags = []
+        for m in _SAFE_TOKEN_RE.finditer(subtree):
+            if m.group("other"):
+                return False
+            if m.group("comment") or m.group("raw_text"):
+                continue
+            name = (m.group("start") or m.group("end")).lower()
+            if name not in _BLOCK_TAGS and name not in _INLINE_TAGS:
+                return False
+            if m.group("end"):
+                if name in _VOID_TAGS or not open_tags or open_tags[-1] != name:
+                    return False
+                open_tags.pop()
+                continue
+            if name in _BLOCK_TAGS:
+                # Only directly inside divs: libxml2 closes open <p>s, headings
+                # and inline tags at a block tag, html.parser nests it
+                if any(tag != "div" for tag in open_tags):
+                    return False
+            elif name in open_tags:
+                return False  # libxml2 closes an open <a> at a nested one
+            attr_names = [
+                a.lower() for a in _ATTR_NAME_RE.findall(m.group("attrs") or "")
+            ]
+            if len(set(attr_names)) != len(attr_names):
+                return False  # libxml2 keeps the first value, bs4 the last
+            if name in _VOID_TAGS:
+                continue
+            if m.group("self_closing"):
+                return False
+            open_tags.append(name)
+        if open_tags:
+            return False
+        markup = _RAW_TEXT_RE.sub("", subtree)
+        if "&" not in markup:
+            return True
+        for m in _AMP_RE.finditer(_TAG_RE.sub("", markup)):
+            entity = m.group(1)
+            if entity is None:
+                return False
+            if not entity.startswith("#") and entity not in html5:
+                return False
+        return True
+
+    @classmethod
+    def _strings(cls, el):
+        if not isinstance(el.tag, str) or el.tag in cls._HIDDEN_TAGS:
+            return
+        if el.text:
+            yield el.text
+        for child in el:
+            yield from cls._strings(child)
+            if child.tail:
+                yield child.tail
+
+    @classmethod
+    def _text(cls, el):
+        return "".join(s.strip() for s in cls._strings(el) if s.strip())
+
+    def extract(self, html):
+        subtree = find_subtree(html)
+        if subtree is None:
+            if "detay-icerik" in html:
+                return self._fallback.extract(html)
+            return ""
+        if not self._is_safe(subtree):
+            return self._fallback.extract(subtree)
+        try:
+            main = self._fragment_fromstring(subtree)
+        except Exception:
+            return self._fallback.extract(subtree)
+        headings = [self._text(h) for h in main.iter("h3", "h4")]
+        paragraphs = [
+            self._text(p)
+            for p in main.iter("p")
+            if "selectionShareable" in (p.get("class") or "").split()
+        ]
+        full_text = self._compose(headings, paragraphs)
+        if not full_text.strip():
+            return self._text(main)
+        return full_text
+
+
+EXTRACTORS = {
+    cls.name: cls
+    for cls in (SoupArticleExtractor, SlicedSoupArticleExtractor, LxmlArticleExtractor)
+}
+
+
+def get_extractor(extractor="bs4"):
+    """Accepts an extractor instance or one of the names in EXTRACTORS."""
+    if isinstance(extractor, ArticleExtractor):
+        return extractor
+    if extractor not in EXTRACTORS:
+        raise ValueError(
+            f"Unknown extractor '{extractor}'. Choose one of {sorted(EXTRACTORS)}."
+        )
+    return EXTRACTORS[extractor]()
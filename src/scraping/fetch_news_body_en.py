@@ -1,11 +1,24 @@
 import requests
-import json
+import os
 import time
 import random
+import socket
+import threading
 import pandas as pd
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
 from fake_useragent import UserAgent
 
+from ..utils.chunked import read_jsonl
+from ..utils.jsonl_io import strip_codec_suffix
+from .done_index import DoneIdIndex
+from .extractors import get_extractor
+from .html_cache import HtmlCache, extract_cached
+from .jsonl_writer import JsonlRecordWriter
+from .telemetry import ScraperTelemetry
+from .work_queue import LeaseWorkQueue
+
 
 class AA_EnglishArticleBodyFetcher:
     BASE_URL = "https://www.aa.com.tr"
@@ -17,6 +30,13 @@ class AA_EnglishArticleBodyFetcher:
         min_delay=0.001,
         max_retries=1,
         session_reset_every=20,
+        extractor="bs4",
+        cache_dir=None,
+        rate_controller=None,
+        telemetry=None,
+        flush_every=100,
+        flush_interval=5.0,
+        fsync=False,
     ):
         self.metadata_path = metadata_path
         self.output_path = output_path
@@ -25,105 +45,438 @@ class AA_EnglishArticleBodyFetcher:
         self.df = None
         self.ua = UserAgent()
         self.session_reset_every = session_reset_every
+        # "bs4" (reference), "bs4-sliced" or "lxml"; see extractors.py
+        self.extractor = get_extractor(extractor)
+        # Optional raw page store, lets extraction be re-run offline
+        self.cache = HtmlCache(cache_dir) if cache_dir else None
+        # Optional AdaptiveRateController; replaces the fixed min_delay sleeps
+        self.rate_controller = rate_controller
+        # Counters/histograms and progress reporting; a fresh ScraperTelemetry
+        # per run unless one is passed in (e.g. with an export_path)
+        self._telemetry_arg = telemetry
+        self.telemetry = telemetry or ScraperTelemetry("body")
+        # Output buffering policy, see JsonlRecordWriter
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self._local = threading.local()
+        self._sessions = []
+        self._host_slots = {}
+        self._host_slots_lock = threading.Lock()
 
     def load_metadata(self):
-        if self.metadata_path.endswith(".jsonl"):
-            self.df = pd.read_json(self.metadata_path, lines=True)
-        elif self.metadata_path.endswith(".json"):
+        path = strip_codec_suffix(self.metadata_path)
+        if path.endswith(".jsonl"):
+            self.df = read_jsonl(self.metadata_path)
+        elif path.endswith(".json"):
             self.df = pd.read_json(self.metadata_path)
         else:
-            raise ValueError("Only .json or .jsonl files supported for AA metadata.")
+            raise ValueError(
+                "Only .json or .jsonl (optionally .gz / .zst) files supported "
+                "for AA metadata."
+            )
         print(f"Loaded {len(self.df)} metadata rows.")
 
     def fetch_article_body(self, url, session, user_agent):
+        return self._fetch_article(url, session, user_agent)[0]
+
+    def _fetch_article(self, url, session, user_agent):
+        """Returns (text, failed) where failed means every attempt raised."""
         tries = 0
         while tries < self.max_retries:
             try:
                 headers = {"User-Agent": user_agent}
-                resp = session.get(url, headers=headers, timeout=25)
+                t0 = time.perf_counter()
+                resp = self._send(session.get, url, headers=headers, timeout=25)
+                self.telemetry.observe_fetch(
+                    time.perf_counter() - t0, len(resp.content)
+                )
                 resp.raise_for_status()
-                soup = BeautifulSoup(resp.text, "html.parser")
-                main = soup.find("div", class_="detay-icerik")
-                if main is None:
-                    return ""
-                # Optionally get location/city (e.g. GENEVA) at the top
-                parts = []
-
-                # Subheadings
-                headings = [h.get_text(strip=True) for h in main.find_all(["h3", "h4"])]
-
-                # Main body paragraphs (ENGLISH: <p class="selectionShareable">)
-                paragraphs = [
-                    p.get_text(strip=True)
-                    for p in main.find_all("p", class_="selectionShareable")
-                ]
-
-                # Filter out subscription/junk lines (ENGLISH ONLY)
-                filtered_paragraphs = [
-                    p
-                    for p in paragraphs
-                    if not (
-                        "Anadolu Agency website contains only" in p
-                        or "Please contact us for subscription options" in p
-                    )
-                ]
-                # Compose full article
-                full_text = "\n".join(parts + headings + filtered_paragraphs)
-                if not full_text.strip():
-                    return main.get_text(strip=True)
-                return full_text
+                html = resp.text
+                if self.cache is not None:
+                    self.cache.put(url, html)
+                t0 = time.perf_counter()
+                text = self.extractor.extract(html)
+                self.telemetry.observe_parse(time.perf_counter() - t0)
+                return text, False
             except Exception as e:
                 tries += 1
                 print(f"Error fetching {url} (try {tries}/{self.max_retries}): {e}")
-                time.sleep(random.uniform(self.min_delay, self.min_delay * 4))
-        return ""
+                if self.rate_controller is not None:
+                    time.sleep(self.rate_controller.backoff(tries))
+                else:
+                    time.sleep(random.uniform(self.min_delay, self.min_delay * 4))
+        return "", True
+
+    def _send(self, send, *args, **kwargs):
+        if self.rate_controller is None:
+            return send(*args, **kwargs)
+        return self.rate_controller.request(send, *args, **kwargs)
+
+    def _pause(self):
+        # The rate controller paces requests itself
+        if self.rate_controller is None and self.min_delay:
+            time.sleep(random.uniform(self.min_delay, self.min_delay * 3))
+
+    def _load_done_ids(self, resume_file):
+        done_ids = set()
+        if resume_file and os.path.exists(resume_file):
+            # Reads the compact <resume_file>.ids index (built on first use)
+            # instead of re-parsing every article in the JSONL.
+            same_file = os.path.abspath(resume_file) == os.path.abspath(
+                self.output_path
+            )
+            done_ids = DoneIdIndex(resume_file).load(repair=same_file)
+            print(f"Resuming: found {len(done_ids)} already downloaded articles.")
+        return done_ids
+
+    def _iter_pending(self, records, done_ids):
+        """Yields (index, item, url) for every record that still needs fetching."""
+        for i, item in enumerate(records):
+            news_id = item.get("Id")
+            route = item.get("Route")
+            if not route or not isinstance(route, str):
+                self.telemetry.skip()  # missing route
+                continue
+            if news_id in done_ids:
+                self.telemetry.skip()  # already downloaded
+                continue
+            yield i, item, self._article_url(route)
+
+    def _article_url(self, route):
+        return self.BASE_URL + route if route.startswith("/") else route
+
+    @staticmethod
+    def _make_record(item, url, text):
+        return {
+            "Id": item.get("Id"),
+            "Title": item.get("Title"),
+            "Url": url,
+            "full_text": text,
+        }
+
+    @staticmethod
+    def _outcome(text, failed):
+        if failed:
+            return "error"
+        if not text or len(text) < 50:
+            return "empty"
+        return "success"
+
+    def _fetch_record(self, item, url, session):
+        text, failed = self._fetch_article(url, session, self.ua.random)
+        return self._make_record(item, url, text), self._outcome(text, failed)
+
+    def _start_telemetry(self, n_total):
+        if self._telemetry_arg is not None:
+            self._telemetry_arg.reset()
+        self.telemetry = self._telemetry_arg or ScraperTelemetry("body")
+        self.telemetry.set_total(n_total)
+        return self.telemetry
+
+    def _open_writer(self, path, ordered=False):
+        return JsonlRecordWriter(
+            path,
+            ordered=ordered,
+            flush_every=self.flush_every,
+            flush_interval=self.flush_interval,
+            fsync=self.fsync,
+            telemetry=self.telemetry,
+        )
+
+    def _finish_run(self, n_total):
+        self.telemetry.close()
+        print(
+            f"Done! {self.telemetry.counters['success']}/{n_total} articles downloaded."
+        )
+        if self.rate_controller is not None:
+            print(f"Rate controller: {self.rate_controller.summary()}")
 
     def run(self, start=0, end=None, resume_file=None):
         if self.df is None:
             self.load_metadata()
         records = self.df.iloc[start:end].to_dict(orient="records")
-        done_ids = set()
-        if resume_file:
-            try:
-                with open(resume_file, encoding="utf-8") as f:
-                    for line in f:
-                        obj = json.loads(line)
-                        done_ids.add(obj["Id"])
-                print(f"Resuming: found {len(done_ids)} already downloaded articles.")
-            except Exception:
-                pass
+        done_ids = self._load_done_ids(resume_file)
         n_total = len(records)
-        n_success = 0
+        telemetry = self._start_telemetry(n_total)
 
-        with open(self.output_path, "a", encoding="utf-8") as out:
+        with self._open_writer(self.output_path) as writer:
             session = requests.Session()
-            for i, item in enumerate(records):
-                if i % self.session_reset_every == 0:
+            for n_fetched, (i, item, url) in enumerate(
+                self._iter_pending(records, done_ids)
+            ):
+                if n_fetched % self.session_reset_every == 0:
                     session.close()
                     session = requests.Session()
 
-                user_agent = self.ua.random
-                news_id = item.get("Id")
-                title = item.get("Title")
-                route = item.get("Route")
-                if not route or not isinstance(route, str):
-                    print(f"Skipping missing route: {news_id}")
-                    continue
-                if news_id in done_ids:
-                    print(f"Already downloaded: {news_id}")
-                    continue
-                url = self.BASE_URL + route if route.startswith("/") else route
-
-                text = self.fetch_article_body(url, session, user_agent)
-                if not text or len(text) < 50:
-                    print(f"Failed or empty article for {url}")
-                else:
-                    n_success += 1
-                out_obj = {"Id": news_id, "Title": title, "Url": url, "full_text": text}
-                out.write(json.dumps(out_obj, ensure_ascii=False) + "\n")
-                print(
-                    f"[{i + 1}/{n_total}] Downloaded Id {news_id} ({len(text)} chars)."
-                )
-                time.sleep(random.uniform(self.min_delay, self.min_delay * 3))
+                out_obj, outcome = self._fetch_record(item, url, session)
+                writer.put(n_fetched, out_obj)
+                telemetry.record(outcome)
+                self._pause()
             session.close()
-        print(f"Done! {n_success}/{n_total} articles downloaded.")
+        self._finish_run(n_total)
+
+    # Concurrent mode
+    def _thread_session(self, pool_size):
+        """One keep-alive session per worker thread, reused for its whole lifetime."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._local.session = session
+            with self._host_slots_lock:
+                self._sessions.append(session)
+        return session
+
+    def _close_thread_sessions(self):
+        with self._host_slots_lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions.clear()
+        self._local = threading.local()
+
+    def _host_slot(self, url, max_per_host):
+        host = urlparse(url).netloc
+        with self._host_slots_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(max_per_host)
+            return self._host_slots[host]
+
+    def _fetch_record_concurrent(self, item, url, max_per_host):
+        session = self._thread_session(max_per_host)
+        with self._host_slot(url, max_per_host):
+            out_obj = self._fetch_record(item, url, session)
+        self._pause()
+        return out_obj
+
+    def run_concurrent(
+        self,
+        start=0,
+        end=None,
+        resume_file=None,
+        max_workers=8,
+        max_per_host=None,
+        ordered=False,
+    ):
+        """
+        Same contract as run(), but downloads with a pool of worker threads.
+
+        max_workers: number of requests in flight at once.
+        max_per_host: upper bound of parallel requests against a single host
+            (defaults to max_workers).
+        ordered: write records in metadata order instead of completion order.
+        """
+        for _ in self.iter_records(
+            start, end, resume_file, max_workers, max_per_host, ordered
+        ):
+            pass
+
+    def iter_records(
+        self,
+        start=0,
+        end=None,
+        resume_file=None,
+        max_workers=8,
+        max_per_host=None,
+        ordered=False,
+    ):
+        """
+        Generator form of run_concurrent(): every record is yielded as soon as
+        it has been handed to the output writer, so downstream processing can
+        start while the crawl is still running. Arguments as in run_concurrent().
+        """
+        if self.df is None:
+            self.load_metadata()
+        max_per_host = max_per_host or max_workers
+        records = self.df.iloc[start:end].to_dict(orient="records")
+        done_ids = self._load_done_ids(resume_file)
+        n_total = len(records)
+        telemetry = self._start_telemetry(n_total)
+        max_in_flight = max_workers * 4
+
+        try:
+            with self._open_writer(self.output_path, ordered=ordered) as writer:
+                with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                    in_flight = {}
+                    pending = enumerate(self._iter_pending(records, done_ids))
+                    exhausted = False
+                    while in_flight or not exhausted:
+                        # Keep the pool saturated without materialising every future
+                        while not exhausted and len(in_flight) < max_in_flight:
+                            nxt = next(pending, None)
+                            if nxt is None:
+                                exhausted = True
+                                break
+                            seq, (i, item, url) = nxt
+                            fut = pool.submit(
+                                self._fetch_record_concurrent, item, url, max_per_host
+                            )
+                            in_flight[fut] = seq
+                        if not in_flight:
+                            break
+                        finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for fut in finished:
+                            seq = in_flight.pop(fut)
+                            out_obj, outcome = fut.result()
+                            writer.put(seq, out_obj)
+                            telemetry.record(outcome)
+                            yield out_obj
+        finally:
+            # Also when the consumer stops early or raises
+            self._close_thread_sessions()
+            self._finish_run(n_total)
+
+    # Work-queue mode
+    def populate_queue(self, queue_path, start=0, end=None):
+        """Adds the metadata rows [start:end] to the job table at `queue_path`."""
+        if self.df is None:
+            self.load_metadata()
+        records = self.df.iloc[start:end].to_dict(orient="records")
+        # Routes, not URLs, so every worker can use its own BASE_URL
+        jobs = (
+            (item["Id"], {k: item.get(k) for k in ("Id", "Title", "Route")})
+            for _, item, _ in self._iter_pending(records, set())
+        )
+        with LeaseWorkQueue(queue_path) as queue:
+            n_added = queue.add(jobs)
+            print(f"Queued {n_added} new articles: {queue.counts()}")
+        return n_added
+
+    def run_worker(
+        self,
+        queue_path,
+        worker_id=None,
+        batch_size=None,
+        max_workers=8,
+        max_per_host=None,
+        lease_seconds=120.0,
+        max_attempts=3,
+        idle_wait=5.0,
+    ):
+        """
+        Work-queue mode: leases jobs from the LeaseWorkQueue at `queue_path`
+        (see populate_queue) and downloads them into output_path, which must be
+        this worker's own shard. Start any number of workers, in separate
+        processes or on separate machines, and combine their shards with
+        work_queue.merge_shards().
+
+        Leases are renewed while a batch is in flight; jobs are completed only
+        after their records are flushed to the shard, and failed downloads go
+        back to the queue. Returns once no job is pending or leased.
+        """
+        worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        batch_size = batch_size or max_workers * 8
+        max_per_host = max_per_host or max_workers
+        heartbeat_every = lease_seconds / 3
+        queue = LeaseWorkQueue(queue_path, lease_seconds, max_attempts)
+        telemetry = self._start_telemetry(None)
+
+        try:
+            with self._open_writer(self.output_path) as writer:
+                with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                    while True:
+                        jobs = queue.lease(worker_id, batch_size)
+                        if not jobs:
+                            if not queue.counts()["leased"]:
+                                break
+                            # Other workers still hold leases that may expire
+                            time.sleep(idle_wait)
+                            continue
+                        futures = {
+                            pool.submit(
+                                self._fetch_record_concurrent,
+                                item,
+                                self._article_url(item["Route"]),
+                                max_per_host,
+                            ): news_id
+                            for news_id, item in jobs
+                        }
+                        completed, failed = [], []
+                        in_flight = set(futures)
+                        last_heartbeat = time.monotonic()
+                        while in_flight:
+                            finished, in_flight = wait(
+                                in_flight,
+                                timeout=heartbeat_every,
+                                return_when=FIRST_COMPLETED,
+                            )
+                            for fut in finished:
+                                out_obj, outcome = fut.result()
+                                telemetry.record(outcome)
+                                if outcome == "error":
+                                    failed.append(futures[fut])
+                                else:
+                                    writer.put(None, out_obj)
+                                    completed.append(futures[fut])
+                            if time.monotonic() - last_heartbeat >= heartbeat_every:
+                                # Finished jobs too: they aren't settled until flushed
+                                queue.heartbeat(worker_id, list(futures.values()))
+                                last_heartbeat = time.monotonic()
+                        writer.flush()
+                        queue.complete(worker_id, completed)
+                        queue.fail(worker_id, failed)
+        finally:
+            self._close_thread_sessions()
+            queue.close()
+        self._finish_run(telemetry.n_done)
+
+    # Offline re-extraction
+    @staticmethod
+    def _remove_output(path):
+        """Removes a JSONL file and its DoneIdIndex, if they exist."""
+        for p in (path, path + DoneIdIndex.SUFFIX):
+            if os.path.exists(p):
+                os.remove(p)
+
+    def reextract_from_cache(self, output_path=None, start=0, end=None, workers=None):
+        """
+        Rebuilds the body JSONL from the raw page cache with no network access,
+        parsing in `workers` processes (default: all cores). The output file is
+        replaced; records whose page was never cached are left out.
+        """
+        if self.cache is None:
+            raise ValueError(
+                "reextract_from_cache needs a fetcher built with cache_dir."
+            )
+        if self.df is None:
+            self.load_metadata()
+        output_path = output_path or self.output_path
+        records = self.df.iloc[start:end].to_dict(orient="records")
+        pending = [
+            (item, url)
+            for _, item, url in self._iter_pending(records, set())
+            if url in self.cache
+        ]
+        # Built next to the output and swapped in only once complete, so a
+        # failed run leaves the previous dataset in place
+        tmp_path = os.path.join(
+            os.path.dirname(output_path), ".reextract." + os.path.basename(output_path)
+        )
+        self._remove_output(tmp_path)
+        telemetry = self._start_telemetry(len(pending))
+        try:
+            texts = extract_cached(
+                self.cache.root, [url for _, url in pending], self.extractor, workers
+            )
+            with self._open_writer(tmp_path) as writer:
+                for seq, ((item, url), text) in enumerate(zip(pending, texts)):
+                    writer.put(seq, self._make_record(item, url, text))
+                    telemetry.record(self._outcome(text, False))
+        except BaseException:
+            self._remove_output(tmp_path)
+            raise
+        # The old index first: a crash in between leaves an index rebuilt
+        # from whichever data file is in place, never a stale one
+        index_path = output_path + DoneIdIndex.SUFFIX
+        if os.path.exists(index_path):
+            os.remove(index_path)
+        os.replace(tmp_path, output_path)
+        if os.path.exists(tmp_path + DoneIdIndex.SUFFIX):
+            os.replace(tmp_path + DoneIdIndex.SUFFIX, index_path)
+        telemetry.close()
+        print(
+            f"Re-extracted {len(pending)}/{len(records)} cached articles "
+            f"({telemetry.counters['success']} non-empty) into {output_path}."
+        )
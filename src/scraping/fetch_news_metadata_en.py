@@ -1,6 +1,18 @@
 import requests
 import json
+import os
+import re
+import time
+import random
+import threading
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
+
+from ..utils.jsonl_io import dumps_line, open_jsonl
+from .telemetry import ScraperTelemetry
+
 # Url used + headers
 
 
@@ -18,6 +30,8 @@ class AA_EnglishNewsMetadataFetcher:
         save_file_path="",
         is_inplace=True,
         page_size=20,  # English endpoint allows up to 100
+        rate_controller=None,  # Optional AdaptiveRateController shared by requests
+        telemetry=None,  # Optional ScraperTelemetry (e.g. with an export_path)
     ):
         self.start_page = start_page
         self.max_pages = max_pages
@@ -28,10 +42,18 @@ class AA_EnglishNewsMetadataFetcher:
         self.save_file_path = save_file_path
         self.is_inplace = is_inplace
         self.page_size = page_size
+        self.rate_controller = rate_controller
+        self._results_lock = threading.Lock()
+        self._telemetry_arg = telemetry
+        self.telemetry = telemetry or ScraperTelemetry("metadata")
 
-    def _get_session_and_token(self):
+    def _get_session_and_token(self, pool_size=None):
         s = requests.Session()
         s.headers.update({"User-Agent": "Mozilla/5.0"})
+        if pool_size:
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            s.mount("http://", adapter)
+            s.mount("https://", adapter)
         r = s.get(self.BASE_URL)
         soup = BeautifulSoup(r.text, "html.parser")
         token_input = soup.find("input", {"name": "__RequestVerificationToken"})
@@ -40,12 +62,12 @@ class AA_EnglishNewsMetadataFetcher:
             raise Exception("No CSRF token found")
         return s, csrf_token
 
-    def _fetch_batch(self, session, csrf_token, page):
+    def _fetch_batch(self, session, csrf_token, page, category_id=None):
         data = {
             "PageSize": self.page_size,
             "Page": page,
             "Keywords": self.keyword,
-            "CategoryId": self.category_id,
+            "CategoryId": self.category_id if category_id is None else category_id,
             "TypeId": 1,
             "__RequestVerificationToken": csrf_token,
         }
@@ -56,15 +78,35 @@ class AA_EnglishNewsMetadataFetcher:
             "X-Requested-With": "XMLHttpRequest",
             "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
         }
-        resp = session.post(self.SEARCH_API_URL, data=data, headers=headers, timeout=25)
-        print(f"Status: {resp.status_code} (page {page})")
+        t0 = time.perf_counter()
+        resp = self._send(
+            session.post, self.SEARCH_API_URL, data=data, headers=headers, timeout=25
+        )
+        self.telemetry.observe_fetch(time.perf_counter() - t0, len(resp.content))
         resp.raise_for_status()
-        return resp.json()
+        t0 = time.perf_counter()
+        result = resp.json()
+        self.telemetry.observe_parse(time.perf_counter() - t0)
+        return result
+
+    def _send(self, send, *args, **kwargs):
+        if self.rate_controller is None:
+            return send(*args, **kwargs)
+        return self.rate_controller.request(send, *args, **kwargs)
+
+    def _start_telemetry(self, total=None):
+        # One record per fetched page: success, empty or error
+        if self._telemetry_arg is not None:
+            self._telemetry_arg.reset()
+        self.telemetry = self._telemetry_arg or ScraperTelemetry("metadata")
+        self.telemetry.set_total(total)
+        return self.telemetry
 
     def run(self):
         session, csrf_token = self._get_session_and_token()
         self.results.clear()
-        file_mode = "w" if self.is_inplace else "a"
+        telemetry = self._start_telemetry(self.max_pages)
+        file_mode = "wb" if self.is_inplace else "ab"
         file_path = self.save_file_path
 
         for i in range(self.max_pages):
@@ -76,12 +118,296 @@ class AA_EnglishNewsMetadataFetcher:
                     title = doc.get("Title")
                     link = "https://www.aa.com.tr" + doc.get("Route", "")
                     self.results.append((title, link))
-                print(f"Fetched {len(docs)} articles on page {page}.")
+                telemetry.record("success" if docs else "empty")
                 if self.save_to_file:
-                    with open(file_path, file_mode, encoding="utf-8") as f:
+                    with open_jsonl(file_path, file_mode) as f:
                         for doc in docs:
-                            f.write(json.dumps(doc, ensure_ascii=False) + "\n")
-                file_mode = "a"  # After first write, always append
+                            f.write(dumps_line(doc))
+                file_mode = "ab"  # After first write, always append
             except Exception as e:
+                telemetry.record("error")
                 print(f"Error fetching page {page}:", e)
                 break
+        telemetry.close()
+
+    # Concurrent mode
+    def _fetch_page_with_retries(
+        self, session, csrf_token, page, category_id, max_retries, retry_backoff
+    ):
+        """Returns the page's documents, or None if every attempt failed."""
+        for attempt in range(1, max_retries + 1):
+            try:
+                result = self._fetch_batch(session, csrf_token, page, category_id)
+                docs = result.get("Documents", [])
+                self.telemetry.record("success" if docs else "empty")
+                return docs
+            except Exception as e:
+                print(
+                    f"Error fetching page {page} of category {category_id} "
+                    f"(try {attempt}/{max_retries}):",
+                    e,
+                )
+                if attempt < max_retries:
+                    if self.rate_controller is not None:
+                        time.sleep(self.rate_controller.backoff(attempt))
+                    else:
+                        delay = retry_backoff * 2 ** (attempt - 1)
+                        time.sleep(random.uniform(0, delay))
+        self.telemetry.record("error")
+        return None
+
+    def _store_docs(self, docs, out):
+        with self._results_lock:
+            for doc in docs:
+                title = doc.get("Title")
+                link = "https://www.aa.com.tr" + doc.get("Route", "")
+                self.results.append((title, link))
+            if out is not None:
+                for doc in docs:
+                    out.write(dumps_line(doc))
+                out.flush()  # One frame per page for .gz / .zst files
+
+    def _crawl_category(
+        self, session, csrf_token, category_id, window, max_retries, retry_backoff, out
+    ):
+        failed_pages = []
+        page = self.start_page
+        last_page = None
+        if self.max_pages is not None:
+            last_page = self.start_page + self.max_pages - 1
+
+        with ThreadPoolExecutor(max_workers=window) as pool:
+            while last_page is None or page <= last_page:
+                pages = list(range(page, page + window))
+                if last_page is not None:
+                    pages = [p for p in pages if p <= last_page]
+                batches = pool.map(
+                    lambda p: self._fetch_page_with_retries(
+                        session, csrf_token, p, category_id, max_retries, retry_backoff
+                    ),
+                    pages,
+                )
+                reached_end = False
+                # Pages are handled in order so the output stays newest-first
+                for p, docs in zip(pages, batches):
+                    if reached_end:
+                        continue
+                    if docs is None:
+                        failed_pages.append(p)
+                        continue
+                    if not docs:
+                        print(f"Page {p} of category {category_id} is empty, stopping.")
+                        reached_end = True
+                        continue
+                    self._store_docs(docs, out)
+                if reached_end:
+                    break
+                if all(p in failed_pages for p in pages):
+                    # Every page failed all its retries: the server is down or
+                    # refusing us, and without max_pages nothing else would stop
+                    print(
+                        f"All of pages {pages[0]}-{pages[-1]} of category "
+                        f"{category_id} failed, giving up on the category."
+                    )
+                    if last_page is not None:
+                        failed_pages.extend(range(pages[-1] + 1, last_page + 1))
+                    break
+                page += window
+        return failed_pages
+
+    def run_concurrent(
+        self, window=4, category_ids=None, max_retries=3, retry_backoff=1.0
+    ):
+        """
+        Crawls `window` pages at a time per category, all categories in parallel,
+        sharing one session pool and CSRF token.
+
+        - Failed pages are retried with exponential backoff and, if they still
+          fail, reported at the end instead of aborting the run.
+        - A category stops as soon as a page comes back empty; set
+          max_pages=None to crawl every available page.
+        - A category is given up once a whole window of pages fails; its
+          remaining pages (up to max_pages) are reported as failed.
+
+        Returns {category_id: [failed pages]}.
+        """
+        category_ids = category_ids or [self.category_id]
+        session, csrf_token = self._get_session_and_token(
+            pool_size=window * len(category_ids)
+        )
+        self.results.clear()
+        telemetry = self._start_telemetry()
+        out = None
+        if self.save_to_file:
+            file_mode = "wb" if self.is_inplace else "ab"
+            out = open_jsonl(self.save_file_path, file_mode)
+
+        try:
+            with ThreadPoolExecutor(max_workers=len(category_ids)) as pool:
+                futures = {
+                    cid: pool.submit(
+                        self._crawl_category,
+                        session,
+                        csrf_token,
+                        cid,
+                        window,
+                        max_retries,
+                        retry_backoff,
+                        out,
+                    )
+                    for cid in category_ids
+                }
+                failed = {cid: fut.result() for cid, fut in futures.items()}
+        finally:
+            if out is not None:
+                out.close()
+            session.close()
+
+        telemetry.close()
+        print(f"Done! Fetched {len(self.results)} articles.")
+        if self.rate_controller is not None:
+            print(f"Rate controller: {self.rate_controller.summary()}")
+        for cid, pages in failed.items():
+            if pages:
+                print(
+                    f"Category {cid}: pages {pages} failed after {max_retries} tries."
+                )
+        return failed
+
+    # Delta mode
+    @staticmethod
+    def _parse_create_date(value):
+        """CreateDate as a naive datetime (ISO or /Date(ms)/ form), or None."""
+        if not isinstance(value, str) or not value:
+            return None
+        m = re.match(r"/Date\((-?\d+)", value)
+        if m:
+            ts = int(m.group(1)) / 1000
+            return datetime.fromtimestamp(ts, tz=timezone.utc).replace(tzinfo=None)
+        try:
+            return datetime.fromisoformat(value.rstrip("Z")).replace(tzinfo=None)
+        except ValueError:
+            return None
+
+    def _state_path(self, state_path):
+        if state_path:
+            return state_path
+        if not self.save_file_path:
+            raise ValueError("run_delta needs state_path or save_file_path.")
+        return self.save_file_path + ".state.json"
+
+    @staticmethod
+    def _load_state(path):
+        if not os.path.exists(path):
+            return {}
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    @staticmethod
+    def _save_state(path, state):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    def _crawl_category_delta(
+        self, session, csrf_token, category_id, cat_state, max_retries, retry_backoff
+    ):
+        """
+        Pages newest-first until a page holds no unseen documents.
+        Returns (new docs, updated category state), or (None, None) on failure.
+        """
+        hwm = self._parse_create_date(cat_state.get("newest_create_date"))
+        known_ids = set(cat_state.get("recent_ids", []))
+        # Once there is a state, max_pages no longer applies: stopping early
+        # would move the high-water mark past documents never fetched
+        max_pages = None if cat_state else self.max_pages
+        new_docs = []
+        seen = set()
+        page = self.start_page
+        while max_pages is None or page < self.start_page + max_pages:
+            docs = self._fetch_page_with_retries(
+                session, csrf_token, page, category_id, max_retries, retry_backoff
+            )
+            if docs is None:
+                return None, None
+            page_new = []
+            for doc in docs:
+                doc_id = doc.get("Id")
+                if doc_id in known_ids or doc_id in seen:
+                    continue
+                created = self._parse_create_date(doc.get("CreateDate"))
+                if hwm is not None and created is not None and created < hwm:
+                    continue
+                seen.add(doc_id)
+                page_new.append(doc)
+            new_docs.extend(page_new)
+            if not docs or not page_new:
+                break
+            page += 1
+
+        # New high-water mark: newest CreateDate seen, plus the Ids around it so
+        # documents sharing that timestamp aren't skipped or duplicated.
+        dated = [
+            (self._parse_create_date(d.get("CreateDate")), d.get("Id"))
+            for d in new_docs
+        ]
+        dated = [(c, i) for c, i in dated if c is not None]
+        newest = max([c for c, _ in dated] + ([hwm] if hwm else []), default=None)
+        recent_ids = [d.get("Id") for d in new_docs[: 2 * self.page_size]]
+        recent_ids += [i for i in cat_state.get("recent_ids", []) if i not in seen]
+        new_state = {
+            "newest_create_date": newest.isoformat() if newest else None,
+            "recent_ids": recent_ids[: 2 * self.page_size],
+            "last_run": datetime.now().isoformat(timespec="seconds"),
+        }
+        return new_docs, new_state
+
+    def run_delta(
+        self, state_path=None, category_ids=None, max_retries=3, retry_backoff=1.0
+    ):
+        """
+        Incremental refresh: fetches only documents newer than the previous run.
+
+        The newest CreateDate and the most recent Ids of every category are kept
+        in `state_path` (default: <save_file_path>.state.json). Paging stops at
+        the first page without unseen documents, new documents are appended to
+        save_file_path, and the state only advances once they are written.
+        Only the first run of a category, without a state, is limited to
+        max_pages (None: until an empty page); later runs page back as far as
+        the previous one reached. Returns the number of new documents.
+        """
+        state_path = self._state_path(state_path)
+        state = self._load_state(state_path)
+        category_ids = category_ids or [self.category_id]
+        session, csrf_token = self._get_session_and_token()
+        self.results.clear()
+        telemetry = self._start_telemetry()
+        n_new = 0
+        try:
+            for cid in category_ids:
+                new_docs, new_state = self._crawl_category_delta(
+                    session,
+                    csrf_token,
+                    cid,
+                    state.get(str(cid), {}),
+                    max_retries,
+                    retry_backoff,
+                )
+                if new_docs is None:
+                    print(f"Category {cid}: a page kept failing, state left unchanged.")
+                    continue
+                if self.save_to_file and new_docs:
+                    with open_jsonl(self.save_file_path, "ab") as out:
+                        self._store_docs(new_docs, out)
+                else:
+                    self._store_docs(new_docs, None)
+                state[str(cid)] = new_state
+                self._save_state(state_path, state)
+                n_new += len(new_docs)
+                print(f"Category {cid}: {len(new_docs)} new articles.")
+        finally:
+            session.close()
+            telemetry.close()
+        print(f"Done! {n_new} new articles since the last run.")
+        return n_new
@@ -0,0 +1,109 @@
+import gzip
+import hashlib
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from .extractors import get_extractor
+
+
+class HtmlCache:
+    """
+    Compressed, content-addressed store of raw article pages.
+
+    Layout under `root`:
+    - objects/ab/abcdef....html.gz  page bodies, named by the SHA-256 of the
+      page, so identical pages are stored once
+    - urls.tsv                       append-only "<url>\\t<content hash>" lines;
+      the last line for a URL wins
+
+    Writes are atomic (temp file + rename), so a crash never leaves a partial
+    object behind, and several threads can share one cache.
+    """
+
+    def __init__(self, root, compresslevel=6):
+        self.root = root
+        self.compresslevel = compresslevel
+        self.urls_path = os.path.join(root, "urls.tsv")
+        self._lock = threading.Lock()
+        self._url_to_hash = {}
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        self._load_urls()
+
+    def _load_urls(self):
+        if not os.path.exists(self.urls_path):
+            return
+        with open(self.urls_path, encoding="utf-8") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # partial last line of an interrupted run
+                url, _, content_hash = line.rstrip("\n").rpartition("\t")
+                if url and len(content_hash) == 64:
+                    self._url_to_hash[url] = content_hash
+
+    def __contains__(self, url):
+        return url in self._url_to_hash
+
+    def __len__(self):
+        return len(self._url_to_hash)
+
+    def _object_path(self, content_hash):
+        return os.path.join(
+            self.root, "objects", content_hash[:2], content_hash + ".html.gz"
+        )
+
+    def put(self, url, html):
+        data = html.encode("utf-8")
+        content_hash = hashlib.sha256(data).hexdigest()
+        path = self._object_path(content_hash)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(gzip.compress(data, compresslevel=self.compresslevel))
+            os.replace(tmp_path, path)
+        with self._lock:
+            if self._url_to_hash.get(url) != content_hash:
+                with open(self.urls_path, "a", encoding="utf-8") as f:
+                    f.write(f"{url}\t{content_hash}\n")
+                self._url_to_hash[url] = content_hash
+        return content_hash
+
+    def get(self, url):
+        """Returns the cached page for `url`, or None."""
+        content_hash = self._url_to_hash.get(url)
+        if content_hash is None:
+            return None
+        with open(self._object_path(content_hash), "rb") as f:
+            return gzip.decompress(f.read()).decode("utf-8")
+
+
+# Re-extraction workers (module level so ProcessPoolExecutor can pickle them)
+_worker_cache = None
+_worker_extractor = None
+
+
+def _init_worker(cache_root, extractor):
+    global _worker_cache, _worker_extractor
+    _worker_cache = HtmlCache(cache_root)
+    _worker_extractor = get_extractor(extractor)
+
+
+def _extract_url(url):
+    html = _worker_cache.get(url)
+    if html is None:
+        return None
+    return _worker_extractor.extract(html)
+
+
+def extract_cached(cache_root, urls, extractor="bs4", workers=None, chunksize=32):
+    """
+    Yields the extracted text for every URL (None when it isn't cached), in
+    input order, parsing in `workers` processes (default: all cores).
+    """
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(cache_root, extractor),
+    ) as pool:
+        yield from pool.map(_extract_url, urls, chunksize=chunksize)
@@ -0,0 +1,121 @@
+import os
+import time
+
+from ..utils.jsonl_io import compress_frame, dumps_line, jsonl_codec, require_codec
+from .done_index import DoneIdIndex
+
+
+class JsonlRecordWriter:
+    """
+    Appends article records to a JSONL file, one JSON object per line.
+
+    Every record carries its own "Id", so lines can be written in completion
+    order and still be resumed correctly. With ordered=True, records handed in
+    out of order are held back until all earlier sequence numbers have arrived,
+    so the file matches the metadata order exactly.
+
+    Lines are buffered and written out every `flush_every` records or every
+    `flush_interval` seconds, whichever comes first; fsync=True also forces
+    them to disk on each flush. The writer keeps the file's DoneIdIndex
+    (`<path>.ids`) in step with the data: Ids are added to the index only after
+    their lines have been flushed, so a crash can lose buffered records but
+    never mark them as done.
+
+    A .gz / .zst path is compressed one frame per flush, so everything
+    flushed survives a crash and resume works as for plain files. Frames of
+    a single record compress poorly; raise flush_every for such files.
+    """
+
+    def __init__(
+        self,
+        path,
+        ordered=False,
+        flush_every=1,
+        flush_interval=None,
+        fsync=False,
+        telemetry=None,
+    ):
+        self.path = path
+        self.ordered = ordered
+        self.flush_every = max(1, flush_every)
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.telemetry = telemetry
+        self.codec = jsonl_codec(path)
+        require_codec(self.codec, path)  # Before any record is buffered
+        self.n_written = 0
+        self._next_seq = 0
+        self._pending = {}
+        self._buffer = []
+        self._buffer_ids = []
+        self._last_flush = time.monotonic()
+        self.index = DoneIdIndex(path)
+        self.index.load(repair=True)
+        self.fh = open(path, "ab")
+        self.offset = os.path.getsize(path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _write(self, obj):
+        self._buffer.append(dumps_line(obj))
+        self._buffer_ids.append(obj.get("Id"))
+        self.n_written += 1
+        if len(self._buffer) >= self.flush_every or (
+            self.flush_interval is not None
+            and time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            t0 = time.perf_counter()
+            if self.codec is None:
+                data = b"".join(self._buffer)
+                ends = []
+                for line in self._buffer:
+                    self.offset += len(line)
+                    ends.append(self.offset)
+            else:
+                # Every record of the frame is only readable once it all is
+                data = compress_frame(b"".join(self._buffer), self.codec)
+                self.offset += len(data)
+                ends = [self.offset] * len(self._buffer)
+            self.fh.write(data)
+            self.fh.flush()
+            if self.fsync:
+                os.fsync(self.fh.fileno())
+            self.index.add_many(list(zip(self._buffer_ids, ends)), fsync=self.fsync)
+            self._buffer.clear()
+            self._buffer_ids.clear()
+            if self.telemetry is not None:
+                self.telemetry.observe_flush(time.perf_counter() - t0)
+        self._last_flush = time.monotonic()
+
+    def put(self, seq, obj):
+        """Queue a record; obj=None marks a sequence number that produced no record."""
+        if not self.ordered:
+            if obj is not None:
+                self._write(obj)
+            return
+        self._pending[seq] = obj
+        while self._next_seq in self._pending:
+            ready = self._pending.pop(self._next_seq)
+            if ready is not None:
+                self._write(ready)
+            self._next_seq += 1
+
+    def close(self):
+        """Write whatever is still held back (gaps are skipped) and close."""
+        if self.fh.closed:
+            return
+        for seq in sorted(self._pending):
+            if self._pending[seq] is not None:
+                self._write(self._pending[seq])
+        self._pending.clear()
+        self.flush()
+        self.fh.close()
+        self.index.close()
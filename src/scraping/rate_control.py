@@ -0,0 +1,273 @@
+import random
+import threading
+import time
+
+
+def is_throttle_status(status):
+    """429 and 5xx mean "slow down"; everything else is the server's answer."""
+    return status is not None and (status == 429 or status >= 500)
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` requests per second, bursts up to `capacity`."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def set_rate(self, rate):
+        with self._lock:
+            self._refill()
+            self.rate = rate
+            self.capacity = max(1.0, rate)
+            self.tokens = min(self.tokens, self.capacity)
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and rejects requests
+    for `reset_timeout` seconds. Then a single probe request is let through
+    (half-open): success closes the circuit, failure opens it again with the
+    timeout doubled (up to `max_reset_timeout`).
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(
+        self, failure_threshold=5, reset_timeout=10.0, max_reset_timeout=300.0
+    ):
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.n_opened = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def wait_time(self):
+        """0 if a request may go now, otherwise seconds until it might."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return 0.0
+            if self.state == self.OPEN:
+                remaining = self.opened_at + self.reset_timeout - time.monotonic()
+                if remaining > 0:
+                    return remaining
+                self.state = self.HALF_OPEN
+            if self._probe_in_flight:
+                return min(1.0, self.reset_timeout)
+            self._probe_in_flight = True
+            return 0.0
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._probe_in_flight = False
+            if self.state != self.CLOSED:
+                self.state = self.CLOSED
+                self.reset_timeout = self.base_reset_timeout
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN:
+                self._probe_in_flight = False
+                self.reset_timeout = min(self.reset_timeout * 2, self.max_reset_timeout)
+                self._open()
+            elif self.state == self.CLOSED and self.failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.n_opened += 1
+        print(
+            f"Circuit opened for {self.reset_timeout:.0f}s after {self.failures} failures."
+        )
+
+
+class AdaptiveRateController:
+    """
+    Shared pacing for the scrapers.
+
+    - A token bucket caps the request rate.
+    - AIMD adjusts both the rate and the number of requests in flight: every
+      success adds a little, a throttling response (429/5xx), a connection
+      error or a response slower than `target_latency` cuts them by
+      `decrease_factor` (at most once per `decrease_cooldown` seconds, so one
+      burst of errors counts as one signal).
+    - A Retry-After header pauses everyone until it expires.
+    - backoff() gives exponential backoff with full jitter for retries.
+    - A CircuitBreaker stops all traffic after repeated consecutive failures.
+
+    Usage:
+        resp = controller.request(session.get, url, timeout=25)
+    or, by hand:
+        controller.acquire()
+        ... send the request ...
+        controller.release(status=resp.status_code, latency=elapsed)
+    """
+
+    def __init__(
+        self,
+        rate=5.0,
+        min_rate=0.5,
+        max_rate=100.0,
+        concurrency=4,
+        min_concurrency=1,
+        max_concurrency=64,
+        rate_increase=0.2,
+        decrease_factor=0.5,
+        decrease_cooldown=1.0,
+        target_latency=None,
+        backoff_base=0.5,
+        backoff_cap=60.0,
+        failure_threshold=10,
+        reset_timeout=10.0,
+    ):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.concurrency = concurrency
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.rate_increase = rate_increase
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+        self.target_latency = target_latency
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+
+        self.bucket = TokenBucket(rate)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+        self._successes_since_growth = 0
+        self._cond = threading.Condition()
+        self.stats = {"requests": 0, "successes": 0, "throttled": 0, "errors": 0}
+
+    def acquire(self):
+        """Blocks until a request may be sent."""
+        with self._cond:
+            while True:
+                wait = self.paused_until - time.monotonic()
+                if wait <= 0 and self.in_flight < int(self.concurrency):
+                    # Asked last: a half-open breaker hands its single probe
+                    # to this call, which must then send the request
+                    wait = self.breaker.wait_time()
+                    if wait <= 0:
+                        break
+                self._cond.wait(timeout=wait if wait > 0 else None)
+            self.in_flight += 1
+        self.bucket.acquire()
+
+    def release(self, status=None, latency=None, error=False, retry_after=None):
+        """Reports the outcome of a request started with acquire()."""
+        throttled = error or is_throttle_status(status)
+        slow = (
+            not throttled
+            and self.target_latency is not None
+            and latency is not None
+            and latency > self.target_latency
+        )
+        with self._cond:
+            self.in_flight -= 1
+            self.stats["requests"] += 1
+            if throttled:
+                self.stats["errors" if error else "throttled"] += 1
+                self._decrease()
+            elif slow:
+                self._decrease()
+            else:
+                self.stats["successes"] += 1
+                self._increase()
+            if retry_after:
+                self.paused_until = max(
+                    self.paused_until, time.monotonic() + float(retry_after)
+                )
+            self._cond.notify_all()
+        if throttled:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    def _increase(self):
+        self.rate = min(self.max_rate, self.rate + self.rate_increase)
+        self.bucket.set_rate(self.rate)
+        # Grow concurrency by one per "round" of successful requests
+        self._successes_since_growth += 1
+        if self._successes_since_growth >= self.concurrency:
+            self._successes_since_growth = 0
+            self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+
+    def _decrease(self):
+        now = time.monotonic()
+        if now - self.last_decrease < self.decrease_cooldown:
+            return
+        self.last_decrease = now
+        self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+        self.bucket.set_rate(self.rate)
+        self.concurrency = max(
+            self.min_concurrency, int(self.concurrency * self.decrease_factor)
+        )
+        self._successes_since_growth = 0
+
+    def request(self, send, *args, **kwargs):
+        """Calls send(*args, **kwargs) (e.g. session.get) under the controller."""
+        self.acquire()
+        t0 = time.monotonic()
+        try:
+            resp = send(*args, **kwargs)
+        except Exception:
+            self.release(error=True)
+            raise
+        self.release(
+            status=resp.status_code,
+            latency=time.monotonic() - t0,
+            retry_after=self.retry_after(resp),
+        )
+        return resp
+
+    def backoff(self, attempt):
+        """Seconds to wait before retry number `attempt` (1-based), with full jitter."""
+        return random.uniform(
+            0, min(self.backoff_cap, self.backoff_base * 2 ** (attempt - 1))
+        )
+
+    @staticmethod
+    def retry_after(resp):
+        """Retry-After in seconds from a response, if the server sent one."""
+        value = resp.headers.get("Retry-After") if resp is not None else None
+        try:
+            return float(value) if value else None
+        except ValueError:
+            return None
+
+    def summary(self):
+        return (
+            f"rate={self.rate:.1f}/s concurrency={int(self.concurrency)} "
+            f"requests={self.stats['requests']} throttled={self.stats['throttled']} "
+            f"errors={self.stats['errors']} circuit_opened={self.breaker.n_opened}"
+        )
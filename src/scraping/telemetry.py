@@ -0,0 +1,230 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+PARSE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+BYTES_BUCKETS = (1e3, 1e4, 5e4, 1e5, 2.5e5, 5e5, 1e6, 5e6)
+
+OUTCOMES = ("success", "empty", "error")
+
+
+class Histogram:
+    """Fixed-bucket histogram (Prometheus style: cumulative `le` buckets)."""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Upper bucket bound below which a fraction q of observations fall."""
+        if not self.count:
+            return None
+        target = q * self.count
+        running = 0
+        for bound, n in zip(self.buckets + (float("inf"),), self.counts):
+            running += n
+            if running >= target:
+                return bound
+        return float("inf")
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": dict(
+                zip([str(b) for b in self.buckets] + ["+Inf"], self.counts)
+            ),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+        }
+
+
+class ScraperTelemetry:
+    """
+    Thread-safe counters and histograms for a scraper run.
+
+    - observe_fetch / observe_parse / observe_flush time the stages,
+    - record(outcome) counts finished records ("success", "empty", "error"),
+    - maybe_report() prints a progress line at most every `report_interval`
+      seconds (instead of one line per record),
+    - maybe_export() writes a snapshot to `export_path` at most every
+      `export_interval` seconds: Prometheus text format for *.prom / *.txt,
+      JSON otherwise.
+    """
+
+    def __init__(
+        self,
+        name,
+        export_path=None,
+        export_interval=30.0,
+        report_interval=10.0,
+        rate_window=60.0,
+    ):
+        self.name = name
+        self.export_path = export_path
+        self.export_interval = export_interval
+        self.report_interval = report_interval
+        self.rate_window = rate_window
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clears all counters and histograms, e.g. at the start of a new run."""
+        self.total = None
+        self.counters = {outcome: 0 for outcome in OUTCOMES}
+        self.counters.update({"skipped": 0, "bytes": 0, "requests": 0})
+        self.histograms = {
+            "fetch_latency_seconds": Histogram(LATENCY_BUCKETS),
+            "parse_seconds": Histogram(PARSE_BUCKETS),
+            "response_bytes": Histogram(BYTES_BUCKETS),
+            "flush_seconds": Histogram(PARSE_BUCKETS),
+        }
+        self.started = time.monotonic()
+        self._recent = deque()  # completion times inside rate_window
+        self._last_report = self.started
+        self._last_export = self.started
+
+    def set_total(self, total):
+        self.total = total
+
+    def observe_fetch(self, seconds, n_bytes):
+        with self._lock:
+            self.counters["requests"] += 1
+            self.counters["bytes"] += n_bytes
+            self.histograms["fetch_latency_seconds"].observe(seconds)
+            self.histograms["response_bytes"].observe(n_bytes)
+
+    def observe_parse(self, seconds):
+        with self._lock:
+            self.histograms["parse_seconds"].observe(seconds)
+
+    def observe_flush(self, seconds):
+        with self._lock:
+            self.histograms["flush_seconds"].observe(seconds)
+
+    def skip(self, n=1):
+        with self._lock:
+            self.counters["skipped"] += n
+
+    def record(self, outcome):
+        now = time.monotonic()
+        with self._lock:
+            self.counters[outcome] += 1
+            self._recent.append(now)
+            while self._recent and self._recent[0] < now - self.rate_window:
+                self._recent.popleft()
+        self.maybe_report()
+        self.maybe_export()
+
+    @property
+    def n_done(self):
+        return sum(self.counters[o] for o in OUTCOMES)
+
+    def records_per_sec(self):
+        elapsed = time.monotonic() - self.started
+        return self.n_done / elapsed if elapsed > 0 else 0.0
+
+    def recent_records_per_sec(self):
+        window = min(self.rate_window, time.monotonic() - self.started)
+        return len(self._recent) / window if window > 0 else 0.0
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "scraper": self.name,
+                "elapsed_seconds": round(time.monotonic() - self.started, 3),
+                "total": self.total,
+                "records_done": self.n_done,
+                "records_per_sec": round(self.records_per_sec(), 3),
+                "recent_records_per_sec": round(self.recent_records_per_sec(), 3),
+                "counters": dict(self.counters),
+                "histograms": {k: h.to_dict() for k, h in self.histograms.items()},
+            }
+
+    def progress_line(self):
+        c = self.counters
+        fetch = self.histograms["fetch_latency_seconds"]
+        processed = self.n_done + c["skipped"]
+        done = f"{processed}/{self.total}" if self.total else str(processed)
+        return (
+            f"[{self.name}] {done} records | {self.records_per_sec():.1f} rec/s "
+            f"(last {self.rate_window:.0f}s: {self.recent_records_per_sec():.1f}) | "
+            f"success {c['success']} empty {c['empty']} error {c['error']} "
+            f"skipped {c['skipped']} | fetch p50 {fetch.quantile(0.5)}s "
+            f"p95 {fetch.quantile(0.95)}s | {c['bytes'] / 1e6:.1f} MB"
+        )
+
+    def maybe_report(self, force=False):
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_report < self.report_interval:
+                return
+            self._last_report = now
+        print(self.progress_line())
+
+    def maybe_export(self, force=False):
+        if not self.export_path:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_export < self.export_interval:
+                return
+            self._last_export = now
+        self.export(self.export_path)
+
+    def to_prometheus(self):
+        snap = self.snapshot()
+        label = f'scraper="{self.name}"'
+        lines = [
+            "# TYPE scraper_records_total counter",
+            *(
+                f'scraper_records_total{{{label},outcome="{o}"}} {snap["counters"][o]}'
+                for o in OUTCOMES + ("skipped",)
+            ),
+            "# TYPE scraper_requests_total counter",
+            f"scraper_requests_total{{{label}}} {snap['counters']['requests']}",
+            "# TYPE scraper_bytes_total counter",
+            f"scraper_bytes_total{{{label}}} {snap['counters']['bytes']}",
+            "# TYPE scraper_records_per_second gauge",
+            f"scraper_records_per_second{{{label}}} {snap['records_per_sec']}",
+        ]
+        for name, hist in self.histograms.items():
+            metric = f"scraper_{name}"
+            lines.append(f"# TYPE {metric} histogram")
+            running = 0
+            for bound, n in zip(hist.buckets + ("+Inf",), hist.counts):
+                running += n
+                lines.append(f'{metric}_bucket{{{label},le="{bound}"}} {running}')
+            lines.append(f"{metric}_sum{{{label}}} {hist.sum}")
+            lines.append(f"{metric}_count{{{label}}} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        if path.endswith((".prom", ".txt")):
+            payload = self.to_prometheus()
+        else:
+            payload = json.dumps(self.snapshot(), indent=2)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+    def close(self):
+        """Final progress line and export."""
+        self.maybe_report(force=True)
+        self.maybe_export(force=True)
@@ -0,0 +1,199 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from ..utils.jsonl_io import iter_lines, loads
+from .done_index import DoneIdIndex
+from .jsonl_writer import JsonlRecordWriter
+
+PENDING, LEASED, DONE, FAILED = "pending", "leased", "done", "failed"
+
+
+class LeaseWorkQueue:
+    """
+    Job table of article Ids in a local SQLite file, shared by any number of
+    worker processes (on one machine, or on several over a shared filesystem
+    that supports SQLite locking).
+
+    - lease() hands a worker a batch of pending jobs for `lease_seconds`,
+    - heartbeat() extends the leases a worker still holds,
+    - complete() / fail() settle them; a failed job goes back to pending until
+      it has been tried `max_attempts` times,
+    - leases that expire (the worker died or hung) are re-queued by the next
+      lease() call, so no job is lost.
+
+    A worker only completes jobs once their records are flushed to its shard,
+    so a crash can at worst fetch a record twice; merge_shards() dedupes by Id.
+    """
+
+    def __init__(self, path, lease_seconds=120.0, max_attempts=3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(
+            path, timeout=60, isolation_level=None, check_same_thread=False
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                seq INTEGER NOT NULL,
+                item TEXT NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                worker TEXT,
+                lease_expires REAL,
+                attempts INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS jobs_state_seq ON jobs (state, seq);
+            """)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _transaction(self, fn, *args):
+        # BEGIN IMMEDIATE takes the write lock up front, so two workers can't
+        # lease the same rows
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(*args)
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+            return result
+
+    def add(self, jobs):
+        """Inserts (Id, item dict) jobs; Ids already queued are left alone."""
+
+        def insert():
+            (start,) = self.conn.execute(
+                "SELECT COALESCE(MAX(seq) + 1, 0) FROM jobs"
+            ).fetchone()
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO jobs (id, seq, item) VALUES (?, ?, ?)",
+                (
+                    (json.dumps(news_id), start + n, json.dumps(item))
+                    for n, (news_id, item) in enumerate(jobs)
+                ),
+            )
+            return self.conn.total_changes - before
+
+        return self._transaction(insert)
+
+    def _requeue_expired(self, now):
+        self.conn.execute(
+            "UPDATE jobs SET state = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+            "worker = NULL, lease_expires = NULL "
+            "WHERE state = ? AND lease_expires < ?",
+            (self.max_attempts, FAILED, PENDING, LEASED, now),
+        )
+
+    def lease(self, worker_id, n):
+        """Leases up to n pending jobs; returns [(Id, item dict)]."""
+
+        def take():
+            now = time.time()
+            self._requeue_expired(now)
+            rows = self.conn.execute(
+                "SELECT id, item FROM jobs WHERE state = ? ORDER BY seq LIMIT ?",
+                (PENDING, n),
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE jobs SET state = ?, worker = ?, lease_expires = ?, "
+                "attempts = attempts + 1 WHERE id = ?",
+                ((LEASED, worker_id, now + self.lease_seconds, r[0]) for r in rows),
+            )
+            return [(json.loads(i), json.loads(item)) for i, item in rows]
+
+        return self._transaction(take)
+
+    def _settle(self, worker_id, news_ids, sql, params):
+        def update():
+            self.conn.executemany(
+                sql + " WHERE id = ? AND state = ? AND worker = ?",
+                ((*params, json.dumps(i), LEASED, worker_id) for i in news_ids),
+            )
+
+        if news_ids:
+            self._transaction(update)
+
+    def heartbeat(self, worker_id, news_ids):
+        """Extends the leases `worker_id` still holds on `news_ids`."""
+        self._settle(
+            worker_id,
+            news_ids,
+            "UPDATE jobs SET lease_expires = ?",
+            (time.time() + self.lease_seconds,),
+        )
+
+    def complete(self, worker_id, news_ids):
+        self._settle(
+            worker_id,
+            news_ids,
+            "UPDATE jobs SET state = ?, lease_expires = NULL",
+            (DONE,),
+        )
+
+    def fail(self, worker_id, news_ids):
+        """Returns jobs to the queue, or marks them failed after max_attempts."""
+        self._settle(
+            worker_id,
+            news_ids,
+            "UPDATE jobs SET state = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+            "worker = NULL, lease_expires = NULL",
+            (self.max_attempts, FAILED, PENDING),
+        )
+
+    def counts(self):
+        """{state: number of jobs}"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT state, COUNT(*) FROM jobs GROUP BY state"
+            ).fetchall()
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+def merge_shards(shard_paths, output_path, min_length=50):
+    """
+    Merges worker shards into one JSONL file with one record per Id.
+
+    Two streaming passes: the first keeps the first record of every Id whose
+    full_text has at least `min_length` characters, the second adds the Ids
+    that only have empty records. Only the Id set is held in memory.
+    Returns the number of records written.
+    """
+    for path in (output_path, output_path + DoneIdIndex.SUFFIX):
+        if os.path.exists(path):
+            os.remove(path)
+    seen = set()
+    with JsonlRecordWriter(output_path, flush_every=1000) as writer:
+        for want_text in (True, False):
+            for shard in shard_paths:
+                for line in iter_lines(shard):
+                    try:
+                        record = loads(line)
+                    except ValueError:
+                        continue  # truncated tail of a crashed worker
+                    news_id = record.get("Id")
+                    text = record.get("full_text") or ""
+                    if news_id in seen or (len(text) >= min_length) != want_text:
+                        continue
+                    seen.add(news_id)
+                    writer.put(None, record)
+    print(f"Merged {len(shard_paths)} shards into {output_path}: {len(seen)} articles.")
+    return len(seen)
@@ -0,0 +1,24 @@
+from ..utils.lazy import lazy_exports
+
+__all__ = [
+    "TokenizedDatasetBuilder",
+    "PretokenizedDataset",
+    "tokenizer_fingerprint",
+    "content_hash",
+    "LengthGroupedBatchSampler",
+    "DynamicPaddingCollator",
+    "padding_report",
+]
+# Submodules are imported on first access (pandas, pyarrow, torch)
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TokenizedDatasetBuilder": ".pretokenize",
+        "PretokenizedDataset": ".pretokenize",
+        "tokenizer_fingerprint": ".pretokenize",
+        "content_hash": ".pretokenize",
+        "LengthGroupedBatchSampler": ".batching",
+        "DynamicPaddingCollator": ".batching",
+        "padding_report": ".batching",
+    },
+)
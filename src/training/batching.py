@@ -0,0 +1,187 @@
+import numpy as np
+
+from ..utils.lazy import LazyModule
+
+torch = LazyModule("torch")
+
+# Label positions the loss ignores (Hugging Face convention)
+LABEL_PAD_TOKEN_ID = -100
+
+
+class LengthGroupedBatchSampler:
+    """
+    Batch sampler (torch DataLoader(batch_sampler=...) compatible) that puts
+    examples of similar token length together, so dynamic padding pads each
+    batch only to a length close to its examples'.
+
+    Every epoch the examples are sorted by length (ties broken at random) and
+    cut into buckets of `bucket_size` examples. Each bucket is shuffled and
+    cut into batches, and the order of all batches is shuffled, so batches
+    differ between epochs while every batch stays within one length range.
+
+    Batches hold `batch_size` examples, or with `max_tokens` as many as fit
+    in that many padded tokens (examples * longest example). An example
+    longer than `max_tokens` gets a batch of its own.
+    """
+
+    def __init__(
+        self,
+        lengths,
+        batch_size=None,
+        max_tokens=None,
+        bucket_size=None,
+        shuffle=True,
+        drop_last=False,
+        seed=0,
+    ):
+        """
+        lengths: token count of every example (e.g. PretokenizedDataset.lengths())
+        bucket_size: examples per length bucket; defaults to 50 batches' worth
+            (larger buckets mix more, smaller ones pad less)
+        drop_last: drop the last, smaller batch of each bucket (fixed
+            batch_size only)
+        """
+        if (batch_size is None) == (max_tokens is None):
+            raise ValueError("Pass exactly one of batch_size and max_tokens")
+        self.lengths = np.asarray(lengths, dtype=np.int64)
+        self.batch_size = batch_size
+        self.max_tokens = max_tokens
+        if bucket_size is None:
+            if batch_size is not None:
+                bucket_size = batch_size * 50
+            else:
+                typical = max(1, max_tokens // max(1, int(np.median(self.lengths))))
+                bucket_size = typical * 50
+        self.bucket_size = bucket_size
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.seed = seed
+        self.epoch = 0
+        self._batches = None
+
+    def set_epoch(self, epoch):
+        """Reshuffles for `epoch` (the DistributedSampler convention)."""
+        self.epoch = epoch
+        self._batches = None
+
+    def _batch_bucket(self, indices):
+        if self.batch_size is not None:
+            batches = [
+                indices[start : start + self.batch_size]
+                for start in range(0, len(indices), self.batch_size)
+            ]
+            if self.drop_last and batches and len(batches[-1]) < self.batch_size:
+                batches.pop()
+            return batches
+        batches, batch, longest = [], [], 0
+        for i in indices:
+            length = self.lengths[i]
+            if batch and max(longest, length) * (len(batch) + 1) > self.max_tokens:
+                batches.append(batch)
+                batch, longest = [], 0
+            batch.append(i)
+            longest = max(longest, length)
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def batches(self):
+        """The epoch's batches as lists of example indices."""
+        if self._batches is not None:
+            return self._batches
+        rng = np.random.default_rng((self.seed, self.epoch))
+        if self.shuffle:
+            ties = rng.random(len(self.lengths))
+            order = np.lexsort((ties, self.lengths))
+        else:
+            order = np.argsort(self.lengths, kind="stable")
+        batches = []
+        for start in range(0, len(order), self.bucket_size):
+            bucket = order[start : start + self.bucket_size]
+            if self.shuffle:
+                bucket = rng.permutation(bucket)
+            batches.extend(self._batch_bucket(bucket.tolist()))
+        if self.shuffle:
+            batches = [batches[i] for i in rng.permutation(len(batches))]
+        self._batches = batches
+        return batches
+
+    def __iter__(self):
+        batches = self.batches()
+        self._batches = None
+        self.epoch += 1
+        return iter(batches)
+
+    def __len__(self):
+        return len(self.batches())
+
+
+def padding_report(lengths, batches):
+    """
+    Real and padded token counts of `batches` (lists of indices into
+    `lengths`) when every batch is padded to its longest example.
+    """
+    lengths = np.asarray(lengths)
+    real = padded = 0
+    for batch in batches:
+        batch_lengths = lengths[batch]
+        real += int(batch_lengths.sum())
+        padded += int(batch_lengths.max()) * len(batch)
+    return {
+        "batches": len(batches),
+        "real_tokens": real,
+        "padded_tokens": padded,
+        "padding_share": 1 - real / padded if padded else 0.0,
+    }
+
+
+class DynamicPaddingCollator:
+    """
+    Collates {"input_ids", "labels"} examples (lists or arrays, e.g. from
+    PretokenizedDataset) into a batch padded to its longest input and longest
+    label, with the attention mask. Labels are padded with -100 so the loss
+    ignores the padding; seq2seq models build decoder_input_ids from them.
+
+    Returns torch tensors, or numpy arrays with return_tensors="np".
+    """
+
+    def __init__(
+        self,
+        pad_token_id,
+        label_pad_token_id=LABEL_PAD_TOKEN_ID,
+        pad_to_multiple_of=None,
+        return_tensors="pt",
+    ):
+        """
+        pad_token_id: the tokenizer's pad_token_id (1 for BART)
+        pad_to_multiple_of: round the padded lengths up to a multiple of this
+            (8 suits fp16 tensor cores)
+        """
+        self.pad_token_id = pad_token_id
+        self.label_pad_token_id = label_pad_token_id
+        self.pad_to_multiple_of = pad_to_multiple_of
+        self.return_tensors = return_tensors
+
+    def _pad(self, sequences, value):
+        width = max((len(s) for s in sequences), default=0)
+        if self.pad_to_multiple_of:
+            width = -(-width // self.pad_to_multiple_of) * self.pad_to_multiple_of
+        out = np.full((len(sequences), width), value, dtype=np.int64)
+        mask = np.zeros((len(sequences), width), dtype=np.int64)
+        for row, seq in enumerate(sequences):
+            out[row, : len(seq)] = seq
+            mask[row, : len(seq)] = 1
+        return out, mask
+
+    def __call__(self, examples):
+        input_ids, attention_mask = self._pad(
+            [e["input_ids"] for e in examples], self.pad_token_id
+        )
+        batch = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "labels" in examples[0]:
+            batch["labels"], _ = self._pad(
+                [e["labels"] for e in examples], self.label_pad_token_id
+            )
+        if self.return_tensors == "pt":
+            batch = {name: torch.from_numpy(values) for name, values in batch.items()}
+        return batch
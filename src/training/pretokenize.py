@@ -0,0 +1,392 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from ..utils.storage import load_table
+
+try:
+    import pyarrow as pa
+except ImportError:  # Only needed to write and open the shards
+    pa = None
+
+MANIFEST_FILE = "manifest.json"
+# What datasets.load_from_disk looks for next to the data files
+STATE_FILE = "state.json"
+INFO_FILE = "dataset_info.json"
+TOKEN_COLUMNS = ("input_ids", "labels")
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for pre-tokenized datasets")
+
+
+def _text(value):
+    return value if isinstance(value, str) else ""
+
+
+def _digest(*parts, size=16):
+    h = hashlib.blake2b(digest_size=size)
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def content_hash(text, summary):
+    """Hash of one record's article and summary text."""
+    return _digest(_text(text), _text(summary))
+
+
+def tokenizer_fingerprint(tokenizer):
+    """
+    Hash of everything that decides a tokenizer's output: its class, the
+    serialized fast tokenizer (vocabulary, merges, normalizer, post-processor)
+    or else its vocabulary, and its special tokens.
+    """
+    backend = getattr(tokenizer, "backend_tokenizer", None)
+    if backend is not None:
+        definition = backend.to_str()
+    else:
+        definition = json.dumps(sorted(tokenizer.get_vocab().items()))
+    special = json.dumps(
+        getattr(tokenizer, "special_tokens_map", {}), sort_keys=True, default=str
+    )
+    return _digest(type(tokenizer).__name__, definition, special, size=20)
+
+
+def _shard_schema():
+    return pa.schema(
+        [
+            ("Id", pa.int64()),
+            ("content_hash", pa.string()),
+            ("input_ids", pa.list_(pa.int32())),
+            ("labels", pa.list_(pa.int32())),
+        ]
+    )
+
+
+def _open_shard(path):
+    """A shard as an Arrow table memory-mapped from disk (no copy)."""
+    # The table's buffers keep the mapping open after the reader is gone
+    return pa.ipc.open_stream(pa.memory_map(str(path))).read_all()
+
+
+def _token_array(rows):
+    return pa.array(rows, type=pa.list_(pa.int32()))
+
+
+class TokenizedDatasetBuilder:
+    """
+    Tokenizes the article / summary columns of the training data once and
+    keeps the unpadded token ids on disk, so training runs open them instead
+    of re-tokenizing (and padding) the corpus every time.
+
+    The output is a directory per tokenizer and max lengths (see `build`) of
+    Arrow stream shards, `shard_size` records each, with the columns Id,
+    content_hash, input_ids and labels. It is a valid
+    `datasets.load_from_disk` directory and can be opened with
+    PretokenizedDataset without datasets installed; either way the shards are
+    memory-mapped, not read.
+
+    On a rebuild only new or changed records (by content hash) go through the
+    tokenizer. A shard whose records are all unchanged is kept as it is, so
+    appending articles only writes the last shards.
+    """
+
+    def __init__(
+        self,
+        tokenizer,
+        out_dir,
+        text_column="full_text_minimal",
+        summary_column="Summary_minimal",
+        max_source_length=1024,
+        max_target_length=128,
+        shard_size=10_000,
+        batch_size=1000,
+        verbose=True,
+    ):
+        """
+        tokenizer: a Hugging Face tokenizer (anything called like one:
+            tokenizer(texts, max_length=..., truncation=True)["input_ids"])
+        out_dir: the datasets are written to out_dir/<build key>/
+        max_source_length / max_target_length: truncation lengths of the
+            article and the summary
+        batch_size: records per tokenizer call
+        """
+        _require_pyarrow()
+        self.tokenizer = tokenizer
+        self.out_dir = out_dir
+        self.text_column = text_column
+        self.summary_column = summary_column
+        self.max_source_length = max_source_length
+        self.max_target_length = max_target_length
+        self.shard_size = shard_size
+        self.batch_size = batch_size
+        self.verbose = verbose
+        self.tokenizer_hash = tokenizer_fingerprint(tokenizer)
+        self.build_key = _digest(
+            self.tokenizer_hash,
+            text_column,
+            summary_column,
+            str(max_source_length),
+            str(max_target_length),
+        )
+        self.path = os.path.join(out_dir, self.build_key)
+        self.stats = {}
+
+    def _log(self, message):
+        if self.verbose:
+            print(message)
+
+    def _tokenize(self, texts, max_length):
+        ids = []
+        for start in range(0, len(texts), self.batch_size):
+            encoded = self.tokenizer(
+                texts[start : start + self.batch_size],
+                max_length=max_length,
+                truncation=True,
+            )
+            ids.extend(encoded["input_ids"])
+        return ids
+
+    def _read_manifest(self):
+        path = os.path.join(self.path, MANIFEST_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _old_rows(self, manifest):
+        """
+        The existing shard tables, {(Id, content_hash): (table index, row)}
+        of their records and {shard key: file name}.
+        """
+        tables, rows, shards = [], {}, {}
+        for shard in manifest["shards"] if manifest else []:
+            path = os.path.join(self.path, shard["file"])
+            if not os.path.exists(path):
+                continue
+            table = _open_shard(path)
+            ids = table.column("Id").to_pylist()
+            hashes = table.column("content_hash").to_pylist()
+            for row, key in enumerate(zip(ids, hashes)):
+                rows.setdefault(key, (len(tables), row))
+            tables.append(table.select(list(TOKEN_COLUMNS)))
+            shards[shard["key"]] = shard["file"]
+        return tables, rows, shards
+
+    def _shard_tokens(self, keys, texts, summaries, tables, old_rows):
+        """
+        input_ids and labels of one shard's records (`keys` are their
+        (Id, content_hash)), taken from the old shards where the record is
+        unchanged and tokenized otherwise, and the number tokenized.
+        """
+        reused, missing = {}, []
+        for i, key in enumerate(keys):
+            found = old_rows.get(key)
+            if found is None:
+                missing.append(i)
+            else:
+                reused.setdefault(found[0], []).append((i, found[1]))
+
+        pieces, positions = [], []
+        for table_index, items in reused.items():
+            pieces.append(tables[table_index].take([row for _, row in items]))
+            positions.extend(i for i, _ in items)
+        if missing:
+            sources = self._tokenize(
+                [texts[i] for i in missing], self.max_source_length
+            )
+            targets = self._tokenize(
+                [summaries[i] for i in missing], self.max_target_length
+            )
+            pieces.append(
+                pa.table(
+                    [_token_array(sources), _token_array(targets)],
+                    names=list(TOKEN_COLUMNS),
+                )
+            )
+            positions.extend(missing)
+        # Back into the order of `keys`
+        tokens = pa.concat_tables(pieces).take(np.argsort(positions, kind="stable"))
+        return tokens.column("input_ids"), tokens.column("labels"), len(missing)
+
+    def build(self, data):
+        """
+        Tokenizes `data` (a DataFrame, or a path load_table can read) into
+        self.path and returns that path. Records must have an Id.
+
+        Returns the same directory for the same tokenizer, columns and max
+        lengths, so a rebuild after new articles arrive only tokenizes those.
+        """
+        if not isinstance(data, pd.DataFrame):
+            data = load_table(
+                data, columns=["Id", self.text_column, self.summary_column]
+            )
+        ids = data["Id"].astype("int64").tolist()
+        texts = [_text(t) for t in data[self.text_column]]
+        summaries = [_text(s) for s in data[self.summary_column]]
+        hashes = [content_hash(t, s) for t, s in zip(texts, summaries)]
+
+        os.makedirs(self.path, exist_ok=True)
+        manifest = self._read_manifest()
+        tables, old_rows, old_shards = self._old_rows(manifest)
+
+        shards = []
+        n_tokenized = n_kept_shards = 0
+        for start in range(0, len(ids), self.shard_size):
+            stop = start + self.shard_size
+            shard_ids, shard_hashes = ids[start:stop], hashes[start:stop]
+            key = _digest(*(f"{i}:{h}" for i, h in zip(shard_ids, shard_hashes)))
+            file_name = f"data-{key[:16]}.arrow"
+            shards.append({"file": file_name, "key": key, "rows": len(shard_ids)})
+            if old_shards.get(key) == file_name:
+                n_kept_shards += 1
+                continue
+
+            input_ids, labels, n_new = self._shard_tokens(
+                list(zip(shard_ids, shard_hashes)),
+                texts[start:stop],
+                summaries[start:stop],
+                tables,
+                old_rows,
+            )
+            n_tokenized += n_new
+
+            table = pa.table(
+                [
+                    pa.array(shard_ids, type=pa.int64()),
+                    pa.array(shard_hashes, type=pa.string()),
+                    input_ids.combine_chunks(),
+                    labels.combine_chunks(),
+                ],
+                schema=_shard_schema(),
+            )
+            # Uncompressed Arrow stream, so readers can memory-map it
+            tmp_path = os.path.join(self.path, file_name + ".tmp")
+            with pa.OSFile(tmp_path, "wb") as sink:
+                with pa.ipc.new_stream(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, os.path.join(self.path, file_name))
+
+        self._write_metadata(shards, len(ids))
+        keep = {shard["file"] for shard in shards}
+        for file_name in os.listdir(self.path):
+            if file_name.startswith("data-") and file_name not in keep:
+                os.remove(os.path.join(self.path, file_name))
+
+        self.stats = {
+            "records": len(ids),
+            "tokenized": n_tokenized,
+            "shards": len(shards),
+            "unchanged_shards": n_kept_shards,
+        }
+        self._log(
+            f"✅ Pre-tokenized {len(ids)} records into {len(shards)} shards at "
+            f"{self.path}: {n_tokenized} tokenized, {len(ids) - n_tokenized} "
+            f"reused ({n_kept_shards} shards unchanged)"
+        )
+        return self.path
+
+    def _write_metadata(self, shards, n_rows):
+        manifest = {
+            "tokenizer_hash": self.tokenizer_hash,
+            "text_column": self.text_column,
+            "summary_column": self.summary_column,
+            "max_source_length": self.max_source_length,
+            "max_target_length": self.max_target_length,
+            "rows": n_rows,
+            "shards": shards,
+        }
+        fingerprint = _digest(self.build_key, *(shard["key"] for shard in shards))
+        state = {
+            "_data_files": [{"filename": shard["file"]} for shard in shards],
+            "_fingerprint": fingerprint,
+            "_format_columns": None,
+            "_format_kwargs": {},
+            "_format_type": None,
+            "_output_all_columns": False,
+            "_split": None,
+        }
+        # Features are inferred from the Arrow schema
+        info = {
+            "description": f"Pre-tokenized {self.text_column} / {self.summary_column}"
+        }
+        for file_name, content in (
+            (INFO_FILE, info),
+            (STATE_FILE, state),
+            (MANIFEST_FILE, manifest),
+        ):
+            tmp_path = os.path.join(self.path, file_name + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(content, f, indent=2)
+            os.replace(tmp_path, os.path.join(self.path, file_name))
+
+
+class PretokenizedDataset:
+    """
+    Map-style dataset (torch DataLoader compatible) over a directory written
+    by TokenizedDatasetBuilder. The shards are memory-mapped, so opening it
+    costs next to nothing and items are numpy views into the files.
+
+    dataset[i] -> {"input_ids": int32 array, "labels": int32 array}
+    """
+
+    def __init__(self, path, columns=TOKEN_COLUMNS, with_ids=False):
+        _require_pyarrow()
+        with open(os.path.join(path, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self.path = path
+        self.columns = tuple(columns)
+        self.with_ids = with_ids
+        self._tables = [
+            _open_shard(os.path.join(path, shard["file"]))
+            for shard in self.manifest["shards"]
+        ]
+        # Flat token ids and offsets per shard and column, as numpy views
+        self._columns = {
+            name: [self._flat(table.column(name)) for table in self._tables]
+            for name in self.columns
+        }
+        self._starts = np.cumsum([0] + [t.num_rows for t in self._tables])
+
+    @staticmethod
+    def _flat(column):
+        arr = column.combine_chunks() if column.num_chunks != 1 else column.chunk(0)
+        offsets = arr.offsets.to_numpy()
+        return arr.values.to_numpy(zero_copy_only=True), offsets
+
+    def __len__(self):
+        return int(self._starts[-1])
+
+    def _locate(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        shard = int(np.searchsorted(self._starts, index, side="right")) - 1
+        return shard, index - int(self._starts[shard])
+
+    def __getitem__(self, index):
+        shard, row = self._locate(index)
+        item = {}
+        for name in self.columns:
+            values, offsets = self._columns[name][shard]
+            item[name] = values[offsets[row] : offsets[row + 1]]
+        if self.with_ids:
+            item["Id"] = self._tables[shard].column("Id")[row].as_py()
+        return item
+
+    def lengths(self, column="input_ids"):
+        """Token count of every record in `column`, without reading the ids."""
+        if column in self._columns:
+            parts = [np.diff(offsets) for _, offsets in self._columns[column]]
+        else:
+            parts = [
+                np.diff(self._flat(table.column(column))[1]) for table in self._tables
+            ]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
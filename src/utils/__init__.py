@@ -0,0 +1,42 @@
+from .lazy import LazyModule, lazy_exports
+
+__all__ = [
+    "LazyModule",
+    "lazy_exports",
+    "read_jsonl",
+    "read_jsonl_chunks",
+    "JsonlChunkWriter",
+    "unseen_mask",
+    "open_jsonl",
+    "iter_records",
+    "jsonl_codec",
+    "save_table",
+    "load_table",
+    "table_format",
+    "compact_frame",
+    "memory_report",
+    "TagVocabulary",
+    "tag_codes",
+    "StageProfiler",
+]
+# The other helpers need pandas (or orjson / zstandard); import them on first access
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "read_jsonl": ".chunked",
+        "read_jsonl_chunks": ".chunked",
+        "JsonlChunkWriter": ".chunked",
+        "unseen_mask": ".chunked",
+        "open_jsonl": ".jsonl_io",
+        "iter_records": ".jsonl_io",
+        "jsonl_codec": ".jsonl_io",
+        "save_table": ".storage",
+        "load_table": ".storage",
+        "table_format": ".storage",
+        "compact_frame": ".compact",
+        "memory_report": ".compact",
+        "TagVocabulary": ".tags",
+        "tag_codes": ".tags",
+        "StageProfiler": ".profiling",
+    },
+)
@@ -0,0 +1,88 @@
+import pandas as pd
+
+from .jsonl_io import iter_lines, loads, open_jsonl
+
+
+def _parse_lines(lines):
+    # Blank lines are skipped like pd.read_json(lines=True) does; corrupt ones raise
+    return [loads(line) for line in lines if line.strip()]
+
+
+def read_jsonl(path):
+    """
+    A plain, .gz or .zst JSONL file as a DataFrame (the same frame as
+    pd.read_json(path, lines=True) for our records, parsed with orjson).
+    """
+    return pd.DataFrame(_parse_lines(iter_lines(path)))
+
+
+def read_jsonl_chunks(path, chunksize=10_000):
+    """
+    Yields the records of a (compressed) JSONL file as DataFrames of at most
+    `chunksize` rows, so only one chunk is parsed and held in memory at a
+    time; decompression streams along.
+    """
+    lines, start = [], 0
+    for line in iter_lines(path):
+        lines.append(line)
+        if len(lines) >= chunksize:
+            records = _parse_lines(lines)
+            # Row labels continue across chunks, like pd.read_json's reader
+            yield pd.DataFrame(
+                records, index=pd.RangeIndex(start, start + len(records))
+            )
+            start += len(records)
+            lines = []
+    records = _parse_lines(lines)
+    if records:
+        yield pd.DataFrame(records, index=pd.RangeIndex(start, start + len(records)))
+
+
+class JsonlChunkWriter:
+    """
+    Writes DataFrame chunks to one JSONL file as they are produced, in the
+    same format as DataFrame.to_json(orient="records", lines=True):
+
+        with JsonlChunkWriter(out_path) as writer:
+            for chunk in read_jsonl_chunks(in_path):
+                writer.write(process(chunk))
+
+    A .gz / .zst path is compressed, one frame per chunk. mode="ab" appends
+    to an existing file.
+    """
+
+    def __init__(self, path, mode="wb"):
+        self.path = path
+        self.rows = 0
+        self.file = open_jsonl(path, mode)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, df: pd.DataFrame):
+        if len(df):  # An empty frame would still write a blank line
+            text = df.to_json(orient="records", force_ascii=False, lines=True)
+            if not text.endswith("\n"):
+                text += "\n"
+            self.file.write(text.encode("utf-8"))
+            self.file.flush()
+            self.rows += len(df)
+
+    def close(self):
+        self.file.close()
+
+
+def unseen_mask(ids, seen_ids):
+    """
+    Boolean mask keeping the first occurrence of each Id in `ids` that is not
+    already in `seen_ids`, which is updated in place. Dedupes across chunks
+    while only the Ids, not the records, are kept in memory.
+    """
+    keep = []
+    for news_id in ids:
+        keep.append(news_id not in seen_ids)
+        seen_ids.add(news_id)
+    return keep
@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # Without pyarrow only Ids, dates and categoricals are compacted
+    pa = pc = None
+
+# Date columns of the AA records and how to parse them (None: ISO 8601)
+DATE_COLUMNS = {"CreateDate": None, "CreateDateString": "%d.%m.%Y"}
+
+
+def _arrow_string_dtype():
+    # NaN-semantics Arrow strings (the pandas 3 default "str"); plain
+    # string[pyarrow] on pandas versions without na_value
+    try:
+        return pd.StringDtype("pyarrow", na_value=np.nan)
+    except TypeError:
+        return pd.StringDtype("pyarrow")
+
+
+def _is_list_column(series, item_types):
+    values = series.dropna()
+    return (
+        len(values) > 0
+        and values.map(lambda v: isinstance(v, (list, np.ndarray))).all()
+        and all(isinstance(t, item_types) for tags in values for t in tags)
+    )
+
+
+def _tag_list_array(series):
+    """
+    Lists of strings as one Arrow list<dictionary<int32, string>> column:
+    list offsets plus one int32 code per tag, each distinct tag stored once.
+    Iterating the column still yields Python lists.
+    """
+    arr = pa.array(series.tolist(), type=pa.list_(pa.string()))
+    codes = pc.dictionary_encode(arr.flatten())
+    arr = pa.ListArray.from_arrays(
+        arr.offsets, codes, mask=arr.is_null() if arr.null_count else None
+    )
+    return pd.Series(
+        pd.arrays.ArrowExtensionArray(arr), index=series.index, name=series.name
+    )
+
+
+def compact_column(series, categorical_ratio=0.5, date_format=None, is_date=False):
+    """One column in its compact dtype (unchanged if none applies)."""
+    if is_date:
+        return pd.to_datetime(series, format=date_format, errors="coerce")
+    if pd.api.types.is_bool_dtype(series) or isinstance(
+        series.dtype, (pd.CategoricalDtype, pd.ArrowDtype)
+    ):
+        return series
+    if pd.api.types.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast="integer")
+    if pd.api.types.is_float_dtype(series):
+        values = series.dropna()
+        if len(values) == len(series) and (values % 1 == 0).all():
+            return pd.to_numeric(series, downcast="integer")
+        return series
+    if series.dtype == object and pa is not None:
+        if _is_list_column(series, str):
+            return _tag_list_array(series)
+        if _is_list_column(series, (int, np.integer)):
+            # Tag ids (EnglishPreprocessor.normalize_column("Tags")): list<int32>
+            return pd.Series(
+                pd.arrays.ArrowExtensionArray(
+                    pa.array(series.tolist(), type=pa.list_(pa.int32()))
+                ),
+                index=series.index,
+                name=series.name,
+            )
+    if pd.api.types.is_string_dtype(series):
+        values = series.dropna()
+        if not values.map(lambda v: isinstance(v, str)).all():
+            return series  # mixed types, leave them alone
+        if len(series) and series.nunique() / len(series) <= categorical_ratio:
+            return series.astype("category")
+        if pa is not None:
+            return series.astype(_arrow_string_dtype())
+    return series
+
+
+def compact_frame(df, categorical_ratio=0.5, date_columns=None, verbose=True):
+    """
+    Returns `df` with compact dtypes, the memory layout the analysis and
+    preprocessing code works on best:
+
+    - integer Ids and other integral columns downcast to the smallest int,
+    - date columns (DATE_COLUMNS, or `date_columns` {name: format}) parsed
+      to datetime64,
+    - lists of strings (Tags) as Arrow list<dictionary> columns: offsets and
+      int32 codes into one table of distinct tags; lists of tag ids as
+      Arrow list<int32>,
+    - string columns whose distinct share is at most `categorical_ratio` as
+      categoricals, other text as Arrow-backed strings.
+
+    Prints the deep memory usage before and after when verbose.
+    """
+    date_columns = DATE_COLUMNS if date_columns is None else date_columns
+    before = df.memory_usage(deep=True).sum()
+    compact = pd.DataFrame(
+        {
+            name: compact_column(
+                df[name],
+                categorical_ratio,
+                date_format=date_columns.get(name),
+                is_date=name in date_columns,
+            )
+            for name in df.columns
+        },
+        index=df.index,
+    )
+    if verbose:
+        after = compact.memory_usage(deep=True).sum()
+        print(
+            f"Compacted {len(df.columns)} columns: {before / 1e6:.1f} MB -> "
+            f"{after / 1e6:.1f} MB ({after / before if before else 1:.0%})"
+        )
+    return compact
+
+
+def memory_report(df, compact=None):
+    """
+    Per-column deep memory usage in MB and dtype; with `compact`, side by
+    side with its compacted version.
+    """
+    report = pd.DataFrame(
+        {
+            "dtype": df.dtypes.astype(str),
+            "MB": df.memory_usage(deep=True, index=False) / 1e6,
+        }
+    )
+    if compact is not None:
+        report["compact dtype"] = compact.dtypes.astype(str)
+        report["compact MB"] = compact.memory_usage(deep=True, index=False) / 1e6
+    return report
@@ -0,0 +1,207 @@
+import gzip
+import io
+import json
+import os
+import zlib
+
+try:
+    import orjson
+except ImportError:  # Falls back to the standard library codec
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # Only needed for .zst files
+    zstandard = None
+
+# Compression of a JSONL file, by its last extension: data.jsonl.zst
+CODECS = {".gz": "gzip", ".gzip": "gzip", ".zst": "zstd", ".zstd": "zstd"}
+DEFAULT_LEVELS = {"gzip": 6, "zstd": 3}
+_BLOCK_SIZE = 1 << 20
+
+
+def jsonl_codec(path):
+    """'gzip', 'zstd' or None (plain), from the file extension."""
+    return CODECS.get(os.path.splitext(str(path))[1].lower())
+
+
+def strip_codec_suffix(path):
+    """`path` without its compression extension: data.jsonl.zst -> data.jsonl."""
+    root, suffix = os.path.splitext(str(path))
+    return root if suffix.lower() in CODECS else str(path)
+
+
+def require_codec(codec, path=None):
+    """Raises ImportError if the library of `codec` isn't installed."""
+    if codec == "zstd" and zstandard is None:
+        target = f"'{path}'" if path is not None else "zstd frames"
+        raise ImportError(
+            f"zstandard is required to read or write {target} (pip install zstandard)"
+        )
+
+
+def loads(line):
+    """One JSON value from a str or bytes line (orjson when installed)."""
+    if orjson is not None:
+        try:
+            return orjson.loads(line)
+        except ValueError:
+            pass  # NaN literals and huge ints, which only json accepts
+    return json.loads(line)
+
+
+def dumps_line(obj, default=None):
+    """`obj` as one UTF-8 JSON line (bytes, newline included)."""
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            default=default,
+            option=orjson.OPT_APPEND_NEWLINE
+            | orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_SERIALIZE_NUMPY,
+        )
+    return (json.dumps(obj, ensure_ascii=False, default=default) + "\n").encode("utf-8")
+
+
+def compress_frame(data, codec, level=None):
+    """
+    `data` as one complete gzip member / zstd frame. Frames can be appended
+    to a file one after another and the file still reads as one stream.
+    """
+    require_codec(codec)
+    level = DEFAULT_LEVELS[codec] if level is None else level
+    if codec == "gzip":
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+class FramedWriter:
+    """
+    Writes (appends) to a compressed JSONL file: write() buffers, flush()
+    compresses the buffer into one frame and writes it, so everything
+    flushed is readable even if the process dies later. Larger flushes
+    compress better.
+    """
+
+    def __init__(self, path, codec, mode="wb", level=None):
+        require_codec(codec, path)
+        self.codec = codec
+        self.level = level
+        self.raw = open(path, mode)
+        self._buffer = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def closed(self):
+        return self.raw.closed
+
+    def write(self, data):
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self._buffer.append(data)
+        return len(data)
+
+    def flush(self):
+        if self._buffer:
+            self.raw.write(
+                compress_frame(b"".join(self._buffer), self.codec, self.level)
+            )
+            self._buffer.clear()
+        self.raw.flush()
+
+    def fileno(self):
+        return self.raw.fileno()
+
+    def tell(self):
+        """Compressed size written so far (buffered data not included)."""
+        return self.raw.tell()
+
+    def close(self):
+        if not self.raw.closed:
+            self.flush()
+            self.raw.close()
+
+
+def open_jsonl(path, mode="rb", level=None):
+    """
+    Opens a plain, .gz or .zst JSONL file (by extension) in binary mode:
+    "rb" streams the decompressed lines, "wb" / "ab" return a writer whose
+    every flush() is a complete frame (see FramedWriter).
+    """
+    codec = jsonl_codec(path)
+    if codec is None:
+        return open(path, mode)
+    require_codec(codec, path)
+    if mode != "rb":
+        return FramedWriter(path, codec, mode=mode, level=level)
+    if codec == "gzip":
+        return gzip.open(path, "rb")
+    reader = zstandard.ZstdDecompressor().stream_reader(
+        open(path, "rb"), read_across_frames=True, closefd=True
+    )
+    return io.BufferedReader(reader, buffer_size=_BLOCK_SIZE)
+
+
+def iter_lines(path):
+    """
+    Yields the raw (bytes) lines of a plain or compressed JSONL file. A
+    truncated last frame (a writer that died mid-flush) ends the file.
+    """
+    with open_jsonl(path) as f:
+        try:
+            for line in f:
+                yield line
+        except EOFError:
+            print(f"Warning: {path} ends in a truncated frame; read up to it.")
+
+
+def iter_records(path):
+    """Yields the JSON objects of a JSONL file; blank and corrupt lines are skipped."""
+    for line in iter_lines(path):
+        try:
+            record = loads(line)
+        except ValueError:
+            continue
+        if isinstance(record, dict):
+            yield record
+
+
+def _decompressor(codec):
+    if codec == "gzip":
+        return zlib.decompressobj(wbits=31)
+    return zstandard.ZstdDecompressor().decompressobj()
+
+
+def iter_frames(path, start=0):
+    """
+    Yields (end offset, decompressed bytes) of every complete gzip member or
+    zstd frame of a compressed file from byte offset `start` (a frame
+    boundary) on. Stops at a truncated last frame, so the last end offset
+    yielded is where the intact part of the file ends.
+    """
+    codec = jsonl_codec(path)
+    require_codec(codec, path)
+    with open(path, "rb") as f:
+        f.seek(start)
+        offset = start
+        pending = f.read(_BLOCK_SIZE)
+        while pending:
+            decompressor = _decompressor(codec)
+            parts = []
+            while True:
+                parts.append(decompressor.decompress(pending))
+                if decompressor.eof:
+                    rest = decompressor.unused_data
+                    offset += len(pending) - len(rest)
+                    pending = rest or f.read(_BLOCK_SIZE)
+                    break
+                offset += len(pending)
+                pending = f.read(_BLOCK_SIZE)
+                if not pending:
+                    return  # truncated frame
+            yield offset, b"".join(parts)
@@ -0,0 +1,54 @@
+import importlib
+
+
+class LazyModule:
+    """
+    Stands in for a module and imports it on first attribute access, so heavy
+    optional dependencies (plotting, NLP) cost nothing until they are used:
+
+        plt = LazyModule("matplotlib.pyplot")
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            try:
+                self._module = importlib.import_module(self._name)
+            except ImportError as e:
+                raise ImportError(
+                    f"'{self._name}' is required for this feature but is not "
+                    f"installed: {e}"
+                ) from e
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule '{self._name}' ({state})>"
+
+
+def lazy_exports(package, exports):
+    """
+    Module-level __getattr__ and __dir__ for a package __init__ that exports
+    names from its submodules without importing them up front:
+
+        __getattr__, __dir__ = lazy_exports(__name__, {"Name": ".submodule"})
+    """
+    namespace = importlib.import_module(package).__dict__
+
+    def __getattr__(name):
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(exports[name], package), name)
+        namespace[name] = value  # later lookups skip __getattr__
+        return value
+
+    def __dir__():
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
@@ -0,0 +1,334 @@
+import functools
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows: no peak RSS outside /proc
+    resource = None
+
+from .jsonl_io import dumps_line, jsonl_codec, open_jsonl, strip_codec_suffix
+
+# The StageProfiler of the run in progress; @stage does nothing without one
+_active = None
+
+
+def _proc_status_mb(field):
+    """A /proc/self/status memory field (VmRSS, VmHWM) in MB, or None off Linux."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1e3
+    except OSError:
+        pass
+    return None
+
+
+def _rss_mb():
+    return _proc_status_mb("VmRSS")
+
+
+def _peak_rss_mb():
+    peak = _proc_status_mb("VmHWM")
+    if peak is None and resource is not None:
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS, KB elsewhere
+        return maxrss / (1e6 if sys.platform == "darwin" else 1e3)
+    return peak
+
+
+def _max_mb(*values):
+    """The largest of the memory figures that are known, or None."""
+    known = [v for v in values if v is not None]
+    return max(known) if known else None
+
+
+def _reset_peak_rss():
+    """Restarts VmHWM at the current RSS (Linux >= 4.0); False if not possible."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _rows(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return len(value)
+    data = getattr(value, "data", None)
+    if isinstance(data, pd.DataFrame):
+        return len(data)
+    return None
+
+
+def _rows_in(args, kwargs):
+    # The stage's object (self.data), or else the DataFrames it was passed
+    if args:
+        rows = _rows(args[0])
+        if rows is not None and not isinstance(args[0], (pd.DataFrame, pd.Series)):
+            return rows
+    frames = [len(v) for v in (*args, *kwargs.values()) if isinstance(v, pd.DataFrame)]
+    return sum(frames) if frames else None
+
+
+def _rows_out(result):
+    if isinstance(result, int) and not isinstance(result, bool):
+        return result  # records written by the file-to-file stages
+    return _rows(result)
+
+
+def _fmt(value, spec, width=9):
+    return format(value, f">{width}{spec}") if value is not None else "-".rjust(width)
+
+
+def stage(func):
+    """
+    Marks a public pipeline stage. While a StageProfiler is active, every
+    call is timed and measured; otherwise the call goes straight through.
+    Goes under @staticmethod / @classmethod.
+    """
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profiler = _active
+        if profiler is None:
+            return func(*args, **kwargs)
+        return profiler._call(name, func, args, kwargs)
+
+    return wrapper
+
+
+def stage_rows(rows_in=None, rows_out=None):
+    """
+    Sets the rows in / out of the stage running now, for stages that can't
+    be measured from their arguments and result (e.g. file to file).
+    """
+    if _active is not None and _active._stack:
+        call = _active._stack[-1]
+        if rows_in is not None:
+            call["rows_in"] = rows_in
+        if rows_out is not None:
+            call["rows_out"] = rows_out
+
+
+class StageProfiler:
+    """
+    Opt-in instrumentation of the data pipeline: within
+
+        with StageProfiler("data/reports/profile.json") as profiler:
+            cleaner = DataCleaner(df)
+            cleaner.clean_english_articles()
+            ...
+
+    every call of a @stage method (the public stages of DataCleaner,
+    DataCombiner and EnglishPreprocessor) records its wall time, rows in and
+    out, rows/sec, the peak RSS during the call and the RSS change, and with
+    trace_memory the tracemalloc peak and change. Calls are summed up per
+    stage; stages called inside another one (the steps of clean_jsonl) name
+    it as their parent and are part of its time.
+
+    On exit the per-run report is written as JSON to `report_path`, or
+    appended as one line to a .jsonl / .jsonl.gz / .jsonl.zst path (a log
+    of runs, to spot regressions). It is also kept in self.report.
+
+    Peak RSS is per stage where the kernel lets /proc/self/clear_refs reset
+    it (which restarts the process's VmHWM), else the process peak so far,
+    and None where neither /proc nor the resource module exists (Windows).
+    Process-pool workers are not counted.
+    tracemalloc slows allocation-heavy code down noticeably, so it is off by
+    default.
+    """
+
+    def __init__(self, report_path=None, run_name=None, trace_memory=False):
+        """
+        report_path: JSON file, or JSONL log, for the report (optional)
+        run_name: stored in the report; defaults to the start time
+        trace_memory: also record tracemalloc peaks (Python allocations)
+        """
+        self.report_path = report_path
+        self.run_name = run_name
+        self.trace_memory = trace_memory
+        self.stages = {}
+        self.report = None
+        self._stack = []
+        self._started_tracemalloc = False
+
+    def __enter__(self):
+        global _active
+        if _active is not None:
+            raise RuntimeError("A StageProfiler is already active")
+        _active = self
+        self.stages = {}
+        self._started = datetime.now(timezone.utc)
+        self._t0 = time.perf_counter()
+        self._rss_resettable = _reset_peak_rss()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        return self
+
+    def __exit__(self, *exc):
+        global _active
+        _active = None
+        self.report = self._build_report(time.perf_counter() - self._t0)
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        if self.report_path:
+            self.save(self.report_path)
+        self.print_summary()
+
+    def _call(self, name, func, args, kwargs):
+        call = {
+            "name": name,
+            "rows_in": _rows_in(args, kwargs),
+            "rows_out": None,
+            "peak_rss": None,
+            "peak_traced": 0,
+        }
+        parent = self._stack[-1] if self._stack else None
+        if parent is not None:
+            # The peaks are about to be reset: keep the enclosing stage's so far
+            self._note_peaks(parent, _peak_rss_mb())
+        # Registered now, so stages are reported in call order, outer first
+        stats = self._stage_stats(name, parent)
+        self._stack.append(call)
+        rss_start = _rss_mb()
+        if self._rss_resettable:
+            _reset_peak_rss()
+        if self.trace_memory:
+            traced_start = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        t0 = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - t0
+            self._stack.pop()
+        # Inner stages reset the peaks; the peaks noted around them count too
+        peak_rss = _max_mb(_peak_rss_mb(), call["peak_rss"])
+        record = {
+            "seconds": seconds,
+            "rows_in": call["rows_in"],
+            "rows_out": (
+                call["rows_out"] if call["rows_out"] is not None else _rows_out(result)
+            ),
+            "peak_rss_mb": peak_rss,
+            "rss_delta_mb": (_rss_mb() - rss_start if rss_start is not None else None),
+        }
+        peak_traced = None
+        if self.trace_memory:
+            current, peak_traced = tracemalloc.get_traced_memory()
+            peak_traced = max(peak_traced, call["peak_traced"])
+            record["tracemalloc_peak_mb"] = (peak_traced - traced_start) / 1e6
+            record["tracemalloc_delta_mb"] = (current - traced_start) / 1e6
+        if parent is not None:
+            self._note_peaks(parent, peak_rss, peak_traced)
+        self._add(stats, record)
+        return result
+
+    def _note_peaks(self, call, peak_rss, peak_traced=None):
+        call["peak_rss"] = _max_mb(call["peak_rss"], peak_rss)
+        if self.trace_memory:
+            if peak_traced is None:
+                peak_traced = tracemalloc.get_traced_memory()[1]
+            call["peak_traced"] = max(call["peak_traced"], peak_traced)
+
+    def _stage_stats(self, name, parent):
+        # One entry per stage and enclosing stage: drop_missing on its own
+        # and within clean_jsonl are reported apart
+        key = (name, parent["name"] if parent else None)
+        stats = self.stages.get(key)
+        if stats is None:
+            stats = self.stages[key] = {
+                "stage": name,
+                "parent": key[1],
+                "depth": len(self._stack),
+                "calls": 0,
+                "seconds": 0.0,
+                "rows_in": None,
+                "rows_out": None,
+                "peak_rss_mb": None,
+                "rss_delta_mb": None,
+            }
+            if self.trace_memory:
+                stats["tracemalloc_peak_mb"] = 0.0
+                stats["tracemalloc_delta_mb"] = 0.0
+        return stats
+
+    def _add(self, stats, record):
+        stats["calls"] += 1
+        stats["seconds"] += record["seconds"]
+        for key in ("rows_in", "rows_out", "rss_delta_mb"):
+            if record[key] is not None:
+                stats[key] = (stats[key] or 0) + record[key]
+        stats["peak_rss_mb"] = _max_mb(stats["peak_rss_mb"], record["peak_rss_mb"])
+        if self.trace_memory:
+            stats["tracemalloc_peak_mb"] = max(
+                stats["tracemalloc_peak_mb"], record["tracemalloc_peak_mb"]
+            )
+            stats["tracemalloc_delta_mb"] += record["tracemalloc_delta_mb"]
+
+    def _build_report(self, seconds):
+        stages = []
+        for stats in self.stages.values():
+            if not stats["calls"]:
+                continue  # raised
+            stats = dict(stats)
+            rows = (
+                stats["rows_in"] if stats["rows_in"] is not None else stats["rows_out"]
+            )
+            stats["rows_per_sec"] = (
+                rows / stats["seconds"]
+                if rows is not None and stats["seconds"]
+                else None
+            )
+            stages.append(stats)
+        peak_rss = _max_mb(_peak_rss_mb(), *[s["peak_rss_mb"] for s in stages])
+        return {
+            "run": self.run_name or self._started.isoformat(timespec="seconds"),
+            "started": self._started.isoformat(timespec="seconds"),
+            "seconds": seconds,
+            "peak_rss_mb": peak_rss,
+            "per_stage_peak_rss": self._rss_resettable,
+            "trace_memory": self.trace_memory,
+            "stages": stages,
+        }
+
+    def save(self, path):
+        """Writes self.report to a JSON file, or appends it to a JSONL log."""
+        if strip_codec_suffix(path).endswith(".jsonl"):
+            with open_jsonl(path, "ab") as f:
+                f.write(dumps_line(self.report))
+        else:
+            if jsonl_codec(path) is not None:
+                raise ValueError(f"Compressed reports must be JSONL logs: '{path}'")
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.report, f, indent=2)
+        print(f"✅ Saved the stage report to '{path}'.")
+
+    def print_summary(self):
+        print(
+            f"{'stage':<50} {'calls':>5} {'seconds':>8} {'rows in':>9} "
+            f"{'rows out':>9} {'rows/s':>9} {'peak RSS MB':>11}"
+        )
+        for stats in self.report["stages"]:
+            name = "  " * stats["depth"] + stats["stage"]
+            print(
+                f"{name:<50} {stats['calls']:>5} {stats['seconds']:>8.2f} "
+                f"{_fmt(stats['rows_in'], '')} {_fmt(stats['rows_out'], '')} "
+                f"{_fmt(stats['rows_per_sec'], '.0f')} "
+                f"{_fmt(stats['peak_rss_mb'], '.1f', 11)}"
+            )
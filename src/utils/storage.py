@@ -0,0 +1,192 @@
+import os
+
+import pandas as pd
+
+from .chunked import JsonlChunkWriter, read_jsonl
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # Only needed for the columnar formats
+    pa = pc = pq = None
+
+PARQUET_SUFFIXES = (".parquet", ".pq")
+ARROW_SUFFIXES = (".arrow", ".feather", ".ipc")
+
+_TZ_SUFFIX_RE = r"(?:Z|[+-]\d{2}:?\d{2})$"
+_DOTNET_DATE_RE = r"^/Date\((-?\d+)"
+
+
+def table_format(path):
+    """
+    'parquet', 'arrow' or 'jsonl', from the file extension (anything else,
+    including .jsonl.gz / .jsonl.zst, is JSONL).
+    """
+    suffix = os.path.splitext(str(path))[1].lower()
+    if suffix in PARQUET_SUFFIXES:
+        return "parquet"
+    if suffix in ARROW_SUFFIXES:
+        return "arrow"
+    return "jsonl"
+
+
+def _require_pyarrow(path):
+    if pa is None:
+        raise ImportError(f"pyarrow is required to read or write '{path}'")
+
+
+def save_table(df: pd.DataFrame, path, row_group_size=50_000, compression="zstd"):
+    """
+    Saves a DataFrame as Parquet or Arrow IPC (by extension, see table_format)
+    in row groups / record batches of `row_group_size` rows, or as JSONL
+    (.gz / .zst compressed by extension, one frame per `row_group_size` rows).
+
+    Parquet keeps min/max statistics per row group, so load_table(date_range=...)
+    skips the row groups outside the range without reading them when the date
+    column is a timestamp (see parse_dates); saving the rows sorted by date
+    makes that most effective.
+    """
+    fmt = table_format(path)
+    if fmt == "jsonl":
+        with JsonlChunkWriter(path) as writer:
+            for start in range(0, len(df), row_group_size):
+                writer.write(df.iloc[start : start + row_group_size])
+        return
+    _require_pyarrow(path)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if fmt == "parquet":
+        pq.write_table(
+            table, path, row_group_size=row_group_size, compression=compression
+        )
+    else:
+        options = pa.ipc.IpcWriteOptions(compression=compression)
+        with pa.OSFile(str(path), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+                for batch in table.to_batches(max_chunksize=row_group_size):
+                    writer.write_batch(batch)
+
+
+def _is_temporal(field_type):
+    return pa.types.is_timestamp(field_type) or pa.types.is_date(field_type)
+
+
+def _date_filter(schema, date_column, date_range):
+    """pyarrow filter expression for start <= date_column < end (either may be None)."""
+    start, end = date_range
+    field_type = schema.field(date_column).type
+    expr = None
+    for bound, op in ((start, "__ge__"), (end, "__lt__")):
+        if bound is None:
+            continue
+        value = pa.scalar(pd.Timestamp(bound).to_pydatetime()).cast(field_type)
+        cond = getattr(pc.field(date_column), op)(value)
+        expr = cond if expr is None else expr & cond
+    return expr
+
+
+def parse_dates(values):
+    """
+    Dates as naive datetime64, by the metadata fetcher's CreateDate rules: ISO
+    strings with or without a time (a "Z" or UTC offset is dropped, keeping
+    the local time) and "/Date(ms)/" strings (UTC). Numbers are epoch
+    milliseconds, as JsonlChunkWriter writes timestamps. Anything else is NaT.
+    """
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.dt.tz_localize(None) if values.dt.tz is not None else values
+    if pd.api.types.is_numeric_dtype(values):
+        return pd.to_datetime(values, unit="ms", errors="coerce")
+    text = values.astype("string")
+    dates = pd.to_datetime(
+        text.str.replace(_TZ_SUFFIX_RE, "", regex=True),
+        format="ISO8601",
+        errors="coerce",
+    )
+    ms = text.str.extract(_DOTNET_DATE_RE, expand=False).dropna()
+    if len(ms):
+        dates[ms.index] = pd.to_datetime(ms.astype("int64"), unit="ms")
+    return dates
+
+
+def _filter_dates(df, date_column, date_range):
+    start, end = date_range
+    dates = parse_dates(df[date_column])
+    mask = pd.Series(True, index=df.index)
+    if start is not None:
+        mask &= dates >= pd.Timestamp(start)
+    if end is not None:
+        mask &= dates < pd.Timestamp(end)
+    return df[mask].reset_index(drop=True)
+
+
+def _to_pandas(table):
+    df = table.to_pandas()
+    # Arrow list columns come back as numpy arrays; the analysis code expects lists
+    for name, field_type in zip(table.column_names, table.schema.types):
+        if pa.types.is_list(field_type) or pa.types.is_large_list(field_type):
+            df[name] = table.column(name).to_pylist()
+    return df
+
+
+def load_table(
+    path, columns=None, date_range=None, date_column="CreateDate", compact=False
+):
+    """
+    Loads a Parquet, Arrow IPC or (.gz / .zst) JSONL file (by extension) into
+    a DataFrame.
+
+    columns: only read these columns; Parquet and Arrow files don't even
+        decode the others
+    date_range: (start, end) to keep start <= `date_column` < end; either end
+        may be None. `date_column` may be a timestamp or a date string (see
+        parse_dates); for timestamp columns, Parquet row groups whose
+        statistics fall outside the range are skipped.
+    compact: convert to compact dtypes (see utils.compact.compact_frame)
+    """
+    df = _load_table(path, columns, date_range, date_column)
+    if compact:
+        from .compact import compact_frame
+
+        df = compact_frame(df)
+    return df
+
+
+def _load_table(path, columns, date_range, date_column):
+    fmt = table_format(path)
+    if fmt == "jsonl":
+        df = read_jsonl(path)
+        if date_range is not None:
+            df = _filter_dates(df, date_column, date_range)
+        return df[list(columns)] if columns is not None else df
+
+    _require_pyarrow(path)
+    if fmt == "parquet":
+        schema = pq.read_schema(path)
+    else:
+        reader = pa.ipc.open_file(pa.memory_map(str(path)))
+        schema = reader.schema
+    read_columns = list(columns) if columns is not None else None
+    if read_columns is not None and date_range is not None:
+        if date_column not in read_columns:
+            read_columns.append(date_column)
+    expr = None
+    if date_range is not None and _is_temporal(schema.field(date_column).type):
+        expr = _date_filter(schema, date_column, date_range)
+
+    if fmt == "parquet":
+        table = pq.read_table(path, columns=read_columns, filters=expr)
+    else:
+        table = reader.read_all()
+        if read_columns is not None:
+            table = table.select(read_columns)
+        if expr is not None:
+            table = table.filter(expr)
+    if date_range is not None and expr is None:
+        # Date strings don't sort chronologically (date-only vs. with a time,
+        # "/Date(ms)/"), so they are parsed like JSONL dates and filtered here
+        df = _filter_dates(_to_pandas(table), date_column, date_range)
+        return df[list(columns)] if columns is not None else df
+    if columns is not None:
+        table = table.select(list(columns))
+    return _to_pandas(table)
@@ -0,0 +1,179 @@
+import json
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .jsonl_io import strip_codec_suffix
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # Arrow tag columns only come from pyarrow
+    pa = pc = None
+
+# Flat form of a tag column: the row and the tag id of every (row, tag), and
+# the tag of every id
+TagCodes = namedtuple("TagCodes", ["rows", "codes", "names"])
+
+
+def tag_vocabulary_path(data_path):
+    """Where the tag vocabulary of a dataset lives: data.jsonl.zst -> data.tags.json."""
+    return os.path.splitext(strip_codec_suffix(data_path))[0] + ".tags.json"
+
+
+class TagVocabulary:
+    """
+    Normalized tag <-> integer id, ids in order of first appearance.
+
+    Ids are never reassigned, so a vocabulary loaded from disk and extended
+    with new tags keeps the tag codes already stored in a dataset valid.
+    """
+
+    def __init__(self, tags=()):
+        self.tags = []
+        self.ids = {}
+        for tag in tags:
+            self.add(tag)
+
+    def __len__(self):
+        return len(self.tags)
+
+    def __contains__(self, tag):
+        return tag in self.ids
+
+    def add(self, tag):
+        """Id of `tag`, which is added if new."""
+        tag_id = self.ids.get(tag)
+        if tag_id is None:
+            tag_id = self.ids[tag] = len(self.tags)
+            self.tags.append(tag)
+        return tag_id
+
+    def encode(self, tags):
+        """`tags` as an int32 array of ids; new tags are added."""
+        return np.fromiter(
+            (self.add(tag) for tag in tags), dtype=np.int32, count=len(tags)
+        )
+
+    def decode(self, codes):
+        """The tags of an array / list of ids."""
+        return [self.tags[code] for code in codes]
+
+    def save(self, path):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.tags, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    @classmethod
+    def for_dataset(cls, data_path):
+        """The vocabulary saved next to `data_path`, or None if there is none."""
+        path = tag_vocabulary_path(data_path)
+        return cls.load(path) if os.path.exists(path) else None
+
+
+def _arrow_tag_codes(chunked, vocabulary):
+    lengths = pc.list_value_length(chunked).fill_null(0).to_numpy()
+    values = pc.list_flatten(chunked)
+    valid = (
+        pc.is_valid(values).to_numpy(zero_copy_only=False)
+        if values.null_count
+        else None
+    )
+    if pa.types.is_dictionary(values.type):
+        values = values.unify_dictionaries()
+        names = values.chunk(0).dictionary.to_pylist() if values.num_chunks else []
+        codes = np.concatenate(
+            [c.indices.fill_null(0).to_numpy() for c in values.chunks]
+            or [np.zeros(0, dtype=np.int32)]
+        )
+    elif pa.types.is_integer(values.type):
+        names = _vocabulary_tags(vocabulary)
+        codes = values.fill_null(0).to_numpy()
+    else:
+        encoded = pc.dictionary_encode(values.combine_chunks())
+        names = encoded.dictionary.to_pylist()
+        codes = encoded.indices.fill_null(0).to_numpy()
+    return lengths, codes, names, valid
+
+
+def _object_tag_codes(series, vocabulary):
+    lengths = np.zeros(len(series), dtype=np.int64)
+    flat = []
+    for row, value in enumerate(series):
+        if isinstance(value, str):
+            # Comma-separated tags, as get_tag_counts always read them
+            tags = [tag.strip().lower() for tag in value.split(",")]
+        elif isinstance(value, (list, tuple, np.ndarray)):
+            tags = value
+        else:
+            continue  # None, NaN, ...
+        tags = [
+            tag
+            for tag in tags
+            if isinstance(tag, (int, np.integer)) or (isinstance(tag, str) and tag)
+        ]
+        lengths[row] = len(tags)
+        flat.extend(tags)
+    if flat and isinstance(flat[0], (int, np.integer)):
+        return lengths, np.asarray(flat), _vocabulary_tags(vocabulary), None
+    codes, names = pd.factorize(np.asarray(flat, dtype=object))
+    return lengths, codes, list(names), None
+
+
+def _vocabulary_tags(vocabulary):
+    if vocabulary is None:
+        raise ValueError(
+            "The tag column holds tag ids, but no tag vocabulary was given "
+            "(see tag_vocabulary_path)."
+        )
+    return vocabulary.tags
+
+
+def tag_codes(series, vocabulary=None):
+    """
+    TagCodes of a tag column, whatever its layout:
+
+    - lists of tag ids (EnglishPreprocessor.normalize_column("Tags")), named
+      by `vocabulary`,
+    - compact Arrow list<dictionary> columns (utils.compact), whose
+      dictionary codes are used as they are,
+    - lists of tag strings, or comma-separated strings (lowercased), which
+      are encoded here.
+
+    Empty and missing tags are left out; a row's duplicate tags are kept.
+    """
+    array = series.array
+    if (
+        pa is not None
+        and isinstance(array, pd.arrays.ArrowExtensionArray)
+        and pa.types.is_list(array.dtype.pyarrow_dtype)
+    ):
+        lengths, codes, names, valid = _arrow_tag_codes(
+            array.__arrow_array__(), vocabulary
+        )
+    else:
+        lengths, codes, names, valid = _object_tag_codes(series, vocabulary)
+    rows = np.repeat(np.arange(len(series)), lengths)
+    codes = codes.astype(np.int32, copy=False)
+    empty = [i for i, name in enumerate(names) if name == ""]
+    if valid is not None or empty:
+        keep = np.ones(len(codes), dtype=bool) if valid is None else valid
+        if empty:
+            keep &= ~np.isin(codes, empty)
+        rows, codes = rows[keep], codes[keep]
+    return TagCodes(rows, codes, names)
+
+
+def unique_tag_codes(codes):
+    """TagCodes `codes` with every tag once per row (sorted by row, then id)."""
+    n_tags = max(len(codes.names), 1)
+    keys = np.unique(codes.rows.astype(np.int64) * n_tags + codes.codes)
+    return TagCodes(keys // n_tags, (keys % n_tags).astype(np.int32), codes.names)
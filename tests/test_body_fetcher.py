@@ -0,0 +1,113 @@
+import contextlib
+import io
+import os
+
+import pytest
+
+from benchmarks.local_aa_server import article_html
+from src.scraping import AA_EnglishArticleBodyFetcher
+from src.scraping import fetch_news_body_en
+from src.scraping.done_index import DoneIdIndex
+from src.utils import read_jsonl
+from src.utils.jsonl_io import dumps_line, open_jsonl
+
+N_ARTICLES = 6
+
+
+def write_jsonl(records, path):
+    with open_jsonl(path, "wb") as f:
+        for record in records:
+            f.write(dumps_line(record))
+
+
+@pytest.fixture
+def fetcher(tmp_path):
+    metadata_path = str(tmp_path / "metadata.jsonl")
+    write_jsonl(
+        [
+            {"Id": n, "Title": f"Article {n}", "Route": f"/en/world/article/{n}"}
+            for n in range(1, N_ARTICLES + 1)
+        ],
+        metadata_path,
+    )
+    fetcher = AA_EnglishArticleBodyFetcher(
+        metadata_path,
+        str(tmp_path / "bodies.jsonl"),
+        cache_dir=str(tmp_path / "cache"),
+        extractor="lxml",
+    )
+    for n in range(1, N_ARTICLES + 1):
+        fetcher.cache.put(
+            fetcher._article_url(f"/en/world/article/{n}"), article_html(n)
+        )
+    return fetcher
+
+
+def reextract(fetcher):
+    with contextlib.redirect_stdout(io.StringIO()):
+        fetcher.reextract_from_cache(workers=1)
+
+
+def leftover_tmp_files(fetcher):
+    directory = os.path.dirname(fetcher.output_path)
+    return [name for name in os.listdir(directory) if name.startswith(".reextract.")]
+
+
+def test_reextract_replaces_output_and_index(fetcher):
+    write_jsonl([{"Id": 99, "full_text": "previous run"}], fetcher.output_path)
+    reextract(fetcher)
+    assert read_jsonl(fetcher.output_path)["Id"].tolist() == list(
+        range(1, N_ARTICLES + 1)
+    )
+    index = DoneIdIndex(fetcher.output_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert index.load() == set(range(1, N_ARTICLES + 1))
+    assert not leftover_tmp_files(fetcher)
+
+
+def test_failed_reextract_keeps_previous_output(fetcher, monkeypatch):
+    reextract(fetcher)
+    with open(fetcher.output_path, "rb") as f:
+        previous = f.read()
+    with open(fetcher.output_path + DoneIdIndex.SUFFIX, "rb") as f:
+        previous_index = f.read()
+
+    def failing_extract(cache_root, urls, extractor="bs4", workers=None):
+        yield "text of the first article"
+        raise RuntimeError("worker crashed")
+
+    monkeypatch.setattr(fetch_news_body_en, "extract_cached", failing_extract)
+    with pytest.raises(RuntimeError):
+        reextract(fetcher)
+
+    with open(fetcher.output_path, "rb") as f:
+        assert f.read() == previous
+    with open(fetcher.output_path + DoneIdIndex.SUFFIX, "rb") as f:
+        assert f.read() == previous_index
+    assert not leftover_tmp_files(fetcher)
+
+
+class OfflineFetcher(AA_EnglishArticleBodyFetcher):
+    def _fetch_article(self, url, session, user_agent):
+        return f"Body of {url} " * 5, False
+
+
+@pytest.mark.parametrize("stop", ["close", "raise"])
+def test_iter_records_finishes_run_when_stopped_early(fetcher, stop):
+    offline = OfflineFetcher(
+        fetcher.metadata_path, fetcher.output_path, min_delay=0, flush_every=100
+    )
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        records = offline.iter_records(max_workers=2)
+        seen = [next(records)["Id"], next(records)["Id"]]
+        if stop == "close":
+            records.close()
+        else:
+            with pytest.raises(KeyError):
+                records.throw(KeyError("consumer failed"))
+    assert "Done!" in out.getvalue()
+    assert offline._sessions == []
+    index = DoneIdIndex(fetcher.output_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert set(seen) <= index.load()
@@ -0,0 +1,68 @@
+import sys
+
+import pandas as pd
+import pytest
+
+from benchmarks.bench_data_cleaner import reference_clean, synthetic_corpus
+from src.preprocessing.data_cleaner import _WHITESPACE, FOOTER_MARKERS, DataCleaner
+
+UNICODE_WHITESPACE = "".join(
+    chr(c) for c in range(sys.maxunicode + 1) if chr(c).isspace()
+)
+
+TEXTS = [
+    "",
+    " ",
+    '"',
+    '""',
+    "ABC",
+    "ABCDef",
+    "US Officials said",
+    "ANKARA Türkiye said",
+    'ISTANBUL / Talks "continue"',
+    '"full_text":"WASHINGTON The US said"',
+    '"full_text":"lowercase start"',
+    "no prefix and no footer",
+    *(f"ANKARA{ws}Türkiye{ws}said{ws}" for ws in UNICODE_WHITESPACE),
+    *(f"{ws}LONDON Body{ws}" for ws in UNICODE_WHITESPACE),
+    *(marker + " and the rest" for marker in FOOTER_MARKERS),
+    *(f"ANKARA Body {marker} tail" for marker in FOOTER_MARKERS),
+    f"Body {FOOTER_MARKERS[2]} x {FOOTER_MARKERS[0]} y",
+    f'Body "{FOOTER_MARKERS[3]}\nsecond line',
+    "Body Related topic, singular",
+    "ABC\x85İx",
+    "ABCD\nÇok",
+    "x\x1c",
+    'Text "\n',
+    "İSTANBUL Şehir",
+    "Ünicode Prefix",
+]
+
+
+def test_whitespace_table_matches_str_isspace():
+    assert set(_WHITESPACE) == set(UNICODE_WHITESPACE)
+
+
+@pytest.mark.parametrize("text", TEXTS + [None, float("nan"), 7])
+def test_sub_clean_matches_reference(text):
+    expected = reference_clean(text)
+    got = DataCleaner.sub_clean_aa_english_article(text)
+    assert got == expected or (got != got and expected != expected)
+
+
+@pytest.mark.parametrize("dtype", [object, "string[pyarrow]"])
+@pytest.mark.parametrize("workers", [None, 2])
+def test_clean_text_series_matches_reference(dtype, workers):
+    corpus = synthetic_corpus(300, seed=1).tolist() + TEXTS
+    series = pd.Series(corpus, index=range(5, 5 + len(corpus)), name="full_text")
+    if dtype is not object:
+        series = series.astype(dtype)
+        assert isinstance(series.array, pd.arrays.ArrowStringArray)  # RE2 path
+    cleaned = DataCleaner.clean_text_series(
+        series, workers=workers, chunksize=100, min_rows_for_workers=0
+    )
+    assert cleaned.index.equals(series.index)
+    assert cleaned.dtype == series.dtype
+    for text, got in zip(series, cleaned):
+        expected = reference_clean(text if isinstance(text, str) else None)
+        assert got == expected or (pd.isna(got) and not isinstance(text, str))
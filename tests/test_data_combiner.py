@@ -0,0 +1,98 @@
+import contextlib
+import io
+
+import pytest
+
+from src.preprocessing import DataCombiner
+from src.utils.jsonl_io import dumps_line, iter_records, open_jsonl
+
+METADATA = [
+    {"Id": 1, "Title": "One", "CreateDateString": "01.01.2024"},
+    {"Id": 2, "Title": "Two", "CreateDateString": "02.01.2024"},
+    {"Id": 2, "Title": "Two again", "CreateDateString": "03.01.2024"},
+    {"Id": 3, "Title": "Three", "Tags": ["a", "b"]},
+    {"Id": 5, "Title": "Metadata only"},
+    {"Id": 6, "Title": None, "CreateDateString": "06.01.2024"},
+]
+BODIES = [
+    {"Id": 3, "Title": "Body three", "full_text": "Three " * 20},
+    {"Id": 1, "full_text": "One " * 20},
+    {"Id": 4, "Title": "Body only", "full_text": "Four"},
+    {"Id": 1, "Title": "Duplicate body", "full_text": "Later copy"},
+    {"Id": 6, "Title": "Body six", "full_text": "Çok güzel ☕"},
+    {"Id": 2, "full_text": ""},
+]
+
+
+def write_jsonl(records, path):
+    with open_jsonl(path, "wb") as f:
+        for record in records:
+            f.write(dumps_line(record))
+
+
+def read_sorted(path):
+    """The records by Id; the in-memory join writes missing fields as null."""
+    records = [
+        {key: value for key, value in record.items() if value is not None}
+        for record in iter_records(path)
+    ]
+    return sorted(records, key=lambda record: record["Id"])
+
+
+@pytest.mark.parametrize("join_type", ["inner", "union"])
+@pytest.mark.parametrize("larger", ["metadata", "body"])
+@pytest.mark.parametrize("suffix", ["", ".zst"])
+def test_stream_join_matches_in_memory_join(tmp_path, join_type, larger, suffix):
+    metadata, bodies = list(METADATA), list(BODIES)
+    # The smaller file is the indexed one: exercise both sides
+    if larger == "metadata":
+        metadata.append({"Id": 100, "Title": "x" * 10_000})
+    else:
+        bodies.append({"Id": 100, "full_text": "x" * 10_000})
+    metadata_path = str(tmp_path / "metadata.jsonl")
+    body_path = str(tmp_path / f"bodies.jsonl{suffix}")
+    write_jsonl(metadata, metadata_path)
+    write_jsonl(bodies, body_path)
+    memory_path = str(tmp_path / "memory.jsonl")
+    stream_path = str(tmp_path / "stream.jsonl")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        DataCombiner(metadata_path, body_path).run(memory_path, join_type)
+        n_written = DataCombiner.stream_join(
+            metadata_path, body_path, stream_path, join_type
+        )
+
+    expected = read_sorted(memory_path)
+    got = read_sorted(stream_path)
+    assert n_written == len(expected)
+    assert got == expected
+    if join_type == "inner":
+        assert [record["Id"] for record in got] == [1, 2, 3, 6]
+        assert got[0] == {
+            "Id": 1,
+            "Title_x": "One",
+            "CreateDateString": "01.01.2024",
+            "full_text": "One " * 20,
+        }
+        assert got[2]["Title_x"] == "Three" and got[2]["Title_y"] == "Body three"
+
+
+@pytest.mark.parametrize("join_type", ["inner", "union"])
+@pytest.mark.parametrize("chunksize", [1, 2, 100])
+def test_combine_jsonl_matches_in_memory_join(tmp_path, join_type, chunksize):
+    metadata_path = str(tmp_path / "metadata.jsonl")
+    body_path = str(tmp_path / "bodies.jsonl.gz")
+    write_jsonl(METADATA, metadata_path)
+    write_jsonl(BODIES, body_path)
+    memory_path = str(tmp_path / "memory.jsonl")
+    chunked_path = str(tmp_path / "chunked.jsonl")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        DataCombiner(metadata_path, body_path).run(memory_path, join_type)
+        n_written = DataCombiner.combine_jsonl(
+            metadata_path, body_path, chunked_path, join_type, chunksize=chunksize
+        )
+
+    expected = read_sorted(memory_path)
+    assert n_written == len(expected)
+    assert read_sorted(chunked_path) == expected
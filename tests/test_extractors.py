@@ -0,0 +1,87 @@
+import pytest
+
+from benchmarks.local_aa_server import article_html
+from src.scraping.extractors import (
+    LxmlArticleExtractor,
+    SlicedSoupArticleExtractor,
+    SoupArticleExtractor,
+    find_subtree,
+)
+
+# Markup libxml2 and html.parser build different trees (or text) from
+CONTAINER_BODIES = [
+    *(
+        f'<p class="selectionShareable">a<{tag}>b</{tag}>c</p>'
+        for tag in ("li", "dd", "dt", "tr", "td", "div", "ul", "table", "section")
+    ),
+    '<p class="selectionShareable">a<textarea></div></textarea>b</p>',
+    '<p class="selectionShareable">x<![CDATA[y]]>z</p>',
+    '<p class="selectionShareable">x<title>y</title>z</p>',
+    '<p class="selectionShareable">x<frameset>y</frameset>z</p>',
+    '<p class="selectionShareable">x<plaintext>y</p>',
+    '<p class="selectionShareable">x<xmp></p>y</xmp></p>',
+    '<p class="selectionShareable">x<iframe></p>y</iframe></p>',
+    '<p class="selectionShareable">x<noscript>y</noscript></p>',
+    '<h3>x<p class="selectionShareable">q</p></h3>',
+    '<p class="selectionShareable"><span>x<p>y</p></span></p>',
+    '<p class="selectionShareable">x <!-- a --!> y</p>',
+    '<p class="selectionShareable">x <!--> y --> z</p>',
+    '<p class="selectionShareable">x <!-- a -- b --> y</p>',
+    '<p class="selectionShareable">x <!doctype html> y</p>',
+    '<p class="selectionShareable">x <?php echo 1 ?> y</p>',
+    '<p class="selectionShareable">a <a href="/1">b <a href="/2">c</a> d</a></p>',
+    '<p class="other" class="selectionShareable">duplicate class</p>',
+    '<p class="selectionShareable">x<div/>y</p>',
+    '<p class="selectionShareable">x<span/>y</p>',
+    '<p class="selectionShareable">unclosed<p class="selectionShareable">next</p>',
+    '<p class="selectionShareable">stray</b> end tag</p>',
+    '<p class="selectionShareable">1 < 2 and 3 <4</p>',
+    '<p class="selectionShareable">x<script>"</p>"</script>y</p>',
+    '<p class="selectionShareable">x<script></script foo>y</script>z</p>',
+    '<p class="selectionShareable">windows\r\nline ending</p>',
+    '<p class="selectionShareable">unknown &foo; entity &notin; &notit</p>',
+    # Well-formed markup lxml parses itself
+    '<h3>Title</h3><p class="selectionShareable">Fish &amp; <b>chips</b><br/></p>',
+    '<div><h4 class="sub">x</h4><p class="selectionShareable">y<img src="/a.jpg"></p></div>',
+    '<p class="selectionShareable">x <!-- a comment --> y</p><hr>',
+]
+
+
+def page(body):
+    return (
+        "<html><head><title>t</title></head><body><nav><div>Home</div></nav>"
+        f'<div class="detay-icerik">{body}</div>'
+        "<footer><div>Related</div></footer></body></html>"
+    )
+
+
+@pytest.fixture(scope="module")
+def extractors():
+    return SoupArticleExtractor(), SlicedSoupArticleExtractor(), LxmlArticleExtractor()
+
+
+@pytest.mark.parametrize("body", CONTAINER_BODIES)
+def test_extractors_match_bs4(extractors, body):
+    reference, sliced, lxml_extractor = extractors
+    expected = reference.extract(page(body))
+    assert sliced.extract(page(body)) == expected
+    assert lxml_extractor.extract(page(body)) == expected
+
+
+def test_article_pages_parsed_with_lxml():
+    html = article_html(7, n_paragraphs=5)
+    assert LxmlArticleExtractor._is_safe(find_subtree(html))
+    assert LxmlArticleExtractor().extract(html) == SoupArticleExtractor().extract(html)
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        '<p class="selectionShareable">a<li>b</li>c</p>',
+        '<p class="selectionShareable">x<![CDATA[y]]>z</p>',
+        '<h3>x<p class="selectionShareable">q</p></h3>',
+        '<p class="selectionShareable">x <!-- a --!> y</p>',
+    ],
+)
+def test_unsafe_markup_not_parsed_with_lxml(body):
+    assert not LxmlArticleExtractor._is_safe(f'<div class="detay-icerik">{body}</div>')
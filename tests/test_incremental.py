@@ -0,0 +1,107 @@
+import contextlib
+import io
+
+import pandas as pd
+import pytest
+
+from src.preprocessing import IncrementalPreprocessor
+from src.preprocessing import incremental
+from src.utils.storage import load_table
+
+pytest.importorskip("pyarrow")  # The manifest is Parquet
+
+FOOTER = " Anadolu Agency website contains only a portion of the news stories"
+
+
+def records(ids):
+    return pd.DataFrame(
+        {
+            "Id": list(ids),
+            "Title": [f"Title {i}" for i in ids],
+            "full_text": [
+                f"ANKARA Türkiye  Article number {i} " + "word " * (i % 7) + FOOTER
+                for i in ids
+            ],
+        }
+    )
+
+
+def run(out_path, data, **kwargs):
+    preprocessor = IncrementalPreprocessor(out_path, min_length=30)
+    with contextlib.redirect_stdout(io.StringIO()):
+        output = preprocessor.run(data, **kwargs)
+    return preprocessor, output
+
+
+def full_run(tmp_path, data, suffix):
+    return run(str(tmp_path / f"full{suffix}"), data)[1]
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".jsonl.gz"])
+def test_new_records_are_appended_without_reading_the_output(
+    tmp_path, monkeypatch, suffix
+):
+    out_path = str(tmp_path / f"out{suffix}")
+    day1, day2 = records(range(20)), records(range(30))
+    run(out_path, day1)
+    with open(out_path, "rb") as f:
+        before = f.read()
+
+    loaded = []
+    real_load_table = incremental.load_table
+
+    def spy(path, *args, **kwargs):
+        loaded.append(path)
+        return real_load_table(path, *args, **kwargs)
+
+    monkeypatch.setattr(incremental, "load_table", spy)
+    preprocessor, output = run(out_path, day2, return_output=False)
+    assert output is None
+    assert out_path not in loaded
+    assert preprocessor.stats["processed"] == 10
+    with open(out_path, "rb") as f:
+        assert f.read().startswith(before)
+
+    expected = full_run(tmp_path, day2, suffix)
+    pd.testing.assert_frame_equal(load_table(out_path), expected)
+    assert preprocessor.stats["kept"] == len(expected)
+
+    # Nothing new: the appended records are known now
+    preprocessor, output = run(out_path, day2)
+    assert preprocessor.stats["processed"] == 0
+    pd.testing.assert_frame_equal(output, expected)
+
+
+def test_edits_and_removals_rewrite_the_output(tmp_path):
+    out_path = str(tmp_path / "out.jsonl")
+    run(out_path, records(range(20)))
+    day2 = records(range(2, 25))
+    day2.loc[5, "full_text"] += " (updated)"
+    preprocessor, output = run(out_path, day2)
+    assert preprocessor.stats["processed"] == 6
+    pd.testing.assert_frame_equal(output, full_run(tmp_path, day2, ".jsonl"))
+    pd.testing.assert_frame_equal(load_table(out_path), output)
+
+
+def test_failed_append_leaves_output_and_manifest(tmp_path, monkeypatch):
+    out_path = str(tmp_path / "out.jsonl")
+    run(out_path, records(range(20)))
+    with open(out_path, "rb") as f:
+        before = f.read()
+
+    def fail(self, df):
+        self.file.write(b'{"Id": 20, "full_te')
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(incremental.JsonlChunkWriter, "write", fail)
+    with pytest.raises(KeyboardInterrupt):
+        run(out_path, records(range(30)))
+    monkeypatch.undo()
+    with open(out_path, "rb") as f:
+        assert f.read() == before
+
+    preprocessor, output = run(out_path, records(range(30)))
+    assert preprocessor.stats["processed"] == 10
+    pd.testing.assert_frame_equal(
+        output, full_run(tmp_path, records(range(30)), ".jsonl")
+    )
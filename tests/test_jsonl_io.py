@@ -0,0 +1,38 @@
+import pytest
+
+from src.scraping.jsonl_writer import JsonlRecordWriter
+from src.utils import jsonl_io
+from src.utils.jsonl_io import dumps_line, iter_records, open_jsonl
+
+RECORDS = [{"Id": 1, "text": "çay ☕"}, {"Id": 2, "text": None}, {"Id": 3}]
+
+
+@pytest.mark.parametrize("suffix", ["", ".gz", ".zst"])
+def test_appended_frames_read_back(tmp_path, suffix):
+    path = str(tmp_path / f"data.jsonl{suffix}")
+    for mode, records in (("wb", RECORDS[:2]), ("ab", RECORDS[2:])):
+        with open_jsonl(path, mode) as f:
+            for record in records:
+                f.write(dumps_line(record))
+                f.flush()
+    assert list(iter_records(path)) == RECORDS
+
+
+def test_zst_without_zstandard_fails_clearly(tmp_path, monkeypatch):
+    monkeypatch.setattr(jsonl_io, "zstandard", None)
+    path = str(tmp_path / "data.jsonl.zst")
+    with pytest.raises(ImportError, match="zstandard"):
+        open_jsonl(path, "wb")
+    with pytest.raises(ImportError, match="zstandard"):
+        JsonlRecordWriter(path)
+    with pytest.raises(ImportError, match="zstandard"):
+        jsonl_io.compress_frame(b"{}\n", "zstd")
+
+
+def test_json_fallback_without_orjson(tmp_path, monkeypatch):
+    monkeypatch.setattr(jsonl_io, "orjson", None)
+    path = str(tmp_path / "data.jsonl.gz")
+    with open_jsonl(path, "wb") as f:
+        for record in RECORDS:
+            f.write(dumps_line(record))
+    assert list(iter_records(path)) == RECORDS
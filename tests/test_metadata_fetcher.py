@@ -0,0 +1,100 @@
+import contextlib
+import io
+import threading
+
+from src.scraping import AA_EnglishNewsMetadataFetcher
+
+
+class _Session:
+    def close(self):
+        pass
+
+
+class FailingFetcher(AA_EnglishNewsMetadataFetcher):
+    """Every search request fails, except the pages in `ok_pages`."""
+
+    def __init__(self, ok_pages=(), **kwargs):
+        super().__init__(**kwargs)
+        self.ok_pages = set(ok_pages)
+        self.requested = []
+
+    def _get_session_and_token(self, pool_size=None):
+        return _Session(), "token"
+
+    def _fetch_batch(self, session, csrf_token, page, category_id=None):
+        self.requested.append(page)
+        if page in self.ok_pages:
+            return {"Documents": [{"Title": f"t{page}", "Route": f"/{page}"}]}
+        raise ConnectionError("server down")
+
+
+def run_with_timeout(fetcher, timeout=10, **kwargs):
+    result = {}
+
+    def target():
+        with contextlib.redirect_stdout(io.StringIO()):
+            result["failed"] = fetcher.run_concurrent(**kwargs)
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "run_concurrent did not stop"
+    return result["failed"]
+
+
+def test_unbounded_crawl_gives_up_on_failing_window():
+    fetcher = FailingFetcher(ok_pages={1, 2, 3}, max_pages=None)
+    failed = run_with_timeout(fetcher, window=4, max_retries=2, retry_backoff=0)
+    assert failed == {4: [4, 5, 6, 7, 8]}
+    assert max(fetcher.requested) == 8
+    assert len(fetcher.results) == 3
+
+
+def test_bounded_crawl_reports_pages_left_after_giving_up():
+    fetcher = FailingFetcher(max_pages=10)
+    failed = run_with_timeout(fetcher, window=4, max_retries=1, retry_backoff=0)
+    assert failed == {4: list(range(1, 11))}
+    assert sorted(fetcher.requested) == [1, 2, 3, 4]
+
+
+class BacklogFetcher(FailingFetcher):
+    """Serves Ids n..1 newest-first, `page_size` per page, one per day."""
+
+    def __init__(self, n, **kwargs):
+        super().__init__(**kwargs)
+        self.n = n
+
+    def _fetch_page_with_retries(self, session, csrf_token, page, *args):
+        self.requested.append(page)
+        ids = range(self.n, 0, -1)[(page - 1) * self.page_size :][: self.page_size]
+        return [
+            {"Id": i, "Route": f"/{i}", "CreateDate": f"2024-01-{i:02d}T00:00:00"}
+            for i in ids
+        ]
+
+
+def test_delta_pages_past_max_pages_once_there_is_a_state(tmp_path):
+    state_path = str(tmp_path / "state.json")
+    AA_EnglishNewsMetadataFetcher._save_state(
+        state_path,
+        {"4": {"newest_create_date": "2024-01-02T00:00:00", "recent_ids": [2, 1]}},
+    )
+    fetcher = BacklogFetcher(6, page_size=2, max_pages=1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert fetcher.run_delta(state_path=state_path) == 4
+    assert [link for _, link in fetcher.results] == [
+        f"https://www.aa.com.tr/{i}" for i in (6, 5, 4, 3)
+    ]
+    state = fetcher._load_state(state_path)["4"]
+    assert state["newest_create_date"] == "2024-01-06T00:00:00"
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert fetcher.run_delta(state_path=state_path) == 0
+
+
+def test_first_delta_run_is_limited_to_max_pages(tmp_path):
+    state_path = str(tmp_path / "state.json")
+    fetcher = BacklogFetcher(6, page_size=2, max_pages=1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert fetcher.run_delta(state_path=state_path) == 2
+    assert fetcher.requested == [1]
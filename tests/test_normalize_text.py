@@ -0,0 +1,78 @@
+import contextlib
+import io
+import re
+import sys
+import unicodedata
+
+import pandas as pd
+import pytest
+
+from benchmarks.bench_normalize_text import reference_normalize, synthetic_corpus
+from src.preprocessing.text_preprocessor_en import (
+    _CHAR_FOLDING,
+    EnglishPreprocessor,
+    _CharFolding,
+    require_nltk_corpus,
+)
+
+
+def reference_fold(text):
+    """Steps 2-3 of normalize_text as they were before the translate table."""
+    text = "".join(
+        c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c)
+    )
+    return re.sub(r"[^a-z0-9\s]", " ", text)
+
+
+def nltk_corpora_installed():
+    try:
+        require_nltk_corpus("stopwords")
+        require_nltk_corpus("wordnet")
+    except LookupError:
+        return False
+    return True
+
+
+def test_char_folding_matches_reference_on_every_code_point():
+    table = _CharFolding()  # Not the shared one: this fills in every entry
+    bad = [
+        code
+        for code in range(sys.maxunicode + 1)
+        if chr(code).translate(table) != reference_fold(chr(code))
+    ]
+    assert bad == []
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "café crème brûlée",
+        "ȩ́ combining marks after their base",
+        "́ a leading combining mark",
+        "ﬁnance ＦＵＬＬ width ½ ² ™ ℌ",
+        "한국어 Ελληνικά русский العربية",
+        "tabs\tand\nnew\x1clines　 ",
+        "İstanbul Türkiye ŞĞÇÖÜ ß ǅ",
+    ],
+)
+def test_char_folding_matches_reference_on_text(text):
+    text = text.lower()
+    assert text.translate(_CHAR_FOLDING) == reference_fold(text)
+
+
+@pytest.mark.skipif(
+    not nltk_corpora_installed(), reason="needs the NLTK stopwords and wordnet"
+)
+@pytest.mark.parametrize("workers", [None, 2])
+def test_normalize_column_matches_reference(workers):
+    series = synthetic_corpus(200, seed=1)
+    reference = EnglishPreprocessor()
+    expected = [reference_normalize(reference.lemmatizer, text) for text in series]
+
+    preprocessor = EnglishPreprocessor(lemma_cache_size=50)  # Evicts, too
+    preprocessor.data = pd.DataFrame({"full_text": series})
+    with contextlib.redirect_stdout(io.StringIO()):
+        preprocessor.normalize_column("full_text", workers=workers, chunksize=40)
+    assert preprocessor.data["full_text_norm"].tolist() == expected
+    stats = preprocessor.lemma_cache_stats()
+    assert stats["hits"] > 0 and stats["misses"] > 0
@@ -0,0 +1,49 @@
+import contextlib
+import io
+import types
+
+import pandas as pd
+
+from src.utils import profiling
+from src.utils.profiling import StageProfiler, stage
+
+
+class Pipeline:
+    def __init__(self, n):
+        self.data = pd.DataFrame({"x": range(n)})
+
+    @stage
+    def double(self):
+        self.data["x"] *= 2
+        return self.data
+
+
+def _rusage(maxrss):
+    return types.SimpleNamespace(
+        RUSAGE_SELF=0,
+        getrusage=lambda who: types.SimpleNamespace(ru_maxrss=maxrss),
+    )
+
+
+def test_profiles_without_proc_or_resource(monkeypatch):
+    monkeypatch.setattr(profiling, "_proc_status_mb", lambda field: None)
+    monkeypatch.setattr(profiling, "_reset_peak_rss", lambda: False)
+    monkeypatch.setattr(profiling, "resource", None)
+    with contextlib.redirect_stdout(io.StringIO()):
+        with StageProfiler() as profiler:
+            Pipeline(10).double()
+    assert profiler.report["peak_rss_mb"] is None
+    (stats,) = profiler.report["stages"]
+    assert stats["stage"] == "Pipeline.double"
+    assert stats["rows_in"] == 10
+    assert stats["peak_rss_mb"] is None
+
+
+def test_ru_maxrss_units(monkeypatch):
+    monkeypatch.setattr(profiling, "_proc_status_mb", lambda field: None)
+    monkeypatch.setattr(profiling, "resource", _rusage(250_000_000))
+    monkeypatch.setattr(profiling.sys, "platform", "darwin")
+    assert profiling._peak_rss_mb() == 250.0
+    monkeypatch.setattr(profiling, "resource", _rusage(250_000))
+    monkeypatch.setattr(profiling.sys, "platform", "linux")
+    assert profiling._peak_rss_mb() == 250.0
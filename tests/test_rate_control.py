@@ -0,0 +1,57 @@
+import threading
+import time
+
+from src.scraping.rate_control import AdaptiveRateController, CircuitBreaker
+
+
+def test_half_open_probe_not_lost_while_paused():
+    # The breaker goes half-open while Retry-After still pauses everyone: the
+    # probe must go to a request that is actually sent, or nothing ever is
+    controller = AdaptiveRateController(
+        rate=100, failure_threshold=1, reset_timeout=0.2
+    )
+    controller.acquire()
+    controller.release(status=429, retry_after=0.6)
+    assert controller.breaker.state == CircuitBreaker.OPEN
+    time.sleep(0.3)  # Past the reset timeout, still within Retry-After
+
+    paused_until = controller.paused_until
+    acquired = []
+    lock = threading.Lock()
+
+    def worker():
+        controller.acquire()
+        with lock:
+            acquired.append(time.monotonic())
+        controller.release(status=200)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(acquired) == 3
+    assert min(acquired) >= paused_until  # Nobody went before Retry-After
+    assert controller.breaker.state == CircuitBreaker.CLOSED
+    assert controller.in_flight == 0
+
+
+def test_single_probe_while_half_open():
+    controller = AdaptiveRateController(
+        rate=100, failure_threshold=1, reset_timeout=0.1
+    )
+    controller.acquire()
+    controller.release(status=503)
+    time.sleep(0.15)
+
+    controller.acquire()  # The probe
+    second = threading.Thread(target=controller.acquire, daemon=True)
+    second.start()
+    second.join(timeout=0.3)
+    assert second.is_alive()  # Held back until the probe's outcome is known
+
+    controller.release(status=200)
+    second.join(timeout=2)
+    assert not second.is_alive()
+    assert controller.breaker.state == CircuitBreaker.CLOSED
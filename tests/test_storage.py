@@ -0,0 +1,58 @@
+import pandas as pd
+import pytest
+
+from src.utils.storage import load_table, parse_dates, save_table
+
+pytest.importorskip("pyarrow")
+
+FRAME = pd.DataFrame(
+    {
+        "Id": [1, 2, 3, 4, 5, 6],
+        "CreateDate": [
+            "2024-05-01",
+            "2024-05-01T09:00:00",
+            "/Date(1714550400000)/",
+            "2024-04-30T23:59:59Z",
+            "2024-05-02T00:00:00+03:00",
+            "not a date",
+        ],
+    }
+)
+
+
+def test_parse_dates_follows_the_fetcher_rules():
+    from src.scraping import AA_EnglishNewsMetadataFetcher
+
+    expected = [
+        AA_EnglishNewsMetadataFetcher._parse_create_date(v) for v in FRAME["CreateDate"]
+    ]
+    parsed = parse_dates(FRAME["CreateDate"])
+    assert [None if pd.isna(d) else d.to_pydatetime() for d in parsed] == expected
+
+
+@pytest.mark.parametrize(
+    "date_range, ids",
+    [
+        (("2024-05-01", None), [1, 2, 3, 5]),
+        ((None, "2024-05-01T09:00:00"), [1, 3, 4]),
+        (("2024-05-01T00:00:01", "2024-05-02"), [2, 3]),
+    ],
+)
+@pytest.mark.parametrize("suffix", [".jsonl", ".parquet", ".arrow"])
+def test_date_range_selects_the_same_rows_in_every_format(
+    tmp_path, suffix, date_range, ids
+):
+    path = str(tmp_path / f"data{suffix}")
+    save_table(FRAME, path, row_group_size=2)
+    df = load_table(path, columns=["Id"], date_range=date_range)
+    assert list(df.columns) == ["Id"]
+    assert df["Id"].tolist() == ids
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".parquet", ".arrow"])
+def test_date_range_on_timestamp_column(tmp_path, suffix):
+    df = FRAME.assign(CreateDate=parse_dates(FRAME["CreateDate"]))
+    path = str(tmp_path / f"data{suffix}")
+    save_table(df, path, row_group_size=2)
+    loaded = load_table(path, date_range=("2024-05-01", "2024-05-02"))
+    assert loaded["Id"].tolist() == [1, 2, 3]
@@ -0,0 +1,82 @@
+import contextlib
+import io
+
+import pandas as pd
+import pytest
+
+from src.eda import Analyzer
+from src.preprocessing import EnglishPreprocessor
+
+TAGS = [
+    [" Gaza", "Israel", "gaza"],
+    ["ISRAEL", "Ukraine"],
+    ["Gaza Strip"],
+    [],
+    ["Ukraine", "Russia", " Gaza"],
+    ["Russia"],
+    ["Ukraine", "gaza"],
+]
+DATES = [
+    "01.01.2024",
+    "15.01.2024",
+    "20.01.2024",
+    "02.02.2024",
+    "03.02.2024",
+    "28.02.2024",
+    "05.03.2024",
+]
+
+
+@pytest.fixture
+def analyzers(tmp_path):
+    """The same corpus as tag id arrays (with its vocabulary) and as strings."""
+    df = pd.DataFrame(
+        {"Id": range(1, len(TAGS) + 1), "Tags": TAGS, "CreateDateString": DATES}
+    )
+    path = str(tmp_path / "articles.jsonl")
+    with contextlib.redirect_stdout(io.StringIO()):
+        preprocessor = EnglishPreprocessor()
+        preprocessor.data = df
+        preprocessor.normalize_column("Tags")
+        preprocessor.save(path)
+        ids = Analyzer(path)
+        strings = Analyzer(path)
+    strings.df["Tags_norm"] = [
+        ids.tag_vocabulary.decode(codes) for codes in strings.df["Tags_norm"]
+    ]
+    strings.tag_vocabulary = None
+    return ids, strings
+
+
+def test_tag_mask_on_tag_ids(analyzers):
+    ids, strings = analyzers
+    for tag in ("gaza", "GAZA", "gaza strip", "ukraine", "missing"):
+        expected = [tag.lower() in tags for tags in strings.df["Tags_norm"]]
+        assert ids._tag_mask(tag, "Tags_norm").tolist() == expected
+        assert strings._tag_mask(tag, "Tags_norm").tolist() == expected
+    assert ids._tag_mask("gaza", "Tags_norm").sum() == 3
+
+
+def test_topic_emergence_decay_names_tags(analyzers):
+    ids, strings = analyzers
+    with_ids = ids.topic_emergence_decay(tag_col="Tags_norm", min_window_count=1)
+    with_strings = strings.topic_emergence_decay(
+        tag_col="Tags_norm", min_window_count=1
+    )
+    pd.testing.assert_frame_equal(with_ids, with_strings)
+    assert with_ids["emergent_tags"].tolist() == [
+        ["gaza", "gaza strip", "israel", "ukraine"],
+        ["russia"],
+        [],
+    ]
+    assert with_ids["decayed_tags"].tolist()[0] == ["gaza strip", "israel"]
+
+
+def test_event_coverage_lifespan_on_tag_ids(analyzers):
+    ids, _ = analyzers
+    with contextlib.redirect_stdout(io.StringIO()):
+        grouped, first, _peak, last = ids.event_coverage_lifespan(
+            "Gaza", tag_col="Tags_norm", freq="M"
+        )
+    assert grouped.tolist() == [1, 1, 1]
+    assert (first, last) == (pd.Timestamp("2024-01-01"), pd.Timestamp("2024-03-05"))